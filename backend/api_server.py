@@ -5,8 +5,9 @@ Adds CRUD operations, file upload, and export functionality
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from typing import List, Dict, Any, Optional
+from uuid import UUID
 from pydantic import BaseModel
 import uvicorn
 import os
@@ -1123,7 +1124,9 @@ def get_drawing_geojson(
         target_srid = int(srid) if srid else 4326
         tolerance = float(simplify) if simplify else None
 
-        rows = database.list_canonical_features(
+        # Features arrive as one JSON array assembled by the database; only
+        # the small envelope is serialized here.
+        features, count = database.get_canonical_features_json(
             drawing_id=drawing_id,
             bbox=bbox_values,
             target_srid=target_srid,
@@ -1131,24 +1134,69 @@ def get_drawing_geojson(
             limit=limit
         )
 
-        collection = build_feature_collection(rows)
-        collection["count"] = len(rows)
-        collection["srid"] = target_srid
+        envelope = {"count": count, "srid": target_srid}
         if bbox_values:
-            collection["request_bbox"] = bbox_values
+            envelope["request_bbox"] = bbox_values
         if tolerance:
-            collection["simplify"] = tolerance
+            envelope["simplify"] = tolerance
         if limit:
-            collection["limit"] = limit
-        collection["source"] = "canonical_features"
-        collection["drawing_id"] = drawing_id
+            envelope["limit"] = limit
+        envelope["source"] = "canonical_features"
+        envelope["drawing_id"] = drawing_id
 
-        return collection
+        body = '{"type":"FeatureCollection","features":' + features + ',' + json.dumps(envelope, default=str)[1:]
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to build drawing GeoJSON: {str(e)}")
 
+
+@app.get("/api/drawings/{drawing_id}/geojson/stream")
+def stream_drawing_geojson(
+    drawing_id: str,
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy in EPSG:4326"),
+    srid: Optional[int] = Query(4326, description="Target SRID for output"),
+    simplify: Optional[float] = Query(None, description="Simplification tolerance"),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """Stream canonical features as a GeoJSON FeatureCollection.
+
+    Features are serialized by the database and written out as they arrive
+    from a server-side cursor, so large drawings never sit in memory.
+    """
+    drawing = database.get_drawing(drawing_id)
+    if not drawing:
+        raise HTTPException(status_code=404, detail="Drawing not found")
+
+    features = database.iter_canonical_features(
+        drawing_id=drawing_id,
+        bbox=parse_bbox(bbox),
+        target_srid=int(srid) if srid else 4326,
+        simplify_tolerance=float(simplify) if simplify else None,
+        limit=limit
+    )
+
+    def _chunks():
+        yield '{"type":"FeatureCollection","features":['
+        for idx, feature in enumerate(features):
+            yield feature if idx == 0 else "," + feature
+        yield "]}"
+
+    return StreamingResponse(_chunks(), media_type="application/geo+json")
+
+
+@app.get("/api/drawings/{drawing_id}/tiles/{z}/{x}/{y}.mvt")
+def get_drawing_tile(drawing_id: str, z: int, x: int, y: int):
+    """Return canonical features for one XYZ tile as a Mapbox Vector Tile."""
+    if z < 0 or z > 24 or not (0 <= x < 2 ** z) or not (0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+    try:
+        tile = database.list_canonical_features_mvt(drawing_id, z, x, y)
+        return Response(content=tile, media_type="application/vnd.mapbox-vector-tile")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build drawing tile: {str(e)}")
+
 def calculate_drawing_bounds(inserts):
     """Calculate bounding box for drawing"""
     if not inserts:
@@ -1347,6 +1395,13 @@ def export_generic(format: str, payload: Dict[str, Any] = None):
 # CIVIL TOOLS ENDPOINTS
 # ============================================
 
+def _ndjson_response(rows) -> StreamingResponse:
+    """Stream an iterator of dict rows as newline-delimited JSON."""
+    def _lines():
+        for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
 # Pipe Networks
 @app.get("/api/pipe-networks")
 def list_pipe_networks(project_id: Optional[str] = None):
@@ -1377,9 +1432,12 @@ def get_pipe_network_detail(network_id: str):
 
 @app.put("/api/pipe-networks/{network_id}")
 def update_pipe_network(network_id: str, payload: PipeNetworkCreate):
-    updated = database.update_pipe_network(network_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_pipe_network(network_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Pipe network not found")
     return {"network_id": network_id, "updated": True}
 
 @app.delete("/api/pipe-networks/{network_id}")
@@ -1389,8 +1447,31 @@ def delete_pipe_network(network_id: str):
 
 # Pipes
 @app.get("/api/pipes")
-def list_pipes(network_id: Optional[str] = None):
-    return database.list_pipes(network_id)
+def list_pipes(
+    network_id: Optional[str] = None,
+    include_geom: bool = True,
+    limit: Optional[int] = None,
+    after_diameter: Optional[float] = None,
+    after_id: Optional[UUID] = None
+):
+    if after_diameter is not None and after_id is None:
+        raise HTTPException(status_code=400, detail="after_diameter requires after_id")
+    return database.list_pipes(
+        network_id,
+        'geojson' if include_geom else 'none',
+        limit=limit,
+        after=(after_diameter, str(after_id)) if after_id else None
+    )
+
+@app.get("/api/pipes/stream")
+def stream_pipes(network_id: Optional[str] = None):
+    """Stream pipes as NDJSON for exports of large networks."""
+    return _ndjson_response(database.iter_pipes(network_id))
+
+@app.post("/api/pipes/bulk")
+def create_pipes_bulk(payload: List[PipeCreate]):
+    pipe_ids = database.create_pipes_bulk([item.dict() for item in payload])
+    return {"pipe_ids": pipe_ids}
 
 @app.post("/api/pipes")
 def create_pipe(payload: PipeCreate):
@@ -1420,9 +1501,12 @@ def get_pipe(pipe_id: str):
 
 @app.put("/api/pipes/{pipe_id}")
 def update_pipe(pipe_id: str, payload: PipeCreate):
-    updated = database.update_pipe(pipe_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_pipe(pipe_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Pipe not found")
     return {"pipe_id": pipe_id, "updated": True}
 
 @app.delete("/api/pipes/{pipe_id}")
@@ -1432,8 +1516,20 @@ def delete_pipe(pipe_id: str):
 
 # Structures
 @app.get("/api/structures")
-def list_structures(network_id: Optional[str] = None, project_id: Optional[str] = None):
-    return database.list_structures(network_id=network_id, project_id=project_id)
+def list_structures(network_id: Optional[str] = None, project_id: Optional[str] = None, include_geom: bool = True):
+    return database.list_structures(
+        network_id=network_id, project_id=project_id, geom_format='geojson' if include_geom else 'none'
+    )
+
+@app.get("/api/structures/stream")
+def stream_structures(network_id: Optional[str] = None, project_id: Optional[str] = None):
+    """Stream structures as NDJSON for exports."""
+    return _ndjson_response(database.iter_structures(network_id=network_id, project_id=project_id))
+
+@app.post("/api/structures/bulk")
+def create_structures_bulk(payload: List[StructureCreate]):
+    structure_ids = database.create_structures_bulk([item.dict() for item in payload])
+    return {"structure_ids": structure_ids}
 
 @app.post("/api/structures")
 def create_structure(payload: StructureCreate):
@@ -1458,9 +1554,12 @@ def get_structure(structure_id: str):
 
 @app.put("/api/structures/{structure_id}")
 def update_structure(structure_id: str, payload: StructureCreate):
-    updated = database.update_structure(structure_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_structure(structure_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Structure not found")
     return {"structure_id": structure_id, "updated": True}
 
 @app.delete("/api/structures/{structure_id}")
@@ -1470,8 +1569,8 @@ def delete_structure(structure_id: str):
 
 # Alignments
 @app.get("/api/alignments")
-def list_alignments(project_id: Optional[str] = None):
-    return database.list_alignments(project_id)
+def list_alignments(project_id: Optional[str] = None, include_geom: bool = True):
+    return database.list_alignments(project_id, 'geojson' if include_geom else 'none')
 
 @app.post("/api/alignments")
 def create_alignment(payload: AlignmentCreate):
@@ -1491,15 +1590,20 @@ def get_alignment(alignment_id: str):
     alignment = database.get_alignment(alignment_id)
     if not alignment:
         raise HTTPException(status_code=404, detail="Alignment not found")
-    alignment['horizontal_elements'] = database.list_horizontal_elements(alignment_id)
-    alignment['vertical_elements'] = database.list_vertical_elements(alignment_id)
+    key = str(alignment['alignment_id'])
+    elements = database.list_alignment_elements_bulk([key])[key]
+    alignment['horizontal_elements'] = elements['horizontal']
+    alignment['vertical_elements'] = elements['vertical']
     return alignment
 
 @app.put("/api/alignments/{alignment_id}")
 def update_alignment(alignment_id: str, payload: AlignmentCreate):
-    updated = database.update_alignment(alignment_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_alignment(alignment_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Alignment not found")
     return {"alignment_id": alignment_id, "updated": True}
 
 @app.delete("/api/alignments/{alignment_id}")
@@ -1516,6 +1620,11 @@ def create_horizontal_element(alignment_id: str, payload: Dict[str, Any]):
     element_id = database.create_horizontal_element(alignment_id, payload)
     return {"element_id": element_id}
 
+@app.post("/api/alignments/{alignment_id}/horizontal-elements/bulk")
+def create_horizontal_elements_bulk(alignment_id: str, payload: List[Dict[str, Any]]):
+    element_ids = database.create_horizontal_elements_bulk(alignment_id, payload)
+    return {"element_ids": element_ids}
+
 @app.get("/api/alignments/{alignment_id}/vertical-elements")
 def list_vertical_elements(alignment_id: str):
     return database.list_vertical_elements(alignment_id)
@@ -1525,6 +1634,11 @@ def create_vertical_element(alignment_id: str, payload: Dict[str, Any]):
     element_id = database.create_vertical_element(alignment_id, payload)
     return {"element_id": element_id}
 
+@app.post("/api/alignments/{alignment_id}/vertical-elements/bulk")
+def create_vertical_elements_bulk(alignment_id: str, payload: List[Dict[str, Any]]):
+    element_ids = database.create_vertical_elements_bulk(alignment_id, payload)
+    return {"element_ids": element_ids}
+
 @app.get("/api/alignments/{alignment_id}/pis")
 def get_alignment_pis(alignment_id: str):
     """Return vertices of the alignment geometry as PI-like points with stationing."""
@@ -1544,9 +1658,12 @@ def get_alignment_profile(alignment_id: str):
 
 @app.put("/api/horizontal-elements/{element_id}")
 def update_horizontal_element(element_id: str, payload: Dict[str, Any]):
-    updated = database.update_horizontal_element(element_id, payload)
+    try:
+        updated = database.update_horizontal_element(element_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Horizontal element not found")
     return {"element_id": element_id, "updated": True}
 
 @app.delete("/api/horizontal-elements/{element_id}")
@@ -1556,9 +1673,12 @@ def delete_horizontal_element(element_id: str):
 
 @app.put("/api/vertical-elements/{element_id}")
 def update_vertical_element(element_id: str, payload: Dict[str, Any]):
-    updated = database.update_vertical_element(element_id, payload)
+    try:
+        updated = database.update_vertical_element(element_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Vertical element not found")
     return {"element_id": element_id, "updated": True}
 
 @app.delete("/api/vertical-elements/{element_id}")
@@ -1568,8 +1688,13 @@ def delete_vertical_element(element_id: str):
 
 # BMPs
 @app.get("/api/bmps")
-def list_bmps(project_id: Optional[str] = None):
-    return database.list_bmps(project_id)
+def list_bmps(project_id: Optional[str] = None, include_geom: bool = True):
+    return database.list_bmps(project_id, 'geojson' if include_geom else 'none')
+
+@app.get("/api/bmps/stream")
+def stream_bmps(project_id: Optional[str] = None):
+    """Stream BMPs as NDJSON for exports."""
+    return _ndjson_response(database.iter_bmps(project_id))
 
 @app.post("/api/bmps")
 def create_bmp(payload: BMPCreate):
@@ -1592,15 +1717,17 @@ def get_bmp(bmp_id: str):
     bmp = database.get_bmp(bmp_id)
     if not bmp:
         raise HTTPException(status_code=404, detail="BMP not found")
-    bmp['inspections'] = database.list_inspections(bmp_id)
-    bmp['maintenance'] = database.list_maintenance_records(bmp_id)
+    bmp.update(database.get_bmp_history(bmp_id))
     return bmp
 
 @app.put("/api/bmps/{bmp_id}")
 def update_bmp(bmp_id: str, payload: BMPCreate):
-    updated = database.update_bmp(bmp_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_bmp(bmp_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="BMP not found")
     return {"bmp_id": bmp_id, "updated": True}
 
 @app.delete("/api/bmps/{bmp_id}")
@@ -1617,6 +1744,11 @@ def create_bmp_inspection(bmp_id: str, payload: Dict[str, Any]):
     inspection_id = database.create_inspection_record(bmp_id, payload)
     return {"inspection_id": inspection_id}
 
+@app.post("/api/bmps/{bmp_id}/inspections/bulk")
+def create_bmp_inspections_bulk(bmp_id: str, payload: List[Dict[str, Any]]):
+    inspection_ids = database.create_inspection_records_bulk(bmp_id, payload)
+    return {"inspection_ids": inspection_ids}
+
 @app.get("/api/bmps/{bmp_id}/maintenance")
 def list_bmp_maintenance(bmp_id: str):
     return database.list_maintenance_records(bmp_id)
@@ -1626,6 +1758,11 @@ def create_bmp_maintenance(bmp_id: str, payload: Dict[str, Any]):
     record_id = database.create_maintenance_record(bmp_id, payload)
     return {"record_id": record_id}
 
+@app.post("/api/bmps/{bmp_id}/maintenance/bulk")
+def create_bmp_maintenance_bulk(bmp_id: str, payload: List[Dict[str, Any]]):
+    record_ids = database.create_maintenance_records_bulk(bmp_id, payload)
+    return {"record_ids": record_ids}
+
 # Utilities & Conflicts
 @app.get("/api/utilities")
 def list_utilities(project_id: Optional[str] = None):
@@ -1654,9 +1791,12 @@ def get_utility(utility_id: str):
 
 @app.put("/api/utilities/{utility_id}")
 def update_utility(utility_id: str, payload: UtilityCreate):
-    updated = database.update_utility(utility_id, payload.dict(exclude_unset=True))
+    try:
+        updated = database.update_utility(utility_id, payload.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Utility not found")
     return {"utility_id": utility_id, "updated": True}
 
 @app.delete("/api/utilities/{utility_id}")
@@ -1665,8 +1805,10 @@ def delete_utility(utility_id: str):
     return {"utility_id": utility_id, "deleted": True}
 
 @app.get("/api/conflicts")
-def list_conflicts(project_id: Optional[str] = None, utility_id: Optional[str] = None):
-    return database.list_conflicts(project_id=project_id, utility_id=utility_id)
+def list_conflicts(project_id: Optional[str] = None, utility_id: Optional[str] = None, include_geom: bool = True):
+    return database.list_conflicts(
+        project_id=project_id, utility_id=utility_id, geom_format='geojson' if include_geom else 'none'
+    )
 
 @app.post("/api/conflicts")
 def create_conflict(payload: ConflictCreate):
@@ -1675,9 +1817,12 @@ def create_conflict(payload: ConflictCreate):
 
 @app.put("/api/conflicts/{conflict_id}")
 def update_conflict(conflict_id: str, payload: Dict[str, Any]):
-    updated = database.update_conflict(conflict_id, payload)
+    try:
+        updated = database.update_conflict(conflict_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
-        raise HTTPException(status_code=400, detail="No changes provided")
+        raise HTTPException(status_code=404, detail="Conflict not found")
     return {"conflict_id": conflict_id, "updated": True}
 
 @app.get("/api/sheet-notes")
@@ -1739,6 +1884,21 @@ def api_get_project_sheet_notes(set_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get project notes: {str(e)}")
 
+@app.get("/api/project-sheet-notes/stream")
+def api_stream_project_sheet_notes(set_id: str):
+    """Stream a set's notes as NDJSON for large note sets."""
+    return _ndjson_response(database.iter_project_sheet_notes(set_id))
+
+@app.post("/api/project-sheet-notes/bulk")
+def api_create_project_sheet_notes_bulk(set_id: str, payload: List[Dict[str, Any]]):
+    for item in payload:
+        if item.get('standard_note_id') is None and (not item.get('custom_title') or not item.get('custom_text')):
+            raise HTTPException(status_code=400, detail="custom_title and custom_text required for custom note")
+    try:
+        return { "notes": database.create_project_sheet_notes_bulk(set_id, payload) }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create project notes: {str(e)}")
+
 @app.post("/api/project-sheet-notes")
 def api_create_project_sheet_note(payload: Dict[str, Any]):
     try:
@@ -1865,6 +2025,18 @@ def api_get_sheets(set_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get sheets: {str(e)}")
 
+@app.get("/api/sheets/stream")
+def api_stream_sheets(set_id: str):
+    """Stream a set's sheets as NDJSON for large sheet sets."""
+    return _ndjson_response(database.iter_sheets(set_id))
+
+@app.post("/api/sheets/bulk")
+def api_create_sheets_bulk(set_id: str, payload: List[Dict[str, Any]]):
+    try:
+        return { "sheets": database.create_sheets_bulk(set_id, payload) }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create sheets: {str(e)}")
+
 @app.post("/api/sheets")
 def api_create_sheet(payload: Dict[str, Any]):
     try:
@@ -2158,7 +2330,7 @@ def validate_pipe_slope(scope: Dict[str, Any]):
     network_id = scope.get('network_id')
     project_id = scope.get('project_id')
 
-    pipes = database.fetch_pipe_slopes(project_id=project_id, network_id=network_id)
+    pipes = database.iter_pipe_slopes(project_id=project_id, network_id=network_id, geom_format='none')
 
     results: List[Dict[str, Any]] = []
     violations: List[Dict[str, Any]] = []
@@ -2196,7 +2368,7 @@ def validate_pipe_slope(scope: Dict[str, Any]):
     summary = {
         "count": len(results),
         "violations": len(violations),
-        "networks": sorted({(pipe['network_id'], pipe['network_name']) for pipe in pipes}, key=lambda item: item[1])
+        "networks": sorted({(entry['network_id'], entry['network_name']) for entry in results}, key=lambda item: item[1])
     }
 
     return {"success": True, "message": message, "results": results, "violations": violations, "summary": summary}
@@ -5,13 +5,27 @@ Handles all PostgreSQL + pgvector operations.
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import math
+import atexit
+import functools
+import itertools
+import threading
+import time
+import uuid
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+import psycopg2.extensions
+import psycopg2.pool
+from psycopg2.extras import Json, execute_values, register_default_json, register_default_jsonb
 from contextlib import contextmanager
-import uuid
+from contextvars import ContextVar
 from pathlib import Path
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
@@ -34,6 +48,29 @@ DB_CONFIG = {
     'keepalives_count': 5
 }
 
+# Optional hot standby for read-only helpers; falls back to the primary.
+DB_CONFIG_RO = {**DB_CONFIG, 'host': os.getenv('DB_HOST_RO') or DB_CONFIG['host']}
+
+# Connection pool bounds (per host)
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '2'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '20'))
+# Seconds a caller waits for a free pooled connection once all are checked out
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+# Decode json/jsonb columns (metadata, params, ...) with orjson when it is available
+if orjson is not None:
+    register_default_json(globally=True, loads=orjson.loads)
+    register_default_jsonb(globally=True, loads=orjson.loads)
+
+# Return NUMERIC columns (slopes, elevations, stations) as floats straight from
+# the driver instead of Decimal, so list helpers need no per-row conversion.
+_DEC2FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    'DEC2FLOAT',
+    lambda value, curs: float(value) if value is not None else None
+)
+psycopg2.extensions.register_type(_DEC2FLOAT)
+
 # Validate required environment variables
 required_vars = ['DB_HOST', 'DB_PASSWORD']
 missing_vars = [var for var in required_vars if not os.getenv(var)]
@@ -45,64 +82,657 @@ if missing_vars:
     )
 
 
+@functools.lru_cache(maxsize=8)
 def _required_slope_sql(alias: str = "p") -> str:
-    """Return SQL CASE expression for minimum slope based on diameter (inches)."""
-    return f"""
-    CASE
-        WHEN {alias}.diameter_mm IS NULL THEN NULL
-        WHEN ({alias}.diameter_mm / 25.4) >= 24 THEN 0.15
-        WHEN ({alias}.diameter_mm / 25.4) >= 18 THEN 0.19
-        WHEN ({alias}.diameter_mm / 25.4) >= 15 THEN 0.25
-        WHEN ({alias}.diameter_mm / 25.4) >= 12 THEN 0.33
-        WHEN ({alias}.diameter_mm / 25.4) >= 10 THEN 0.28
-        WHEN ({alias}.diameter_mm / 25.4) >= 8 THEN 0.40
-        WHEN ({alias}.diameter_mm / 25.4) >= 6 THEN 0.40
-        WHEN ({alias}.diameter_mm / 25.4) >= 4 THEN 0.50
-        ELSE 0.60
-    END
-    """
-
-
-def _to_float(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+    """Return the SQL expression for minimum slope based on diameter (inches).
+
+    The thresholds live in pipe_required_slope() (migrations/021), an
+    IMMUTABLE SQL function the planner inlines, so queries and the
+    network-metrics triggers share one definition.
+    """
+    return f"pipe_required_slope({alias}.diameter_mm)"
+
+
+@functools.lru_cache(maxsize=8)
+def _required_slope_join(alias: str = "p") -> str:
+    """Return a LATERAL join exposing ``rs.required_slope`` for each pipe row.
+
+    Queries reference the column instead of repeating the (inlined CASE)
+    expression, so it is evaluated once per row however many outputs use it.
+    OFFSET 0 keeps the planner from flattening the subquery back into each
+    reference.
+    """
+    return f"CROSS JOIN LATERAL (SELECT {_required_slope_sql(alias)} AS required_slope OFFSET 0) rs"
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize to JSON text, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
+class _Json(Json):
+    """Json adapter for jsonb parameters that serializes with orjson when installed.
+
+    Values orjson rejects (non-str keys, numpy scalars) fall back to json.dumps.
+    """
+
+    def dumps(self, obj):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj).decode()
+            except TypeError:
+                pass
+        return json.dumps(obj)
+
+
+# SQLSTATEs meaning the server no longer holds (or can no longer run) a
+# statement we PREPAREd: feature_not_supported is raised for "cached plan must
+# not change result type" after DDL, invalid_sql_statement_name for a missing
+# prepared statement.
+_STALE_PREPARED_SQLSTATES = frozenset({'0A000', '26000'})
+
+
+class _PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which _PREPARED_SQL statements it holds."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+    def reset_prepared(self) -> None:
+        """Drop server-side prepared statements after one of them went stale."""
+        if not self.prepared or self.closed:
+            return
+        try:
+            with self.cursor() as cur:
+                cur.execute("DEALLOCATE ALL")
+            self.commit()
+            self.prepared.clear()
+        except psycopg2.Error:
+            # Unknown server state; let the pool discard this connection.
+            self.close()
+
+
+class _BlockingPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that queues callers when every connection is busy.
+
+    The stock pool raises PoolError as soon as maxconn connections are checked
+    out, so a burst of requests fails instead of waiting a few milliseconds for
+    a warm connection. Callers now wait up to DB_POOL_TIMEOUT seconds.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, **kwargs):
+        self._slots = threading.BoundedSemaphore(maxconn)
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=DB_POOL_TIMEOUT):
+            raise psycopg2.pool.PoolError(
+                f"No database connection became free within {DB_POOL_TIMEOUT:g}s"
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+    def _putconn(self, conn, key=None, close=False):
+        # The stock pool closes a returned connection once minconn are idle,
+        # which throws away its PREPAREd statements. Keep up to maxconn open;
+        # putconn() already holds the pool lock, so swapping minconn is safe.
+        minconn, self.minconn = self.minconn, self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
+
+
+# Pools are created on first use so importing this module never opens a socket.
+_POOL_RW: Optional[_BlockingPool] = None
+_POOL_RO: Optional[_BlockingPool] = None
+_pool_lock = threading.Lock()
+
+
+def _close_pools() -> None:
+    for pool in {id(p): p for p in (_POOL_RW, _POOL_RO) if p is not None}.values():
+        pool.closeall()
+
+atexit.register(_close_pools)
+
+
+def _get_pool(readonly: bool = False) -> _BlockingPool:
+    """Return the read-write or read-only pool, creating it if needed."""
+    global _POOL_RW, _POOL_RO
+    pool = _POOL_RO if readonly else _POOL_RW
+    if pool is not None:
+        return pool
+
+    with _pool_lock:
+        if _POOL_RW is None:
+            _POOL_RW = _BlockingPool(
+                DB_POOL_MIN, DB_POOL_MAX, connection_factory=_PreparingConnection, **DB_CONFIG
+            )
+        if _POOL_RO is None:
+            if DB_CONFIG_RO['host'] == DB_CONFIG['host']:
+                _POOL_RO = _POOL_RW
+            else:
+                _POOL_RO = _BlockingPool(
+                    DB_POOL_MIN, DB_POOL_MAX, connection_factory=_PreparingConnection, **DB_CONFIG_RO
+                )
+        return _POOL_RO if readonly else _POOL_RW
 
 
 @contextmanager
-def get_db_connection():
-    """Context manager for database connections."""
-    conn = psycopg2.connect(**DB_CONFIG)
+def get_db_connection(readonly: bool = False):
+    """Context manager for pooled database connections.
+
+    readonly=True draws from the DB_HOST_RO pool (when set) and opens the
+    transaction READ ONLY, so a stray write fails instead of landing on the
+    standby. Connections go back to the pool afterwards; broken ones are
+    discarded.
+    """
+    pool = _get_pool(readonly)
+    conn = pool.getconn()
     try:
+        # psycopg2 sends this with the next BEGIN, so it never leaks into the
+        # pooled session for the next borrower.
+        conn.readonly = True if readonly else None
         yield conn
         conn.commit()
     except Exception as e:
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
+            if isinstance(e, psycopg2.Error) and e.pgcode in _STALE_PREPARED_SQLSTATES:
+                conn.reset_prepared()
         raise e
     finally:
-        conn.close()
+        pool.putconn(conn, close=bool(conn.closed))
+
+# Cursor shared by helpers running inside ``transaction()``; None otherwise.
+_current_cur: ContextVar[Optional[Any]] = ContextVar('_current_cur', default=None)
+
+
+class FastDictCursor(psycopg2.extensions.cursor):
+    """
+    Cursor that returns rows as plain dicts.
+
+    RealDictCursor builds each RealDictRow through a Python-level
+    __setitem__ per column; here the rows come back as tuples and each one
+    becomes a plain dict via _rows_as_dicts, which is noticeably cheaper on
+    large list_* results. Rows stay ordinary mutable dicts, so callers do not
+    need to change.
+    """
+
+    def fetchone(self) -> Optional[Dict]:
+        row = super().fetchone()
+        return None if row is None else _rows_as_dicts(self, [row])[0]
+
+    def fetchmany(self, size: int = None) -> List[Dict]:
+        return _rows_as_dicts(self, super().fetchmany(self.arraysize if size is None else size))
+
+    def fetchall(self) -> List[Dict]:
+        return _rows_as_dicts(self, super().fetchall())
+
+    def __iter__(self):
+        rows = super().__iter__()
+        # Named cursors only expose a description after the first fetch.
+        first = next(rows, None)
+        if first is None:
+            return
+        columns = [col[0] for col in self.description]
+        yield dict(zip(columns, first))
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def _rows_as_dicts(cur, rows: Optional[List[tuple]] = None) -> List[Dict]:
+    """Convert tuple rows (default: the pending result of a plain cursor) into dicts."""
+    if rows is None:
+        rows = cur.fetchall()
+    if not rows:
+        return []
+    columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+@contextmanager
+def transaction():
+    """
+    Run a batch of helpers on one connection and one cursor.
+
+    Every execute_query/execute_single call made inside the block reuses the
+    yielded cursor and the whole batch commits (or rolls back) together.
+    Nested blocks join the outer transaction.
+    """
+    cur = _current_cur.get()
+    if cur is not None:
+        yield cur
+        return
 
-def execute_query(query: str, params: tuple = None, fetch: bool = True) -> List[Dict]:
-    """Execute a SQL query and return results."""
     with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor() as cur:
+            token = _current_cur.set(cur)
+            try:
+                yield cur
+            finally:
+                _current_cur.reset(token)
+
+
+_savepoint_ids = itertools.count(1)
+_cursor_ids = itertools.count(1)
+
+
+@contextmanager
+def savepoint():
+    """
+    Let a failing step inside transaction() be caught without aborting the batch.
+
+    Statements in the block run under a SAVEPOINT that is rolled back if the
+    block raises (the exception still propagates). Outside transaction() every
+    statement commits on its own, so this is a no-op.
+    """
+    cur = _current_cur.get()
+    if cur is None:
+        yield
+        return
+
+    name = f"sp_{next(_savepoint_ids)}"
+    cur.execute(f"SAVEPOINT {name}")
+    try:
+        yield
+    except BaseException:
+        cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        raise
+    cur.execute(f"RELEASE SAVEPOINT {name}")
+
+
+@contextmanager
+def bulk_import_session():
+    """
+    Run a whole import as one transaction with asynchronous commit.
+
+    Imports are re-runnable from their source files, so losing the last few
+    hundred milliseconds of commits on a server crash is acceptable; in return
+    the batch pays for one WAL flush at the end instead of one per helper
+    call. Wrap steps whose failure should be tolerated in savepoint().
+    """
+    with transaction() as cur:
+        cur.execute("SET LOCAL synchronous_commit = off")
+        yield cur
+
+
+def execute_query(
+    query: str,
+    params: tuple = None,
+    fetch: bool = True,
+    readonly: bool = False
+) -> List[Dict]:
+    """Execute a SQL query and return results.
+
+    readonly=True routes the query to the read replica; it is ignored inside
+    transaction() so the batch keeps seeing its own writes.
+    """
+    if not fetch:
+        execute_write(query, params)
+        return []
+    return execute_read(query, params, readonly=readonly)
+
+def execute_read(query: str, params: tuple = None, readonly: bool = False) -> List[Dict]:
+    """Run a SELECT (or RETURNING statement) and return rows as dicts."""
+    cur = _current_cur.get()
+    if cur is not None:
+        cur.execute(query, params)
+        return _rows_as_dicts(cur)
+
+    with get_db_connection(readonly=readonly) as conn:
+        with conn.cursor(cursor_factory=FastDictCursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+def execute_write(query: str, params: tuple = None) -> None:
+    """Run a statement whose result rows are not needed, on a plain cursor."""
+    cur = _current_cur.get()
+    if cur is not None:
+        cur.execute(query, params)
+        return
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+
+# Explicit projections for the read helpers, so list/lookup paths do not drag
+# the embedding arrays or the TOASTed svg_content along with every row.
+_BLOCK_META_COLUMNS = (
+    "block_id, block_name, domain, category, semantic_type, semantic_label, usage_context, tags"
+)
+_BLOCK_DEFINITION_COLUMNS = f"{_BLOCK_META_COLUMNS}, metadata, space_type"
+_DRAWING_COLUMNS = (
+    "drawing_id, project_id, drawing_name, drawing_number, drawing_type, scale, dxf_content, "
+    "description, tags, metadata, is_georeferenced, drawing_epsg_code, drawing_coordinate_system, "
+    "georef_point, cad_units, scale_factor, created_at, updated_at"
+)
+_LAYER_STANDARD_COLUMNS = (
+    "layer_standard_id, layer_name, description, color, color_rgb, color_name, display_order"
+)
+_LAYER_COLUMNS = (
+    "layer_id, drawing_id, layer_name, color, linetype, lineweight, "
+    "is_plottable, is_locked, is_frozen, layer_standard_id, metadata"
+)
+# Sheet manager rows as the API returns them (reads and RETURNING clauses).
+_SHEET_NOTE_SET_COLUMNS = (
+    "set_id, project_id, set_name, description, discipline, is_active, created_at, updated_at"
+)
+_PROJECT_SHEET_NOTE_COLUMNS = (
+    "project_note_id, set_id, standard_note_id, display_code, custom_title, custom_text, "
+    "is_modified, sort_order, usage_count, created_at, updated_at"
+)
+_SHEET_SET_COLUMNS = (
+    "set_id, project_id, set_name, description, phase, discipline, status, "
+    "issued_date, issued_to, created_at, updated_at"
+)
+_SHEET_COLUMNS = (
+    "sheet_id, set_id, sheet_number, sheet_code, sheet_title, discipline_code, sheet_type, "
+    "sheet_category, sheet_hierarchy_number, scale, sheet_size, template_id, revision_number, "
+    "revision_date, notes, tags, created_at, updated_at"
+)
+
+
+def _qualified(columns: str, alias: str) -> str:
+    """Prefix every name in a projection constant with a table alias."""
+    return ', '.join(f"{alias}.{name.strip()}" for name in columns.split(','))
+
+
+# Legend rows shaped in SQL: exactly the output keys, NULLs already defaulted.
+_SHEET_NOTE_LEGEND_SQL = """
+    SELECT a.legend_sequence,
+           COALESCE(n.display_code, '') AS display_code,
+           COALESCE(n.custom_title, s.note_title, '') AS note_title,
+           COALESCE(n.custom_text, s.note_text, '') AS note_text,
+           n.standard_note_id,
+           COALESCE(n.is_modified, FALSE) AS is_modified
+    FROM sheet_note_assignments a
+    LEFT JOIN project_sheet_notes n ON a.project_note_id = n.project_note_id
+    LEFT JOIN standard_notes s ON n.standard_note_id = s.note_id
+    WHERE {where}
+    ORDER BY a.legend_sequence
+"""
+
+# Fixed hot-path statements, PREPAREd once per pooled connection on first use
+# and then run with EXECUTE so the server skips parse/plan on every call.
+_PREPARED_SQL: Dict[str, str] = {
+    'create_horizontal_element': """
+        INSERT INTO horizontal_elements (alignment_id, type, params, start_station, end_station)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING element_id
+    """,
+    'create_vertical_element': """
+        INSERT INTO vertical_elements (alignment_id, type, params, start_station, end_station)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING element_id
+    """,
+    'create_inspection_record': """
+        INSERT INTO inspections (bmp_id, date, findings, status, follow_up)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING inspection_id
+    """,
+    'create_maintenance_record': """
+        INSERT INTO maintenance_records (bmp_id, date, action, notes)
+        VALUES ($1, $2, $3, $4)
+        RETURNING record_id
+    """,
+    'delete_pipe_network': "DELETE FROM pipe_networks WHERE network_id = $1",
+    'delete_structure': "DELETE FROM structures WHERE structure_id = $1",
+    'delete_pipe': "DELETE FROM pipes WHERE pipe_id = $1",
+    'delete_alignment': "DELETE FROM alignments WHERE alignment_id = $1",
+    'delete_horizontal_element': "DELETE FROM horizontal_elements WHERE element_id = $1",
+    'delete_vertical_element': "DELETE FROM vertical_elements WHERE element_id = $1",
+    'delete_bmp': "DELETE FROM bmps WHERE bmp_id = $1",
+    'delete_utility': "DELETE FROM utilities WHERE utility_id = $1",
+    'delete_sheet_note_set': "DELETE FROM sheet_note_sets WHERE set_id = $1",
+    'delete_project_sheet_note': "DELETE FROM project_sheet_notes WHERE project_note_id = $1",
+    'delete_sheet_set': "DELETE FROM sheet_sets WHERE set_id = $1",
+    'delete_sheet': "DELETE FROM sheets WHERE sheet_id = $1",
+    'delete_sheet_drawing_assignment': "DELETE FROM sheet_drawing_assignments WHERE assignment_id = $1",
+    'delete_sheet_relationship': "DELETE FROM sheet_relationships WHERE relationship_id = $1",
+    'get_block_definition': f"SELECT {_BLOCK_DEFINITION_COLUMNS}, svg_content FROM block_definitions WHERE block_name = $1",
+    'get_drawing': f"SELECT {_DRAWING_COLUMNS} FROM drawings WHERE drawing_id = $1",
+    'get_alignment': """
+        SELECT alignment_id, project_id, name, design_speed, classification, srid, station_start,
+               ST_AsGeoJSON(geom) AS geom
+        FROM alignments
+        WHERE alignment_id = $1
+    """,
+    'get_bmp': """
+        SELECT bmp_id, project_id, type, area_acres, drainage_area_acres, install_date,
+               status, compliance, ST_AsGeoJSON(geom) AS geom, metadata
+        FROM bmps
+        WHERE bmp_id = $1
+    """,
+    'get_utility': """
+        SELECT utility_id, project_id, company, type, status, request_date, response_date, contact, metadata
+        FROM utilities
+        WHERE utility_id = $1
+    """,
+    'get_pipe_network': """
+        SELECT network_id, project_id, name, description, created_at
+        FROM pipe_networks
+        WHERE network_id = $1
+    """,
+    'get_structure': """
+        SELECT structure_id, project_id, network_id, type, rim_elev, sump_depth, invert_elev,
+               ST_AsGeoJSON(geom) AS geom, metadata
+        FROM structures
+        WHERE structure_id = $1
+    """,
+    'get_pipe': """
+        SELECT pipe_id, network_id, up_structure_id, down_structure_id, diameter_mm, material,
+               slope, length_m, invert_up, invert_dn, status,
+               ST_AsGeoJSON(geom) AS geom, metadata
+        FROM pipes
+        WHERE pipe_id = $1
+    """,
+    'list_sheet_note_sets': f"""
+        SELECT {_qualified(_SHEET_NOTE_SET_COLUMNS, 's')},
+               s.note_count
+        FROM sheet_note_sets s
+        WHERE s.project_id = $1
+        ORDER BY s.created_at DESC
+    """,
+    'list_project_sheet_notes': """
+        SELECT p.project_note_id, p.set_id, p.standard_note_id, p.display_code,
+               p.custom_title, p.custom_text, p.is_modified, p.sort_order, p.usage_count,
+               p.created_at, p.updated_at,
+               s.note_title AS standard_title, s.note_text AS standard_text,
+               s.note_category, s.discipline
+        FROM project_sheet_notes p
+        LEFT JOIN standard_notes s ON p.standard_note_id = s.note_id
+        WHERE p.set_id = $1
+        ORDER BY p.sort_order, p.created_at
+    """,
+    # Latest drawing assignment per sheet in one DISTINCT ON pass over the
+    # set's assignments, instead of a LIMIT 1 probe per sheet.
+    'list_sheets': f"""
+        WITH latest AS (
+            SELECT DISTINCT ON (a.sheet_id) a.sheet_id, a.assignment_id, a.drawing_id, a.layout_name
+            FROM sheet_drawing_assignments a
+            JOIN sheets s ON s.sheet_id = a.sheet_id
+            WHERE s.set_id = $1
+            ORDER BY a.sheet_id, a.assigned_at DESC
+        )
+        SELECT {_qualified(_SHEET_COLUMNS, 'sh')}, CASE WHEN a.assignment_id IS NULL THEN 'unassigned' ELSE 'assigned' END AS assignment_status,
+               a.drawing_id, a.layout_name
+        FROM sheets sh
+        LEFT JOIN latest a ON a.sheet_id = sh.sheet_id
+        WHERE sh.set_id = $1
+        ORDER BY COALESCE(sh.sheet_hierarchy_number, 50), sh.sheet_code
+    """,
+    # Two statements rather than "$2 IS NULL OR layout_name = $2" so each plan
+    # is a plain range scan on idx_sheet_note_assignments_sequence.
+    'sheet_note_legend': _SHEET_NOTE_LEGEND_SQL.format(where="a.drawing_id = $1"),
+    'sheet_note_legend_layout': _SHEET_NOTE_LEGEND_SQL.format(where="a.drawing_id = $1 AND a.layout_name = $2"),
+}
+
+def _run_prepared(cur, name: str, params: tuple, fetch: bool) -> List[Dict]:
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {_PREPARED_SQL[name]}")
+        conn.prepared.add(name)
+    if params:
+        cur.execute(f"EXECUTE {name}({', '.join(['%s'] * len(params))})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+    return _rows_as_dicts(cur) if fetch else []
+
+def execute_prepared(
+    name: str,
+    params: tuple = (),
+    fetch: bool = True,
+    readonly: bool = False
+) -> List[Dict]:
+    """Run a statement from _PREPARED_SQL by name, preparing it on first use."""
+    cur = _current_cur.get()
+    if cur is not None:
+        return _run_prepared(cur, name, params, fetch)
+
+    with get_db_connection(readonly=readonly) as conn:
+        with conn.cursor() as cur:
+            return _run_prepared(cur, name, params, fetch)
+
+def insert_many(
+    table: str,
+    columns: List[str],
+    rows: List[tuple],
+    page_size: int = 500,
+    returning: Optional[str] = None
+) -> List[Any]:
+    """
+    Insert rows into table as multi-row ``VALUES (...), (...)`` statements.
+
+    The Python analogue of JDBC's reWriteBatchedInserts: rows are sent
+    page_size at a time in one statement each, inside a single transaction.
+    With ``returning`` set to a column name, that column's values are
+    returned in input order; otherwise an empty list.
+    """
+    if not rows:
+        return []
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    if returning:
+        query += f" RETURNING {returning}"
+    with transaction() as cur:
+        result = execute_values(cur, query, rows, page_size=page_size, fetch=bool(returning))
+    return [row[0] for row in result] if returning else []
+
+def execute_single_prepared(name: str, params: tuple = (), readonly: bool = False) -> Optional[Dict]:
+    """execute_prepared() counterpart of execute_single()."""
+    rows = execute_prepared(name, params, fetch=True, readonly=readonly)
+    return rows[0] if rows else None
+
+def iter_query(
+    query: str,
+    params: tuple = None,
+    chunk: int = 5000,
+    readonly: bool = False
+) -> Iterator[Dict]:
+    """
+    Stream query results through a server-side (named) cursor.
+
+    Rows are fetched from the server ``chunk`` at a time, so memory stays
+    bounded regardless of result size. Use for ingest/export loops over large
+    tables; execute_query remains the right call for small results.
+    """
+    name = f"iter_{next(_cursor_ids)}"
+    outer = _current_cur.get()
+    if outer is not None:
+        with outer.connection.cursor(name=name, cursor_factory=FastDictCursor) as cur:
+            cur.itersize = chunk
+            cur.execute(query, params)
+            for row in cur:
+                yield row
+        return
+
+    with get_db_connection(readonly=readonly) as conn:
+        with conn.cursor(name=name, cursor_factory=FastDictCursor) as cur:
+            cur.itersize = chunk
             cur.execute(query, params)
-            if fetch:
-                return [dict(row) for row in cur.fetchall()]
-            return []
+            for row in cur:
+                yield row
 
-def execute_single(query: str, params: tuple = None) -> Optional[Dict]:
+def execute_single(query: str, params: tuple = None, readonly: bool = False) -> Optional[Dict]:
     """Execute a SQL query and return single result."""
-    results = execute_query(query, params, fetch=True)
+    results = execute_query(query, params, fetch=True, readonly=readonly)
     return results[0] if results else None
 
 # ============================================
 # BLOCK DEFINITIONS (SYMBOLS)
 # ============================================
 
+# block_name -> block_id. Upserts keep a block's id stable, so entries only
+# go stale if a definition is deleted; call invalidate_block_cache() then.
+_block_id_cache: Dict[str, str] = {}
+_BLOCK_CACHE_MAX = 4096
+
+
+def _remember_block_ids(block_ids: Dict[str, str]) -> None:
+    """Cache ids that are already committed (not inside an open transaction())."""
+    if _current_cur.get() is not None:
+        return
+    if len(_block_id_cache) + len(block_ids) > _BLOCK_CACHE_MAX:
+        _block_id_cache.clear()
+    _block_id_cache.update(block_ids)
+
+
+def invalidate_block_cache() -> None:
+    """Forget cached block name -> id lookups."""
+    _block_id_cache.clear()
+
+
+# Re-imports mostly re-send identical definitions; the WHERE clause skips
+# those rows so the (TOASTed) svg_content is not rewritten and no new row
+# version or WAL is produced. Skipped rows return nothing, so callers look up
+# their ids separately.
+_BLOCK_UPSERT_SQL = """
+    INSERT INTO block_definitions (
+        block_name, svg_content, domain, category,
+        semantic_type, semantic_label, usage_context, tags, metadata,
+        space_type
+    ) VALUES {values}
+    ON CONFLICT (block_name) DO UPDATE SET
+        svg_content = EXCLUDED.svg_content,
+        domain = EXCLUDED.domain,
+        category = EXCLUDED.category,
+        semantic_type = EXCLUDED.semantic_type,
+        semantic_label = EXCLUDED.semantic_label,
+        usage_context = EXCLUDED.usage_context,
+        tags = EXCLUDED.tags,
+        metadata = EXCLUDED.metadata
+    WHERE (
+        block_definitions.svg_content, block_definitions.domain, block_definitions.category,
+        block_definitions.semantic_type, block_definitions.semantic_label,
+        block_definitions.usage_context, block_definitions.tags, block_definitions.metadata
+    ) IS DISTINCT FROM (
+        EXCLUDED.svg_content, EXCLUDED.domain, EXCLUDED.category,
+        EXCLUDED.semantic_type, EXCLUDED.semantic_label,
+        EXCLUDED.usage_context, EXCLUDED.tags, EXCLUDED.metadata
+    )
+    RETURNING block_name, block_id
+"""
+
+def _lookup_block_ids(names) -> Dict[str, str]:
+    rows = execute_query(
+        "SELECT block_name, block_id FROM block_definitions WHERE block_name = ANY(%s)",
+        (list(names),)
+    )
+    return {row['block_name']: str(row['block_id']) for row in rows}
+
 def create_block_definition(
     block_name: str,
     svg_content: str,
@@ -116,42 +746,84 @@ def create_block_definition(
 ) -> str:
     """Create a new block definition (symbol)."""
     
-    block_id = str(uuid.uuid4())
-    
-    query = """
-        INSERT INTO block_definitions (
-            block_id, block_name, svg_content, domain, category,
-            semantic_type, semantic_label, usage_context, tags, metadata,
-            space_type
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (block_name) DO UPDATE SET
-            svg_content = EXCLUDED.svg_content,
-            domain = EXCLUDED.domain,
-            category = EXCLUDED.category,
-            semantic_type = EXCLUDED.semantic_type,
-            semantic_label = EXCLUDED.semantic_label,
-            usage_context = EXCLUDED.usage_context,
-            tags = EXCLUDED.tags,
-            metadata = EXCLUDED.metadata
-        RETURNING block_id
-    """
+    query = _BLOCK_UPSERT_SQL.format(values="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
     
-    result = execute_single(query, (
-        block_id, block_name, svg_content, domain, category,
-        semantic_type, semantic_label, usage_context, tags,
-        Json(metadata) if metadata else None, 'BOTH'
-    ))
+    with transaction():
+        result = execute_single(query, (
+            block_name, svg_content, domain, category,
+            semantic_type, semantic_label, usage_context, tags,
+            _Json(metadata) if metadata else None, 'BOTH'
+        ))
+        if result:
+            block_id = str(result['block_id'])
+        else:
+            block_id = _lookup_block_ids([block_name])[block_name]
     
-    return result['block_id']
+    _remember_block_ids({block_name: block_id})
+    return block_id
+
+def create_block_definitions_bulk(blocks: List[Dict], page_size: int = 500) -> Dict[str, str]:
+    """
+    Register many block definitions in batched upserts.
+
+    Each item takes the same keys as create_block_definition(). Items are
+    de-duplicated by block_name (last one wins) because a single INSERT ...
+    ON CONFLICT cannot touch the same row twice. Returns {block_name: block_id}.
+    """
+    unique = {item['block_name']: item for item in blocks}
+    if not unique:
+        return {}
+
+    rows = [
+        (
+            item['block_name'],
+            item.get('svg_content'),
+            item.get('domain'),
+            item.get('category'),
+            item.get('semantic_type'),
+            item.get('semantic_label'),
+            item.get('usage_context'),
+            item.get('tags'),
+            _Json(item['metadata']) if item.get('metadata') else None,
+            'BOTH'
+        )
+        for item in unique.values()
+    ]
+
+    with transaction() as cur:
+        result = execute_values(cur, _BLOCK_UPSERT_SQL.format(values="%s"), rows, page_size=page_size, fetch=True)
+        block_ids = {row[0]: str(row[1]) for row in result}
+        unchanged = unique.keys() - block_ids.keys()
+        if unchanged:
+            block_ids.update(_lookup_block_ids(unchanged))
+
+    _remember_block_ids(block_ids)
+    return block_ids
 
 def get_block_definition(block_name: str) -> Optional[Dict]:
-    """Get block definition by name."""
-    query = "SELECT * FROM block_definitions WHERE block_name = %s"
-    return execute_single(query, (block_name,))
+    """Get the full block definition by name, including its SVG."""
+    return execute_single_prepared('get_block_definition', (block_name,))
+
+def resolve_block_ids(names: List[str]) -> Dict[str, str]:
+    """Map block names to block_ids; unknown names are omitted.
+
+    Cached names are answered locally and the rest are fetched in one query.
+    """
+    wanted = set(names)
+    found = {name: _block_id_cache[name] for name in wanted if name in _block_id_cache}
+    missing = wanted - found.keys()
+    if missing:
+        fetched = _lookup_block_ids(missing)
+        _remember_block_ids(fetched)
+        found.update(fetched)
+    return found
 
 def get_all_blocks() -> List[Dict]:
     """Get all block definitions."""
-    return execute_query("SELECT * FROM block_definitions ORDER BY block_name")
+    return execute_query(
+        f"SELECT {_BLOCK_DEFINITION_COLUMNS} FROM block_definitions ORDER BY block_name",
+        readonly=True
+    )
 
 # ============================================
 # DRAWINGS
@@ -170,42 +842,178 @@ def create_drawing(
 ) -> str:
     """Create a new drawing record."""
     
-    drawing_id = str(uuid.uuid4())
-    
     query = """
         INSERT INTO drawings (
-            drawing_id, project_id, drawing_name, drawing_number,
+            project_id, drawing_name, drawing_number,
             drawing_type, scale, dxf_content, description, tags, metadata
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         RETURNING drawing_id
     """
     
     result = execute_single(query, (
-        drawing_id, project_id, drawing_name, drawing_number,
+        project_id, drawing_name, drawing_number,
         drawing_type, scale, dxf_content, description, tags,
-        Json(metadata) if metadata else None
+        _Json(metadata) if metadata else None
     ))
     
     return result['drawing_id']
 
 def get_drawing(drawing_id: str) -> Optional[Dict]:
     """Get drawing by ID."""
-    query = "SELECT * FROM drawings WHERE drawing_id = %s"
-    return execute_single(query, (drawing_id,))
+    return execute_single_prepared('get_drawing', (drawing_id,), readonly=True)
+
+# DXF payloads larger than this are streamed through COPY instead of being
+# escaped into the UPDATE statement as one giant literal.
+_DXF_COPY_THRESHOLD = 1_000_000
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+def _copy_text_escape(value: str) -> str:
+    """Escape a value for PostgreSQL's COPY text format."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+        .replace('\t', '\\t')
+    )
+
+
+def _iter_copy_row(fields) -> Iterator[str]:
+    """Yield one COPY text-format row in bounded chunks."""
+    for idx, value in enumerate(fields):
+        if idx:
+            yield '\t'
+        if value is None:
+            yield '\\N'
+            continue
+        text = str(value)
+        for start in range(0, len(text), _COPY_CHUNK_SIZE):
+            yield _copy_text_escape(text[start:start + _COPY_CHUNK_SIZE])
+    yield '\n'
+
+
+class _CopyReader:
+    """Minimal file-like wrapper so copy_expert can pull chunks from an iterator."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> str:
+        return next(self._chunks, '')
+
+    readline = read
+
+
+def _copy_value(value: Any) -> Any:
+    """Render a Python value the way COPY text format expects it (before escaping)."""
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        return _json_dumps(value)
+    return value
+
+
+def _iter_copy_rows(rows) -> Iterator[str]:
+    """Yield COPY text-format rows batched into roughly _COPY_CHUNK_SIZE strings."""
+    buffer: List[str] = []
+    size = 0
+    for row in rows:
+        line = ''.join(_iter_copy_row(_copy_value(value) for value in row))
+        buffer.append(line)
+        size += len(line)
+        if size >= _COPY_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _copy_rows(cur, table: str, columns: List[str], rows) -> None:
+    """Stream rows (sequences matching columns) into table with COPY FROM STDIN."""
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+        _CopyReader(_iter_copy_rows(rows)),
+        size=_COPY_CHUNK_SIZE
+    )
+
 
 def update_drawing_dxf(drawing_id: str, dxf_content: str):
     """Update the DXF content of a drawing."""
+    if dxf_content is not None and len(dxf_content) > _DXF_COPY_THRESHOLD:
+        with transaction() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS drawing_dxf_stage (
+                    drawing_id uuid,
+                    dxf_content text
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            cur.execute("TRUNCATE drawing_dxf_stage")
+            cur.copy_expert(
+                "COPY drawing_dxf_stage (drawing_id, dxf_content) FROM STDIN",
+                _CopyReader(_iter_copy_row((drawing_id, dxf_content))),
+                size=_COPY_CHUNK_SIZE
+            )
+            cur.execute(
+                """
+                UPDATE drawings d
+                SET dxf_content = s.dxf_content, updated_at = CURRENT_TIMESTAMP
+                FROM drawing_dxf_stage s
+                WHERE d.drawing_id = s.drawing_id
+                """
+            )
+        return
+
     query = """
         UPDATE drawings 
         SET dxf_content = %s, updated_at = CURRENT_TIMESTAMP
         WHERE drawing_id = %s
     """
-    execute_query(query, (dxf_content, drawing_id), fetch=False)
+    execute_write(query, (dxf_content, drawing_id))
 
 # ============================================
 # LAYERS
 # ============================================
 
+_LAYER_UPSERT_SQL = """
+    INSERT INTO layers (
+        drawing_id, layer_name, color, linetype, lineweight,
+        is_plottable, is_locked, is_frozen, layer_standard_id
+    ) VALUES {values}
+    ON CONFLICT (drawing_id, layer_name) DO UPDATE SET
+        color = EXCLUDED.color,
+        linetype = EXCLUDED.linetype,
+        lineweight = EXCLUDED.lineweight,
+        layer_standard_id = EXCLUDED.layer_standard_id
+    RETURNING layer_id, layer_name
+"""
+
+# Falls back to the layer standard with the same name when no id is given.
+_LAYER_VALUES_SQL = (
+    "(%s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, "
+    "(SELECT layer_standard_id FROM layer_standards WHERE layer_name = %s LIMIT 1)))"
+)
+
+
+def _layer_row(drawing_id: str, layer: Dict[str, Any]) -> tuple:
+    layer_name = layer['layer_name']
+    return (
+        drawing_id, layer_name,
+        layer.get('color'),
+        layer.get('linetype', 'CONTINUOUS'),
+        layer.get('lineweight', 0.25),
+        layer.get('is_plottable', True),
+        layer.get('is_locked', False),
+        layer.get('is_frozen', False),
+        layer.get('layer_standard_id'),
+        layer_name,
+    )
+
+
 def create_layer(
     drawing_id: str,
     layer_name: str,
@@ -217,60 +1025,47 @@ def create_layer(
     is_frozen: bool = False,
     layer_standard_id: str = None
 ) -> str:
-    """Create a layer for a specific drawing."""
-    
-    layer_id = str(uuid.uuid4())
-    
-    # Try to find matching layer standard
-    if not layer_standard_id:
-        standard = execute_single(
-            "SELECT layer_standard_id FROM layer_standards WHERE layer_name = %s",
-            (layer_name,)
-        )
-        if standard:
-            layer_standard_id = standard['layer_standard_id']
-    
-    # Check if layer already exists
-    existing = execute_single(
-        "SELECT layer_id FROM layers WHERE drawing_id = %s AND layer_name = %s",
-        (drawing_id, layer_name)
-    )
+    """Create a layer for a specific drawing, or update it if the name exists."""
+    row = _layer_row(drawing_id, {
+        'layer_name': layer_name,
+        'color': color,
+        'linetype': linetype,
+        'lineweight': lineweight,
+        'is_plottable': is_plottable,
+        'is_locked': is_locked,
+        'is_frozen': is_frozen,
+        'layer_standard_id': layer_standard_id,
+    })
+    result = execute_single(_LAYER_UPSERT_SQL.format(values=_LAYER_VALUES_SQL), row)
+    return result['layer_id']
 
-    if existing:
-        # Update existing layer
-        execute_query(
-            """
-            UPDATE layers SET
-                color = %s,
-                linetype = %s,
-                lineweight = %s,
-                layer_standard_id = %s
-            WHERE layer_id = %s
-            """,
-            (color, linetype, lineweight, layer_standard_id, existing['layer_id']),
-            fetch=False
-        )
-        return existing['layer_id']
+def create_layers_bulk(drawing_id: str, layers: List[Dict[str, Any]], page_size: int = 500) -> Dict[str, str]:
+    """
+    Upsert many layers for one drawing; returns {layer_name: layer_id}.
 
-    query = """
-        INSERT INTO layers (
-            layer_id, drawing_id, layer_name, color, linetype, lineweight,
-            is_plottable, is_locked, is_frozen, layer_standard_id
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING layer_id
+    Each item takes create_layer() keyword names. Duplicate names keep the
+    last entry, since one statement cannot update the same row twice.
     """
-    
-    result = execute_single(query, (
-        layer_id, drawing_id, layer_name, color, linetype, lineweight,
-        is_plottable, is_locked, is_frozen, layer_standard_id
-    ))
-    
-    return result['layer_id']
+    unique = {layer['layer_name']: layer for layer in layers}
+    if not unique:
+        return {}
+
+    rows = [_layer_row(drawing_id, layer) for layer in unique.values()]
+    with transaction() as cur:
+        result = execute_values(
+            cur,
+            _LAYER_UPSERT_SQL.format(values='%s'),
+            rows,
+            template=_LAYER_VALUES_SQL,
+            page_size=page_size,
+            fetch=True
+        )
+    return {row[1]: str(row[0]) for row in result}
 
 def get_layers(drawing_id: str) -> List[Dict]:
     """Get all layers for a drawing."""
-    query = "SELECT * FROM layers WHERE drawing_id = %s ORDER BY layer_name"
-    return execute_query(query, (drawing_id,))
+    query = f"SELECT {_LAYER_COLUMNS} FROM layers WHERE drawing_id = %s ORDER BY layer_name"
+    return execute_query(query, (drawing_id,), readonly=True)
 
 # ============================================
 # BLOCK INSERTS (SYMBOL PLACEMENTS)
@@ -290,60 +1085,146 @@ def create_block_insert(
 ) -> str:
     """Create a block insert (symbol placement)."""
     
-    insert_id = str(uuid.uuid4())
-    
-    # Get block_id from block_name
-    block = get_block_definition(block_name)
-    if not block:
+    block_id = resolve_block_ids([block_name]).get(block_name)
+    if not block_id:
         raise ValueError(f"Block definition '{block_name}' not found")
     
-    block_id = block['block_id']
-    
     query = """
         INSERT INTO block_inserts (
-            insert_id, drawing_id, block_id, insert_x, insert_y, insert_z,
+            drawing_id, block_id, insert_x, insert_y, insert_z,
             scale_x, scale_y, rotation, layout_name, metadata
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         RETURNING insert_id
     """
     
     result = execute_single(query, (
-        insert_id, drawing_id, block_id, insert_x, insert_y, insert_z,
+        drawing_id, block_id, insert_x, insert_y, insert_z,
         scale_x, scale_y, rotation, 'Model',
-        Json(metadata) if metadata else None
+        _Json(metadata) if metadata else None
     ))
     
     return result['insert_id']
 
+def create_block_inserts_bulk(
+    drawing_id: str,
+    inserts: List[Dict],
+    page_size: int = 1000
+) -> List[str]:
+    """Create many block inserts for a drawing in batched statements.
+
+    Each item takes the same keys as create_block_insert(). insert_id is left
+    to the column default (gen_random_uuid()) and the generated ids are
+    returned in input order.
+    """
+    if not inserts:
+        return []
+
+    names = {item['block_name'] for item in inserts}
+    block_ids = resolve_block_ids(list(names))
+    unknown = sorted(names - block_ids.keys())
+    if unknown:
+        raise ValueError(f"Block definitions not found: {', '.join(unknown)}")
+
+    rows = [
+        (
+            drawing_id,
+            block_ids[item['block_name']],
+            item['insert_x'],
+            item['insert_y'],
+            item.get('insert_z', 0),
+            item.get('scale_x', 1.0),
+            item.get('scale_y', 1.0),
+            item.get('rotation', 0),
+            'Model',
+            _Json(item['metadata']) if item.get('metadata') else None
+        )
+        for item in inserts
+    ]
+
+    insert_ids = insert_many(
+        'block_inserts',
+        ['drawing_id', 'block_id', 'insert_x', 'insert_y', 'insert_z',
+         'scale_x', 'scale_y', 'rotation', 'layout_name', 'metadata'],
+        rows,
+        page_size=page_size,
+        returning='insert_id'
+    )
+    return [str(insert_id) for insert_id in insert_ids]
+
+# Rows of one bulk insert share created_at (transaction time), so insert_id
+# breaks ties; idx_block_inserts_drawing_order returns rows in this order.
+_BLOCK_INSERTS_SQL = """
+    SELECT 
+        bi.insert_id, bi.drawing_id, bi.block_id,
+        bi.insert_x, bi.insert_y, bi.insert_z,
+        bi.scale_x, bi.scale_y, bi.rotation,
+        bi.layout_name, bi.metadata, bi.created_at,
+        bd.block_name,
+        bd.domain,
+        bd.category
+    FROM block_inserts bi
+    JOIN block_definitions bd ON bi.block_id = bd.block_id
+    WHERE bi.drawing_id = %s
+    ORDER BY bi.created_at, bi.insert_id
+"""
+
 def get_block_inserts(drawing_id: str) -> List[Dict]:
     """Get all block inserts for a drawing."""
-    query = """
-        SELECT 
-            bi.*,
-            bd.block_name,
-            bd.domain,
-            bd.category
-        FROM block_inserts bi
-        JOIN block_definitions bd ON bi.block_id = bd.block_id
-        WHERE bi.drawing_id = %s
-        ORDER BY bi.created_at
-    """
-    return execute_query(query, (drawing_id,))
+    return execute_query(_BLOCK_INSERTS_SQL, (drawing_id,), readonly=True)
+
+def iter_block_inserts(drawing_id: str, chunk: int = 5000) -> Iterator[Dict]:
+    """Stream block inserts for a drawing without loading them all at once."""
+    return iter_query(_BLOCK_INSERTS_SQL, (drawing_id,), chunk=chunk, readonly=True)
+
+def count_block_inserts(drawing_id: str) -> int:
+    """Count block inserts for a drawing."""
+    result = execute_single(
+        "SELECT COUNT(*) AS insert_count FROM block_inserts WHERE drawing_id = %s",
+        (drawing_id,),
+        readonly=True
+    )
+    return result['insert_count'] if result else 0
 
 # ============================================
 # LAYER STANDARDS
 # ============================================
 
+# Layer standards are reference data, so the whole table is loaded once and
+# served from memory for _LAYER_STANDARDS_TTL seconds. Call
+# invalidate_layer_standards_cache() after editing standards; otherwise the
+# edits show up once the TTL expires.
+_LAYER_STANDARDS_TTL = 300.0
+_layer_standards_cache: Optional[tuple] = None  # (loaded_at, rows, rows_by_name)
+
+
+def _layer_standards() -> tuple:
+    global _layer_standards_cache
+    cached = _layer_standards_cache
+    now = time.monotonic()
+    if cached is None or now - cached[0] > _LAYER_STANDARDS_TTL:
+        rows = execute_query(
+            f"SELECT {_LAYER_STANDARD_COLUMNS} FROM layer_standards ORDER BY display_order, layer_name",
+            readonly=True
+        )
+        cached = (now, rows, {row['layer_name']: row for row in rows})
+        _layer_standards_cache = cached
+    return cached
+
+
+def invalidate_layer_standards_cache() -> None:
+    """Drop the cached layer standards so the next read reloads them."""
+    global _layer_standards_cache
+    _layer_standards_cache = None
+
+
 def get_layer_standard(layer_name: str) -> Optional[Dict]:
     """Get layer standard by name."""
-    query = "SELECT * FROM layer_standards WHERE layer_name = %s"
-    return execute_single(query, (layer_name,))
+    row = _layer_standards()[2].get(layer_name)
+    return dict(row) if row is not None else None
 
 def get_all_layer_standards() -> List[Dict]:
     """Get all layer standards."""
-    return execute_query(
-        "SELECT * FROM layer_standards ORDER BY display_order, layer_name"
-    )
+    return [dict(row) for row in _layer_standards()[1]]
 
 # ============================================
 # CANONICAL FEATURES
@@ -397,7 +1278,7 @@ def insert_canonical_feature(
         )
         RETURNING feature_id
     """
-    metadata_json = Json(metadata) if metadata is not None else None
+    metadata_json = _Json(metadata) if metadata is not None else None
 
     result = execute_single(
         query,
@@ -418,52 +1299,174 @@ def insert_canonical_feature(
     return result['feature_id'] if result else None
 
 
-def list_canonical_features(
+def insert_canonical_features_bulk(
     drawing_id: str,
-    bbox: Optional[tuple] = None,
-    target_srid: Optional[int] = 4326,
-    simplify_tolerance: Optional[float] = None,
-    limit: Optional[int] = None
-) -> List[Dict]:
+    project_id: str,
+    features: List[tuple],
+    page_size: int = 1000
+) -> int:
     """
-    Return canonical features for a drawing, optionally filtered by bbox and simplified.
-    Adds layer metadata (color, ids) so the map can style features consistently.
+    Insert many canonical features for one drawing in batched statements.
+
+    Each feature is a (feature_type, layer_name, native_wkt, native_srid,
+    canonical_wkt, metadata) tuple, matching insert_canonical_feature().
+    Returns the number of rows written.
     """
-    srid = target_srid or 4326
-    geom_expr = "cf.geom"
-    params: List[Any] = []
+    if not features:
+        return 0
 
-    if srid != 4326:
-        geom_expr = "ST_Transform(cf.geom, %s)"
-        params.append(srid)
+    rows = [
+        (
+            drawing_id,
+            project_id,
+            feature_type,
+            layer_name,
+            native_wkt,
+            native_srid,
+            native_srid,
+            canonical_wkt,
+            _Json(metadata) if metadata is not None else None,
+        )
+        for feature_type, layer_name, native_wkt, native_srid, canonical_wkt, metadata in features
+    ]
+    query = """
+        INSERT INTO canonical_features (
+            drawing_id, project_id, feature_type, layer_name,
+            native_geom, native_srid, geom, metadata
+        ) VALUES %s
+    """
+    # ST_GeomFromText is strict, so NULL WKT yields a NULL geometry without a CASE.
+    template = (
+        "(%s, %s, %s, %s, ST_SetSRID(ST_GeomFromText(%s), COALESCE(%s, 0)), %s, "
+        "ST_SetSRID(ST_GeomFromText(%s), 4326), %s)"
+    )
+    with transaction() as cur:
+        execute_values(cur, query, rows, template=template, page_size=page_size)
+    return len(rows)
 
-    if simplify_tolerance and simplify_tolerance > 0:
-        geom_expr = f"ST_SimplifyPreserveTopology({geom_expr}, %s)"
-        params.append(simplify_tolerance)
 
-    query = f"""
+# Per-drawing layer styling, resolved once: the drawing's own layers (with
+# their standard, linked by id or else by name) plus any standard whose name
+# has no drawing layer. Features then join it on layer_name alone instead of
+# through an OR predicate that forces a nested loop. Takes drawing_id twice.
+_RESOLVED_LAYERS_CTE = """
+    resolved_layers AS (
         SELECT
+            l.layer_name,
+            l.layer_id,
+            COALESCE(l.layer_standard_id, ls.layer_standard_id) AS layer_standard_id,
+            COALESCE(l.color, ls.color) AS color_index,
+            ls.color_rgb,
+            COALESCE(ls.color_name, l.metadata ->> 'color_name') AS color_name
+        FROM layers l
+        LEFT JOIN layer_standards ls
+          ON ls.layer_standard_id = COALESCE(
+               l.layer_standard_id,
+               (SELECT s.layer_standard_id FROM layer_standards s WHERE s.layer_name = l.layer_name LIMIT 1)
+             )
+        WHERE l.drawing_id = %s
+        UNION ALL
+        SELECT ls.layer_name, NULL::uuid, ls.layer_standard_id, ls.color, ls.color_rgb, ls.color_name
+        FROM layer_standards ls
+        WHERE NOT EXISTS (
+            SELECT 1 FROM layers l WHERE l.drawing_id = %s AND l.layer_name = ls.layer_name
+        )
+    )
+"""
+
+# Target-SRID units per degree around one of the drawing's features.
+# Takes (target_srid, drawing_id).
+_SIMPLIFY_SCALE_CTE = """
+    simplify_scale AS (
+        SELECT GREATEST(
+                   ST_Distance(ST_Transform(s.p, t.srid), ST_Transform(ST_Translate(s.p, 0.001, 0), t.srid)),
+                   ST_Distance(ST_Transform(s.p, t.srid), ST_Transform(ST_Translate(s.p, 0, 0.001), t.srid))
+               ) / 0.001 AS units_per_degree
+        FROM (SELECT %s::integer AS srid) t
+        CROSS JOIN (
+            SELECT ST_PointOnSurface(geom) AS p
+            FROM canonical_features
+            WHERE drawing_id = %s AND geom IS NOT NULL
+            LIMIT 1
+        ) s
+    )
+"""
+
+_CANONICAL_FEATURE_COLUMNS = """
             cf.feature_id,
             cf.drawing_id,
             cf.project_id,
             cf.feature_type,
             cf.layer_name,
-            ST_AsGeoJSON({geom_expr}) AS geom,
+            {geom},
             cf.metadata,
-            l.layer_id,
-            COALESCE(l.layer_standard_id, ls.layer_standard_id) AS layer_standard_id,
-            COALESCE(l.color, ls.color) AS layer_color_index,
-            ls.color_rgb AS layer_color_rgb,
-            COALESCE(ls.color_name, l.metadata ->> 'color_name') AS layer_color_name
+            lr.layer_id,
+            lr.layer_standard_id,
+            lr.color_index AS layer_color_index,
+            lr.color_rgb AS layer_color_rgb,
+            lr.color_name AS layer_color_name
+"""
+
+def _canonical_features_query(
+    drawing_id: str,
+    bbox: Optional[tuple],
+    target_srid: Optional[int],
+    simplify_tolerance: Optional[float],
+    limit: Optional[int],
+    as_feature_json: bool = False
+):
+    """Build the canonical feature listing query and its params.
+
+    With as_feature_json the database emits each row as a finished GeoJSON
+    Feature (json column 'feature') so callers can pass it through untouched.
+    """
+    srid = target_srid or 4326
+    simplify = bool(simplify_tolerance and simplify_tolerance > 0)
+    ctes = [_RESOLVED_LAYERS_CTE]
+    params: List[Any] = [drawing_id, drawing_id]
+
+    if srid == 4326:
+        geom_expr = "cf.geom"
+        if simplify:
+            geom_expr = "ST_SimplifyPreserveTopology(cf.geom, %s)"
+            params.append(simplify_tolerance)
+    elif simplify:
+        # Simplify in 4326 before projecting so ST_Transform only sees the
+        # surviving vertices. The tolerance is given in target units; it is
+        # converted to degrees with the larger of the x/y scales sampled at
+        # one feature (drawings cover a small area), so the result is never
+        # coarser than requested.
+        ctes.append(_SIMPLIFY_SCALE_CTE)
+        params.extend([srid, drawing_id])
+        geom_expr = (
+            "ST_Transform(ST_SimplifyPreserveTopology(cf.geom, "
+            "COALESCE(%s / (SELECT units_per_degree FROM simplify_scale), 0)), %s)"
+        )
+        params.extend([simplify_tolerance, srid])
+    else:
+        geom_expr = "ST_Transform(cf.geom, %s)"
+        params.append(srid)
+
+    columns = _CANONICAL_FEATURE_COLUMNS.format(geom=f"ST_AsGeoJSON({geom_expr}) AS geom")
+    if as_feature_json:
+        select = f"""
+            json_build_object(
+                'type', 'Feature',
+                'geometry', r.geom::json,
+                'properties', to_jsonb(r) - 'geom'
+            ) AS feature
+        FROM (
+            SELECT {columns}"""
+        close = ") r"
+    else:
+        select = columns
+        close = ""
+
+    query = f"""
+        WITH {', '.join(ctes)}
+        SELECT {select}
         FROM canonical_features cf
-        LEFT JOIN layers l
-          ON l.drawing_id = cf.drawing_id
-         AND l.layer_name = cf.layer_name
-        LEFT JOIN layer_standards ls
-          ON (
-               (l.layer_standard_id IS NOT NULL AND ls.layer_standard_id = l.layer_standard_id)
-               OR (l.layer_standard_id IS NULL AND ls.layer_name = cf.layer_name)
-             )
+        LEFT JOIN resolved_layers lr ON lr.layer_name = cf.layer_name
         WHERE cf.drawing_id = %s
           AND cf.geom IS NOT NULL
     """
@@ -483,7 +1486,101 @@ def list_canonical_features(
         query += " LIMIT %s"
         params.append(limit)
 
-    return execute_query(query, tuple(params))
+    return query + close, tuple(params)
+
+def list_canonical_features(
+    drawing_id: str,
+    bbox: Optional[tuple] = None,
+    target_srid: Optional[int] = 4326,
+    simplify_tolerance: Optional[float] = None,
+    limit: Optional[int] = None
+) -> List[Dict]:
+    """
+    Return canonical features for a drawing, optionally filtered by bbox and simplified.
+    Adds layer metadata (color, ids) so the map can style features consistently.
+    """
+    return execute_query(*_canonical_features_query(drawing_id, bbox, target_srid, simplify_tolerance, limit))
+
+def get_canonical_features_json(
+    drawing_id: str,
+    bbox: Optional[tuple] = None,
+    target_srid: Optional[int] = 4326,
+    simplify_tolerance: Optional[float] = None,
+    limit: Optional[int] = None
+) -> tuple:
+    """
+    Return (features, count) where features is the JSON text of an array of
+    GeoJSON Features assembled by the database, ready to be written into a
+    response without decoding. Same filters and properties as
+    list_canonical_features.
+    """
+    query, params = _canonical_features_query(
+        drawing_id, bbox, target_srid, simplify_tolerance, limit, as_feature_json=True
+    )
+    row = execute_single(
+        f"""
+        SELECT COALESCE(json_agg(f.feature), '[]'::json)::text AS features,
+               COUNT(*) AS feature_count
+        FROM ({query}) f
+        """,
+        params,
+        readonly=True
+    )
+    return row['features'], row['feature_count']
+
+def iter_canonical_features(
+    drawing_id: str,
+    bbox: Optional[tuple] = None,
+    target_srid: Optional[int] = 4326,
+    simplify_tolerance: Optional[float] = None,
+    limit: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Stream canonical features as GeoJSON Feature strings through a
+    server-side cursor; same filters and properties as list_canonical_features.
+    """
+    query, params = _canonical_features_query(
+        drawing_id, bbox, target_srid, simplify_tolerance, limit, as_feature_json=True
+    )
+    query = f"SELECT f.feature::text AS feature FROM ({query}) f"
+    for row in iter_query(query, params, chunk=2000, readonly=True):
+        yield row['feature']
+
+def list_canonical_features_mvt(drawing_id: str, z: int, x: int, y: int) -> bytes:
+    """
+    Render a drawing's canonical features for one web-mercator tile as a
+    Mapbox Vector Tile (layer 'features').
+
+    The whole tile comes back as a single bytea, so the per-feature GeoJSON
+    text of list_canonical_features never crosses the wire.
+    """
+    query = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS env
+        ),
+        {_RESOLVED_LAYERS_CTE},
+        mvt AS (
+            SELECT
+                ST_AsMVTGeom(ST_Transform(cf.geom, 3857), bounds.env) AS geom,
+                cf.feature_id::text AS feature_id,
+                cf.feature_type,
+                cf.layer_name,
+                lr.color_index AS layer_color_index,
+                lr.color_rgb AS layer_color_rgb
+            FROM canonical_features cf
+            CROSS JOIN bounds
+            LEFT JOIN resolved_layers lr ON lr.layer_name = cf.layer_name
+            WHERE cf.drawing_id = %s
+              AND cf.geom IS NOT NULL
+              AND cf.geom && ST_Transform(bounds.env, 4326)
+        )
+        SELECT ST_AsMVT(mvt, 'features', 4096, 'geom') AS tile
+        FROM mvt
+        WHERE geom IS NOT NULL
+    """
+    row = execute_single(query, (z, x, y, drawing_id, drawing_id, drawing_id), readonly=True)
+    tile = row['tile'] if row else None
+    return bytes(tile) if tile is not None else b''
 
 # ============================================
 # PROJECTS
@@ -498,19 +1595,17 @@ def create_project(
 ) -> str:
     """Create a new project."""
     
-    project_id = str(uuid.uuid4())
-    
     query = """
         INSERT INTO projects (
-            project_id, project_name, project_number, client_name,
+            project_name, project_number, client_name,
             description, metadata
-        ) VALUES (%s, %s, %s, %s, %s, %s)
+        ) VALUES (%s, %s, %s, %s, %s)
         RETURNING project_id
     """
     
     result = execute_single(query, (
-        project_id, project_name, project_number, client_name,
-        description, Json(metadata) if metadata else None
+        project_name, project_number, client_name,
+        description, _Json(metadata) if metadata else None
     ))
     
     return result['project_id']
@@ -524,37 +1619,76 @@ def get_project(project_id: str) -> Optional[Dict]:
 # EMBEDDINGS
 # ============================================
 
+def _embedding_floats(values) -> List[float]:
+    """Return an embedding as Python floats, rejecting NaN and infinities."""
+    floats = [float(v) for v in values]
+    if not all(map(math.isfinite, floats)):
+        raise ValueError("Embedding contains NaN or infinite components")
+    return floats
+
+def _vector_literal(values) -> str:
+    """Format an embedding as pgvector text input ('[x,y,...]').
+
+    pgvector stores float32, so 9 significant digits round-trip exactly;
+    repr() of the widened float64 would send up to 17 digits per component.
+    """
+    return '[' + ','.join(format(v, '.9g') for v in _embedding_floats(values)) + ']'
+
 def update_block_embedding(block_id: str, embedding: List[float]):
     """Update block embedding vector."""
     query = """
         UPDATE block_definitions 
-        SET block_embedding = %s
+        SET block_embedding = %s::float8[]
         WHERE block_id = %s
     """
-    execute_query(query, (embedding, block_id), fetch=False)
+    execute_write(query, (_embedding_floats(embedding), block_id))
 
 def update_layer_embedding(layer_standard_id: str, embedding: List[float]):
     """Update layer standard embedding vector."""
     query = """
         UPDATE layer_standards 
-        SET layer_embedding = %s
+        SET layer_embedding = %s::float8[]
         WHERE layer_standard_id = %s
     """
-    execute_query(query, (embedding, layer_standard_id), fetch=False)
+    execute_write(query, (_embedding_floats(embedding), layer_standard_id))
 
 def update_drawing_embedding(drawing_id: str, embedding: List[float]):
     """Update drawing embedding vector."""
     query = """
         UPDATE drawings 
-        SET drawing_embedding = %s
+        SET drawing_embedding = %s::float8[]
         WHERE drawing_id = %s
     """
-    execute_query(query, (embedding, drawing_id), fetch=False)
+    execute_write(query, (_embedding_floats(embedding), drawing_id))
 
 # ============================================
 # SEMANTIC SEARCH
 # ============================================
 
+# One prebuilt statement per allowed (table, embedding column) so repeated
+# searches send identical SQL text.
+# The embedding is bound and cast once in the CTE; the scalar subqueries turn
+# it into an init-plan parameter, which still lets a vector index drive the
+# ORDER BY (a plain join against the CTE would not).
+_VECTOR_SEARCH_SQL: Dict[tuple, str] = {
+    (table, embedding_column): f"""
+        WITH q AS MATERIALIZED (SELECT %s::vector AS v)
+        SELECT
+            {id_column},
+            {name_column},
+            1 - ({embedding_column} <=> (SELECT v FROM q)) as similarity
+        FROM {table}
+        WHERE {embedding_column} IS NOT NULL
+        ORDER BY {embedding_column} <=> (SELECT v FROM q)
+        LIMIT %s
+    """
+    for table, embedding_column, id_column, name_column in (
+        ('block_definitions', 'block_embedding', 'block_id', 'block_name'),
+        ('layer_standards', 'layer_embedding', 'layer_standard_id', 'layer_name'),
+        ('drawings', 'drawing_embedding', 'drawing_id', 'drawing_name'),
+    )
+}
+
 def vector_search(
     table: str,
     embedding_column: str,
@@ -570,169 +1704,330 @@ def vector_search(
         query_embedding: Vector to search for
         limit: Number of results
     """
-    
-    id_column = {
-        'block_definitions': 'block_id',
-        'layer_standards': 'layer_standard_id',
-        'drawings': 'drawing_id'
-    }[table]
-    
-    name_column = {
-        'block_definitions': 'block_name',
-        'layer_standards': 'layer_name',
-        'drawings': 'drawing_name'
-    }[table]
-    
-    query = f"""
-        SELECT 
-            {id_column},
-            {name_column},
-            1 - ({embedding_column} <=> %s::vector) as similarity
-        FROM {table}
-        WHERE {embedding_column} IS NOT NULL
-        ORDER BY {embedding_column} <=> %s::vector
-        LIMIT %s
-    """
-    
-    return execute_query(query, (query_embedding, query_embedding, limit))
+    query = _VECTOR_SEARCH_SQL.get((table, embedding_column))
+    if query is None:
+        raise ValueError(f"Unsupported vector search target: {table}.{embedding_column}")
+
+    return execute_query(query, (_vector_literal(query_embedding), limit), readonly=True)
 
 # ============================================
 # CIVIL TOOLS STUB HELPERS
 # ============================================
 
 def _json_or_none(value: Any):
-    return Json(value) if value is not None else None
+    return _Json(value) if value is not None else None
+
+
+def _as_wkb(geom: Any) -> Optional[bytes]:
+    """Return WKB/EWKB bytes for bytes-like or shapely-style input, else None."""
+    if isinstance(geom, (bytes, bytearray, memoryview)):
+        return bytes(geom)
+    wkb = getattr(geom, 'wkb', None)
+    if isinstance(wkb, bytes):
+        return wkb
+    return None
+
+
+# Geometry input kinds, as returned by _classify_geom(); they index _GEOM_CLAUSES.
+_GEOM_NULL, _GEOM_WKB, _GEOM_GEOJSON, _GEOM_WKT = range(4)
+
+_GEOM_CLAUSES = (
+    "NULL",
+    "ST_SetSRID(ST_GeomFromEWKB(%s), %s)",
+    "ST_SetSRID(ST_GeomFromGeoJSON(%s), %s)",
+    "ST_SetSRID(ST_GeomFromText(%s), %s)",
+)
+
+# Leading characters that mark geometry text as GeoJSON rather than WKT.
+_JSON_PREFIXES = frozenset('{[')
+
+
+def _classify_geom(geom: Any):
+    """Return (kind, value) for a geometry input.
+
+    value is the payload to bind: EWKB bytes, GeoJSON text or WKT text
+    (None for _GEOM_NULL). Exact str/dict/list types are dispatched on
+    type() first since they are the common case from the API; subclasses
+    fall through to the isinstance checks.
+    """
+    if geom is None:
+        return _GEOM_NULL, None
+    cls = type(geom)
+    if cls is str:
+        text = geom
+    elif cls is dict or cls is list:
+        return _GEOM_GEOJSON, _json_dumps(geom)
+    elif isinstance(geom, str):
+        text = geom
+    elif isinstance(geom, (dict, list)):
+        return _GEOM_GEOJSON, _json_dumps(geom)
+    else:
+        wkb = _as_wkb(geom)
+        if wkb is not None:
+            return (_GEOM_WKB, wkb) if wkb else (_GEOM_NULL, None)
+        text = str(geom)
+
+    if not text:
+        return _GEOM_NULL, None
+    first = text[0]
+    if first in _JSON_PREFIXES:
+        return _GEOM_GEOJSON, text
+    if not first.isspace():
+        return _GEOM_WKT, text
+    text = text.strip()
+    if not text:
+        return _GEOM_NULL, None
+    if text[0] in _JSON_PREFIXES:
+        return _GEOM_GEOJSON, text
+    return _GEOM_WKT, text
 
 
 def _build_geom_clause(geom: Any, srid: Optional[int] = None, default_srid: int = 3857):
-    """Return SQL fragment and params to insert/update a geometry column."""
-    if geom in (None, ""):
+    """Return SQL fragment and params to insert/update a geometry column.
+
+    Accepts GeoJSON (dict/list/text), WKT, WKB/EWKB bytes or any object
+    exposing ``.wkb`` (e.g. shapely); binary input skips text parsing in
+    PostGIS entirely.
+    """
+    kind, value = _classify_geom(geom)
+    if kind == _GEOM_NULL:
         return "NULL", []
+    if kind == _GEOM_WKB:
+        value = psycopg2.Binary(value)
+    return _GEOM_CLAUSES[kind], [value, default_srid if srid is None else srid]
 
-    if srid is None:
-        srid = default_srid
 
-    if isinstance(geom, (dict, list)):
-        geom_str = json.dumps(geom)
-        return "ST_SetSRID(ST_GeomFromGeoJSON(%s), %s)", [geom_str, srid]
+# Decimal places kept in list GeoJSON; finer than any survey tolerance in
+# projected units and ~40% less text than the default 9.
+_GEOJSON_MAX_DIGITS = 6
 
-    geom_str = str(geom).strip()
-    if not geom_str:
-        return "NULL", []
-    if geom_str.startswith('{') or geom_str.startswith('['):
-        return "ST_SetSRID(ST_GeomFromGeoJSON(%s), %s)", [geom_str, srid]
-    return "ST_SetSRID(ST_GeomFromText(%s), %s)", [geom_str, srid]
 
+def _geom_select(column: str, alias: str, geom_format: str = 'geojson') -> str:
+    """Select-list entry for a geometry column.
 
-def _derive_project_id_from_network(network_id: Optional[str]) -> Optional[str]:
-    if not network_id:
-        return None
-    network = execute_single(
-        "SELECT project_id FROM pipe_networks WHERE network_id = %s",
-        (network_id,)
-    )
-    return network['project_id'] if network else None
+    'geojson' keeps the ``ST_AsGeoJSON(...) AS alias`` text; 'wkb' returns raw
+    ``ST_AsBinary`` bytes as ``alias_wkb`` so the server skips the
+    float-to-text formatting and the payload stays compact; 'none' selects
+    ``NULL AS alias`` for table views that never display the geometry; 'xy'
+    returns ``longitude``/``latitude`` numbers for point columns.
+    """
+    if geom_format == 'wkb':
+        return f"ST_AsBinary({column}) AS {alias}_wkb"
+    if geom_format == 'none':
+        return f"NULL AS {alias}"
+    if geom_format == 'xy':
+        return f"ST_X({column}) AS longitude, ST_Y({column}) AS latitude"
+    if geom_format != 'geojson':
+        raise ValueError(f"Unsupported geom_format: {geom_format}")
+    return f"ST_AsGeoJSON({column}, {_GEOJSON_MAX_DIGITS}) AS {alias}"
+
+
+# Per-row geometry expression for execute_values templates; pairs with _geom_value().
+_GEOM_VALUE_SQL = (
+    "ST_SetSRID(COALESCE(ST_GeomFromEWKB(%(geom_wkb)s), "
+    "CASE WHEN %(geom_is_json)s THEN ST_GeomFromGeoJSON(%(geom)s) "
+    "ELSE ST_GeomFromText(%(geom)s) END), %(srid)s)"
+)
+
+
+def _geom_value(geom: Any, srid: Optional[int] = None, default_srid: int = 3857) -> Dict[str, Any]:
+    """Return template params for _GEOM_VALUE_SQL (the bulk-insert form of _build_geom_clause)."""
+    kind, value = _classify_geom(geom)
+    return {
+        'geom': value if kind in (_GEOM_GEOJSON, _GEOM_WKT) else None,
+        'geom_wkb': psycopg2.Binary(value) if kind == _GEOM_WKB else None,
+        'geom_is_json': kind == _GEOM_GEOJSON,
+        'srid': default_srid if srid is None else srid,
+    }
 
 
-def _execute_update(table: str, pk_column: str, record_id: str, assignments: List[str], params: List[Any]) -> bool:
-    if not assignments:
-        return False
-    params = params + [record_id]
-    query = f"UPDATE {table} SET {', '.join(assignments)} WHERE {pk_column} = %s"
-    execute_query(query, tuple(params), fetch=False)
-    return True
+def _bulk_insert_returning(query: str, rows: List[Any], template: str = None, page_size: int = 500) -> List[str]:
+    """Run an ``INSERT ... VALUES %s RETURNING <id>`` over rows; return ids in order."""
+    if not rows:
+        return []
+    with transaction() as cur:
+        result = execute_values(cur, query, rows, template=template, page_size=page_size, fetch=True)
+    return [str(row[0]) for row in result]
 
-def list_pipe_networks(project_id: Optional[str] = None) -> List[Dict]:
-    """Return pipe networks with aggregated slope statistics."""
-    where = ""
-    params: List[Any] = []
-    if project_id:
-        where = "WHERE pn.project_id = %s"
-        params.append(project_id)
 
-    req = _required_slope_sql("p")
-    metrics_subquery = f"""
-        SELECT
-            p.network_id,
-            COUNT(*) AS pipe_count,
-            SUM(CASE WHEN p.slope IS NOT NULL AND ({req}) IS NOT NULL AND p.slope < ({req}) THEN 1 ELSE 0 END) AS pipes_below_min,
-            AVG(p.slope) AS avg_slope,
-            MIN(p.slope - ({req})) AS worst_margin
-        FROM pipes p
-        GROUP BY p.network_id
+def _make_updater(
+    table: str,
+    pk_column: str,
+    fields: tuple,
+    json_fields: tuple = (),
+    geom_column: Optional[str] = None,
+    geom_keys: tuple = ('geom',),
+):
+    """Build an ``update(record_id, updates) -> Optional[Dict]`` function for one table.
+
+    Scalar and JSON fields are written when present and not None; the geometry
+    column is written whenever one of ``geom_keys`` is present (None clears it).
+    The updated row (primary key plus the non-geometry fields) comes back via
+    RETURNING, so callers need no follow-up get; None means no row has that
+    id. ValueError is raised when ``updates`` sets nothing.
+
+    Every field is bound on every call as ``COALESCE($n, column)`` (None keeps
+    the stored value), so the statement text is fixed per table and geometry
+    input kind and is registered in _PREPARED_SQL.
     """
+    columns = (*fields, *json_fields)
+    returning = ', '.join((pk_column, *columns))
+    assignments = [f"{column} = COALESCE(${idx}, {column})" for idx, column in enumerate(columns, start=1)]
+    next_param = len(columns) + 1
+    _PREPARED_SQL[f"update_{table}"] = (
+        f"UPDATE {table} SET {', '.join(assignments)} "
+        f"WHERE {pk_column} = ${next_param} RETURNING {returning}"
+    )
+    if geom_column is not None:
+        for kind, clause in enumerate(_GEOM_CLAUSES):
+            geom_sql = clause
+            param = next_param
+            while '%s' in geom_sql:
+                geom_sql = geom_sql.replace('%s', f"${param}", 1)
+                param += 1
+            _PREPARED_SQL[f"update_{table}_geom{kind}"] = (
+                f"UPDATE {table} SET {', '.join([*assignments, f'{geom_column} = {geom_sql}'])} "
+                f"WHERE {pk_column} = ${param} RETURNING {returning}"
+            )
+
+    def update(record_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+        params: List[Any] = [updates.get(field) for field in fields]
+        params.extend(_json_or_none(updates.get(field)) for field in json_fields)
+        changed = any(value is not None for value in params)
+
+        name = f"update_{table}"
+        if geom_column is not None:
+            for key in geom_keys:
+                if key in updates:
+                    geom_clause, geom_params = _build_geom_clause(updates[key], updates.get('srid'))
+                    name = f"update_{table}_geom{_GEOM_CLAUSES.index(geom_clause)}"
+                    params.extend(geom_params)
+                    changed = True
+                    break
+
+        if not changed:
+            raise ValueError("No changes provided")
+        params.append(record_id)
+        return execute_single_prepared(name, tuple(params))
+
+    return update
+
+def _project_name_sql(alias: str, by_project: bool):
+    """Return (select expression, join clause) for a listing's project_name column.
+
+    Project-scoped listings already know the project, so instead of joining
+    projects for every row they read the name once through an uncorrelated
+    subquery; it adds one leading ``%s`` (the project_id) before the WHERE params.
+    """
+    if by_project:
+        return "(SELECT project_name FROM projects WHERE project_id = %s) AS project_name", ""
+    return "proj.project_name", f"LEFT JOIN projects proj ON {alias}.project_id = proj.project_id"
+
+@functools.lru_cache(maxsize=None)
+def _pipe_networks_sql(by_project: bool) -> str:
+    where = "WHERE pn.project_id = %s" if by_project else ""
 
+    project_name, project_join = _project_name_sql('pn', by_project)
     query = f"""
         SELECT
             pn.network_id,
             pn.project_id,
-            proj.project_name,
+            {project_name},
             pn.name,
             pn.description,
             pn.created_at,
-            metrics.pipe_count,
+            pn.pipe_count,
             metrics.pipes_below_min,
             metrics.avg_slope,
             metrics.worst_margin
         FROM pipe_networks pn
-        LEFT JOIN projects proj ON pn.project_id = proj.project_id
-        LEFT JOIN ({metrics_subquery}) metrics ON metrics.network_id = pn.network_id
+        {project_join}
+        LEFT JOIN pipe_network_metrics metrics ON metrics.network_id = pn.network_id
         {where}
         ORDER BY pn.created_at DESC NULLS LAST, pn.name
     """
-    rows = execute_query(query, tuple(params) if params else None)
-    for row in rows:
-        if row.get('pipe_count') is not None:
-            row['pipe_count'] = int(row['pipe_count'])
-        if row.get('pipes_below_min') is not None:
-            row['pipes_below_min'] = int(row['pipes_below_min'])
-        row['avg_slope'] = _to_float(row.get('avg_slope'))
-        row['worst_margin'] = _to_float(row.get('worst_margin'))
-    return rows
-
-def list_structures(network_id: Optional[str] = None, project_id: Optional[str] = None) -> List[Dict]:
-    """Return structures with optional filters."""
+    return query
+
+def list_pipe_networks(project_id: Optional[str] = None) -> List[Dict]:
+    """Return pipe networks with aggregated slope statistics."""
+    return execute_query(_pipe_networks_sql(bool(project_id)), (project_id, project_id) if project_id else None)
+
+@functools.lru_cache(maxsize=None)
+def _structures_sql(by_network: bool, by_project: bool, geom_format: str = 'geojson') -> str:
     filters = []
-    params: List[Any] = []
-    if network_id:
+    if by_network:
         filters.append("s.network_id = %s")
-        params.append(network_id)
-    if project_id:
+    if by_project:
         filters.append("s.project_id = %s")
-        params.append(project_id)
 
     where = f"WHERE {' AND '.join(filters)}" if filters else ""
 
+    project_name, project_join = _project_name_sql('s', by_project)
     query = f"""
         SELECT
             s.structure_id,
             s.project_id,
-            proj.project_name,
+            {project_name},
             s.network_id,
             pn.name AS network_name,
             s.type,
             s.rim_elev,
             s.sump_depth,
             s.invert_elev,
-            ST_AsGeoJSON(s.geom) AS geom,
+            {_geom_select('s.geom', 'geom', geom_format)},
             s.metadata
         FROM structures s
         LEFT JOIN pipe_networks pn ON s.network_id = pn.network_id
-        LEFT JOIN projects proj ON s.project_id = proj.project_id
+        {project_join}
         {where}
         ORDER BY COALESCE(s.rim_elev, 0) DESC, s.structure_id
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
+
+def _structures_query(
+    network_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+):
+    """Return the structures listing query and its params."""
+    params = tuple(value for value in (project_id, network_id, project_id) if value)
+    return _structures_sql(bool(network_id), bool(project_id), geom_format), params or None
+
+def list_structures(
+    network_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+) -> List[Dict]:
+    """Return structures with optional filters."""
+    return execute_query(*_structures_query(network_id, project_id, geom_format))
+
+def iter_structures(network_id: Optional[str] = None, project_id: Optional[str] = None) -> Iterator[Dict]:
+    """Stream structures with optional filters through a server-side cursor."""
+    return iter_query(*_structures_query(network_id, project_id), chunk=2000)
+
+# list_pipes sort key. -1 stands in for a missing diameter so those pipes sort
+# after every real size while both key columns still run DESC; the keyset is
+# then a single row comparison that idx_pipes_net_diam_keyset (migrations/013)
+# can use as an index range condition.
+_PIPES_ORDER_KEY = "COALESCE(p.diameter_mm, -1)"
+_PIPES_AFTER_SQL = f"({_PIPES_ORDER_KEY}, p.pipe_id) < (%s, %s)"
+
+@functools.lru_cache(maxsize=None)
+def _pipes_sql(
+    by_network: bool,
+    geom_format: str = 'geojson',
+    paged: bool = False,
+    limited: bool = False
+) -> str:
+    filters = []
+    if by_network:
+        filters.append("p.network_id = %s")
+    if paged:
+        filters.append(_PIPES_AFTER_SQL)
 
-def list_pipes(network_id: Optional[str] = None) -> List[Dict]:
-    """Return pipes with optional network filter and slope metrics."""
-    where = ""
-    params: List[Any] = []
-    if network_id:
-        where = "WHERE p.network_id = %s"
-        params.append(network_id)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    limit = "LIMIT %s" if limited else ""
 
-    req = _required_slope_sql("p")
     query = f"""
         SELECT
             p.pipe_id,
@@ -743,45 +2038,69 @@ def list_pipes(network_id: Optional[str] = None) -> List[Dict]:
             p.diameter_mm,
             p.material,
             p.slope,
-            ({req}) AS required_slope,
-            p.slope - ({req}) AS slope_margin,
+            rs.required_slope,
+            p.slope - rs.required_slope AS slope_margin,
             p.length_m,
             p.invert_up,
             p.invert_dn,
             p.status,
-            ST_AsGeoJSON(p.geom) AS geom,
+            {_geom_select('p.geom', 'geom', geom_format)},
             p.metadata
         FROM pipes p
+        {_required_slope_join("p")}
         LEFT JOIN pipe_networks pn ON p.network_id = pn.network_id
         {where}
-        ORDER BY p.diameter_mm DESC NULLS LAST, p.pipe_id
+        ORDER BY {_PIPES_ORDER_KEY} DESC, p.pipe_id DESC
+        {limit}
     """
-    rows = execute_query(query, tuple(params) if params else None)
-    for row in rows:
-        row['slope'] = _to_float(row.get('slope'))
-        row['required_slope'] = _to_float(row.get('required_slope'))
-        row['slope_margin'] = _to_float(row.get('slope_margin'))
-        row['length_m'] = _to_float(row.get('length_m'))
-        row['invert_up'] = _to_float(row.get('invert_up'))
-        row['invert_dn'] = _to_float(row.get('invert_dn'))
-        if row.get('diameter_mm') is not None:
-            row['diameter_mm'] = float(row['diameter_mm'])
-    return rows
-
-
-def fetch_pipe_slopes(project_id: Optional[str] = None, network_id: Optional[str] = None) -> List[Dict]:
-    """Fetch pipe slope details filtered by project or network."""
+    return query
+
+def _pipes_query(
+    network_id: Optional[str] = None,
+    geom_format: str = 'geojson',
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Optional[float], str]] = None
+):
+    """Return the pipes listing query (with slope metrics) and its params."""
+    params: List[Any] = [network_id] if network_id else []
+    if after is not None:
+        diameter_mm, pipe_id = after
+        params.extend((-1 if diameter_mm is None else diameter_mm, pipe_id))
+    if limit:
+        params.append(limit)
+    return _pipes_sql(bool(network_id), geom_format, after is not None, bool(limit)), tuple(params) or None
+
+def list_pipes(
+    network_id: Optional[str] = None,
+    geom_format: str = 'geojson',
+    limit: Optional[int] = None,
+    after: Optional[Tuple[Optional[float], str]] = None
+) -> List[Dict]:
+    """Return pipes with optional network filter and slope metrics.
+
+    For paging, pass ``limit`` and, for every page after the first, ``after``
+    = (diameter_mm, pipe_id) of the previous page's last row. Rows come back
+    by diameter (largest first, missing diameters last), then pipe_id
+    descending. With a network_id the keyset is a range condition on
+    idx_pipes_net_diam_keyset, so a page reads only its own index entries
+    instead of scanning past the earlier pages.
+    """
+    return execute_query(*_pipes_query(network_id, geom_format, limit, after))
+
+def iter_pipes(network_id: Optional[str] = None) -> Iterator[Dict]:
+    """Stream pipes (same shape as list_pipes) through a server-side cursor."""
+    return iter_query(*_pipes_query(network_id), chunk=2000)
+
+
+@functools.lru_cache(maxsize=None)
+def _pipe_slopes_sql(by_project: bool, by_network: bool, geom_format: str = 'geojson') -> str:
     filters = []
-    params: List[Any] = []
-    if project_id:
+    if by_project:
         filters.append("pn.project_id = %s")
-        params.append(project_id)
-    if network_id:
+    if by_network:
         filters.append("p.network_id = %s")
-        params.append(network_id)
 
     where = f"WHERE {' AND '.join(filters)}" if filters else ""
-    req = _required_slope_sql("p")
     query = f"""
         SELECT
             p.pipe_id,
@@ -794,69 +2113,76 @@ def fetch_pipe_slopes(project_id: Optional[str] = None, network_id: Optional[str
             p.diameter_mm,
             p.material,
             p.slope,
-            ({req}) AS required_slope,
-            p.slope - ({req}) AS slope_margin,
+            rs.required_slope,
+            p.slope - rs.required_slope AS slope_margin,
             p.length_m,
             p.invert_up,
             p.invert_dn,
             p.status,
-            ST_AsGeoJSON(p.geom) AS geom,
+            {_geom_select('p.geom', 'geom', geom_format)},
             p.metadata
         FROM pipes p
+        {_required_slope_join("p")}
         LEFT JOIN pipe_networks pn ON p.network_id = pn.network_id
         LEFT JOIN projects proj ON pn.project_id = proj.project_id
         {where}
         ORDER BY proj.project_name, pn.name, p.pipe_id
     """
-    rows = execute_query(query, tuple(params) if params else None)
-    for row in rows:
-        row['slope'] = _to_float(row.get('slope'))
-        row['required_slope'] = _to_float(row.get('required_slope'))
-        row['slope_margin'] = _to_float(row.get('slope_margin'))
-        row['length_m'] = _to_float(row.get('length_m'))
-        row['invert_up'] = _to_float(row.get('invert_up'))
-        row['invert_dn'] = _to_float(row.get('invert_dn'))
-        if row.get('diameter_mm') is not None:
-            row['diameter_mm'] = float(row['diameter_mm'])
-    return rows
-
-def list_alignments(project_id: Optional[str] = None) -> List[Dict]:
-    """Return alignments with optional project filter."""
-    where = ""
-    params: List[Any] = []
-    if project_id:
-        where = "WHERE a.project_id = %s"
-        params.append(project_id)
+    return query
+
+def _pipe_slopes_query(
+    project_id: Optional[str] = None,
+    network_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+):
+    """Return the pipe slope query (filtered by project or network) and its params."""
+    params = tuple(value for value in (project_id, network_id) if value)
+    return _pipe_slopes_sql(bool(project_id), bool(network_id), geom_format), params or None
+
+def fetch_pipe_slopes(
+    project_id: Optional[str] = None,
+    network_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+) -> List[Dict]:
+    """Fetch pipe slope details filtered by project or network."""
+    return execute_query(*_pipe_slopes_query(project_id, network_id, geom_format))
+
+def iter_pipe_slopes(
+    project_id: Optional[str] = None,
+    network_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+) -> Iterator[Dict]:
+    """Stream pipe slope details (same shape as fetch_pipe_slopes) through a server-side cursor."""
+    return iter_query(*_pipe_slopes_query(project_id, network_id, geom_format), chunk=2000)
 
+@functools.lru_cache(maxsize=None)
+def _alignments_sql(by_project: bool, geom_format: str = 'geojson') -> str:
+    where = "WHERE a.project_id = %s" if by_project else ""
+
+    project_name, project_join = _project_name_sql('a', by_project)
     query = f"""
         SELECT
             a.alignment_id,
             a.project_id,
-            proj.project_name,
+            {project_name},
             a.name,
             a.design_speed,
             a.classification,
             a.srid,
             a.station_start,
-            ST_AsGeoJSON(a.geom) AS geom,
-            COALESCE(he.count, 0) AS horizontal_elements,
-            COALESCE(ve.count, 0) AS vertical_elements
+            {_geom_select('a.geom', 'geom', geom_format)},
+            a.horizontal_element_count AS horizontal_elements,
+            a.vertical_element_count AS vertical_elements
         FROM alignments a
-        LEFT JOIN projects proj ON a.project_id = proj.project_id
-        LEFT JOIN (
-            SELECT alignment_id, COUNT(*) AS count
-            FROM horizontal_elements
-            GROUP BY alignment_id
-        ) he ON he.alignment_id = a.alignment_id
-        LEFT JOIN (
-            SELECT alignment_id, COUNT(*) AS count
-            FROM vertical_elements
-            GROUP BY alignment_id
-        ) ve ON ve.alignment_id = a.alignment_id
+        {project_join}
         {where}
         ORDER BY a.name
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
+
+def list_alignments(project_id: Optional[str] = None, geom_format: str = 'geojson') -> List[Dict]:
+    """Return alignments with optional project filter."""
+    return execute_query(_alignments_sql(bool(project_id), geom_format), (project_id, project_id) if project_id else None)
 
 def list_horizontal_elements(alignment_id: str) -> List[Dict]:
     query = """
@@ -876,6 +2202,38 @@ def list_vertical_elements(alignment_id: str) -> List[Dict]:
     """
     return execute_query(query, (alignment_id,))
 
+def list_alignment_elements_bulk(alignment_ids: List[str]) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Fetch horizontal and vertical elements for many alignments in one query.
+
+    Returns {alignment_id: {'horizontal': [...], 'vertical': [...]}} with an
+    entry for every requested id, so callers avoid one round trip per
+    alignment per element type. Keys are canonical UUID strings, matching
+    how the database renders alignment_id.
+    """
+    result: Dict[str, Dict[str, List[Dict]]] = {
+        str(uuid.UUID(str(alignment_id))): {'horizontal': [], 'vertical': []}
+        for alignment_id in alignment_ids
+    }
+    if not result:
+        return result
+
+    query = """
+        SELECT 'horizontal' AS kind, element_id, alignment_id, type, params, start_station, end_station
+        FROM horizontal_elements
+        WHERE alignment_id = ANY(%s::uuid[])
+        UNION ALL
+        SELECT 'vertical' AS kind, element_id, alignment_id, type, params, start_station, end_station
+        FROM vertical_elements
+        WHERE alignment_id = ANY(%s::uuid[])
+        ORDER BY alignment_id, kind, start_station
+    """
+    ids = list(result)
+    for row in execute_query(query, (ids, ids)):
+        kind = row.pop('kind')
+        result[str(row['alignment_id'])][kind].append(row)
+    return result
+
 def list_alignment_pis(alignment_id: str) -> List[Dict]:
     """Return alignment vertices as PI-like points with approximate stationing.
     Uses ST_DumpPoints and ST_LineLocatePoint to compute station along the line.
@@ -888,7 +2246,7 @@ def list_alignment_pis(alignment_id: str) -> List[Dict]:
         )
         SELECT
             (dp.path)[1] AS vertex_index,
-            (a.station_start + ST_Length(a.geom) * ST_LineLocatePoint(a.geom, dp.geom)) AS station,
+            (a.station_start + ST_Length(a.geom) * ST_LineLocatePoint(a.geom, dp.geom))::float8 AS station,
             ST_X(dp.geom) AS easting,
             ST_Y(dp.geom) AS northing,
             ST_Z(dp.geom) AS elevation,
@@ -896,41 +2254,43 @@ def list_alignment_pis(alignment_id: str) -> List[Dict]:
         FROM a, LATERAL ST_DumpPoints(a.geom) AS dp
         ORDER BY vertex_index
     """
-    rows = execute_query(query, (alignment_id,))
-    # Normalize numeric types
-    for r in rows:
-        r['station'] = _to_float(r.get('station'))
-        r['easting'] = _to_float(r.get('easting'))
-        r['northing'] = _to_float(r.get('northing'))
-        r['elevation'] = _to_float(r.get('elevation'))
-    return rows
-
-def list_bmps(project_id: Optional[str] = None) -> List[Dict]:
-    where = ""
-    params: List[Any] = []
-    if project_id:
-        where = "WHERE b.project_id = %s"
-        params.append(project_id)
+    return execute_query(query, (alignment_id,))
+
+@functools.lru_cache(maxsize=None)
+def _bmps_sql(by_project: bool, geom_format: str = 'geojson') -> str:
+    where = "WHERE b.project_id = %s" if by_project else ""
 
+    project_name, project_join = _project_name_sql('b', by_project)
     query = f"""
         SELECT
             b.bmp_id,
             b.project_id,
-            proj.project_name,
+            {project_name},
             b.type,
             b.area_acres,
             b.drainage_area_acres,
             b.install_date,
             b.status,
             b.compliance,
-            ST_AsGeoJSON(b.geom) AS geom,
+            {_geom_select('b.geom', 'geom', geom_format)},
             b.metadata
         FROM bmps b
-        LEFT JOIN projects proj ON b.project_id = proj.project_id
+        {project_join}
         {where}
         ORDER BY b.install_date DESC NULLS LAST, b.bmp_id
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
+
+def _bmps_query(project_id: Optional[str] = None, geom_format: str = 'geojson'):
+    """Return the BMP listing query and its params."""
+    return _bmps_sql(bool(project_id), geom_format), (project_id, project_id) if project_id else None
+
+def list_bmps(project_id: Optional[str] = None, geom_format: str = 'geojson') -> List[Dict]:
+    return execute_query(*_bmps_query(project_id, geom_format))
+
+def iter_bmps(project_id: Optional[str] = None) -> Iterator[Dict]:
+    """Stream BMPs with optional project filter through a server-side cursor."""
+    return iter_query(*_bmps_query(project_id), chunk=2000)
 
 def list_inspections(bmp_id: str) -> List[Dict]:
     query = """
@@ -950,18 +2310,50 @@ def list_maintenance_records(bmp_id: str) -> List[Dict]:
     """
     return execute_query(query, (bmp_id,))
 
-def list_utilities(project_id: Optional[str] = None) -> List[Dict]:
-    where = ""
-    params: List[Any] = []
-    if project_id:
-        where = "WHERE u.project_id = %s"
-        params.append(project_id)
+_BMP_HISTORY_SQL = """
+    SELECT 'inspection' AS kind, inspection_id AS id, date,
+           findings, status, follow_up, NULL AS action, NULL AS notes
+    FROM inspections
+    WHERE bmp_id = %s
+    UNION ALL
+    SELECT 'maintenance', record_id, date,
+           NULL, NULL, NULL, action, notes
+    FROM maintenance_records
+    WHERE bmp_id = %s
+    ORDER BY kind, date DESC NULLS LAST, id
+"""
 
+def get_bmp_history(bmp_id: str) -> Dict[str, List[Dict]]:
+    """Inspections and maintenance records of one BMP in a single round trip.
+
+    Returns {'inspections': [...], 'maintenance': [...]} with the same rows and
+    ordering as list_inspections() / list_maintenance_records().
+    """
+    inspections: List[Dict] = []
+    maintenance: List[Dict] = []
+    for row in execute_query(_BMP_HISTORY_SQL, (bmp_id, bmp_id)):
+        if row['kind'] == 'inspection':
+            inspections.append({
+                'inspection_id': row['id'], 'bmp_id': bmp_id, 'date': row['date'],
+                'findings': row['findings'], 'status': row['status'], 'follow_up': row['follow_up'],
+            })
+        else:
+            maintenance.append({
+                'record_id': row['id'], 'bmp_id': bmp_id, 'date': row['date'],
+                'action': row['action'], 'notes': row['notes'],
+            })
+    return {'inspections': inspections, 'maintenance': maintenance}
+
+@functools.lru_cache(maxsize=None)
+def _utilities_sql(by_project: bool) -> str:
+    where = "WHERE u.project_id = %s" if by_project else ""
+
+    project_name, project_join = _project_name_sql('u', by_project)
     query = f"""
         SELECT
             u.utility_id,
             u.project_id,
-            proj.project_name,
+            {project_name},
             u.company,
             u.type,
             u.status,
@@ -970,56 +2362,64 @@ def list_utilities(project_id: Optional[str] = None) -> List[Dict]:
             u.contact,
             u.metadata
         FROM utilities u
-        LEFT JOIN projects proj ON u.project_id = proj.project_id
+        {project_join}
         {where}
         ORDER BY u.request_date DESC NULLS LAST, u.company
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
+
+def list_utilities(project_id: Optional[str] = None) -> List[Dict]:
+    return execute_query(_utilities_sql(bool(project_id)), (project_id, project_id) if project_id else None)
 
-def list_conflicts(project_id: Optional[str] = None, utility_id: Optional[str] = None) -> List[Dict]:
+@functools.lru_cache(maxsize=None)
+def _conflicts_sql(by_project: bool, by_utility: bool, geom_format: str = 'geojson') -> str:
     filters = []
-    params: List[Any] = []
-    if project_id:
+    if by_project:
         filters.append("c.project_id = %s")
-        params.append(project_id)
-    if utility_id:
+    if by_utility:
         filters.append("c.utility_id = %s")
-        params.append(utility_id)
 
     where = f"WHERE {' AND '.join(filters)}" if filters else ""
 
+    project_name, project_join = _project_name_sql('c', by_project)
     query = f"""
         SELECT
             c.conflict_id,
             c.project_id,
-            proj.project_name,
+            {project_name},
             c.utility_id,
             u.company AS utility_company,
             c.description,
             c.severity,
             c.resolved,
             c.suggestions,
-            ST_AsGeoJSON(c.location) AS location
+            {_geom_select('c.location', 'location', geom_format)}
         FROM conflicts c
-        LEFT JOIN projects proj ON c.project_id = proj.project_id
+        {project_join}
         LEFT JOIN utilities u ON c.utility_id = u.utility_id
         {where}
         ORDER BY c.severity DESC, c.conflict_id
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
 
-def list_sheet_notes(project_id: Optional[str] = None) -> List[Dict]:
-    where = ""
-    params: List[Any] = []
-    if project_id:
-        where = "WHERE sn.project_id = %s"
-        params.append(project_id)
+def list_conflicts(
+    project_id: Optional[str] = None,
+    utility_id: Optional[str] = None,
+    geom_format: str = 'geojson'
+) -> List[Dict]:
+    params = tuple(value for value in (project_id, project_id, utility_id) if value)
+    return execute_query(_conflicts_sql(bool(project_id), bool(utility_id), geom_format), params or None)
 
+@functools.lru_cache(maxsize=None)
+def _sheet_notes_sql(by_project: bool) -> str:
+    where = "WHERE sn.project_id = %s" if by_project else ""
+
+    project_name, project_join = _project_name_sql('sn', by_project)
     query = f"""
         SELECT
             sn.note_id,
             sn.project_id,
-            proj.project_name,
+            {project_name},
             sn.title,
             sn.category,
             sn.text,
@@ -1028,18 +2428,18 @@ def list_sheet_notes(project_id: Optional[str] = None) -> List[Dict]:
             sn.created_at,
             sn.updated_at
         FROM sheet_notes sn
-        LEFT JOIN projects proj ON sn.project_id = proj.project_id
+        {project_join}
         {where}
         ORDER BY sn.updated_at DESC NULLS LAST, sn.title
     """
-    return execute_query(query, tuple(params) if params else None)
+    return query
+
+def list_sheet_notes(project_id: Optional[str] = None) -> List[Dict]:
+    return execute_query(_sheet_notes_sql(bool(project_id)), (project_id, project_id) if project_id else None)
 
 
 def get_pipe_network(network_id: str) -> Optional[Dict]:
-    return execute_single(
-        "SELECT network_id, project_id, name, description, created_at FROM pipe_networks WHERE network_id = %s",
-        (network_id,)
-    )
+    return execute_single_prepared('get_pipe_network', (network_id,))
 
 
 def create_pipe_network(project_id: Optional[str], name: Optional[str], description: Optional[str]) -> str:
@@ -1054,30 +2454,20 @@ def create_pipe_network(project_id: Optional[str], name: Optional[str], descript
     return result['network_id']
 
 
-def update_pipe_network(network_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('project_id', 'name', 'description'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-    return _execute_update('pipe_networks', 'network_id', network_id, assignments, params)
+update_pipe_network = _make_updater('pipe_networks', 'network_id', ('project_id', 'name', 'description'))
 
 
 def delete_pipe_network(network_id: str) -> None:
-    execute_query("DELETE FROM pipe_networks WHERE network_id = %s", (network_id,), fetch=False)
+    execute_prepared('delete_pipe_network', (network_id,), fetch=False)
 
 
 def get_structure(structure_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT structure_id, project_id, network_id, type, rim_elev, sump_depth, invert_elev,
-               ST_AsGeoJSON(geom) AS geom, metadata
-        FROM structures
-        WHERE structure_id = %s
-        """,
-        (structure_id,)
-    )
+    return execute_single_prepared('get_structure', (structure_id,))
+
+
+# Without an explicit project a structure inherits its network's, resolved
+# inside the INSERT instead of by a separate lookup. Takes (project_id, network_id).
+_STRUCTURE_PROJECT_SQL = "COALESCE(%s, (SELECT project_id FROM pipe_networks WHERE network_id = %s))"
 
 
 def create_structure(
@@ -1091,59 +2481,67 @@ def create_structure(
     srid: Optional[int] = None,
     metadata: Optional[Dict[str, Any]] = None
 ) -> str:
-    if project_id is None:
-        project_id = _derive_project_id_from_network(network_id)
-
     geom_clause, geom_params = _build_geom_clause(geom, srid)
-    params: List[Any] = [project_id, network_id, structure_type, rim_elev, sump_depth, invert_elev]
+    params: List[Any] = [project_id, network_id, network_id, structure_type, rim_elev, sump_depth, invert_elev]
     params.extend(geom_params)
     params.append(_json_or_none(metadata))
 
     query = f"""
         INSERT INTO structures (project_id, network_id, type, rim_elev, sump_depth, invert_elev, geom, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, {geom_clause}, %s)
+        VALUES ({_STRUCTURE_PROJECT_SQL}, %s, %s, %s, %s, %s, {geom_clause}, %s)
         RETURNING structure_id
     """
     result = execute_single(query, tuple(params))
     return result['structure_id']
 
 
-def update_structure(structure_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
+def create_structures_bulk(structures: List[Dict[str, Any]], page_size: int = 500) -> List[str]:
+    """Insert many structures in batched statements; items take create_structure() keyword names.
 
-    for field in ('project_id', 'network_id', 'type', 'rim_elev', 'sump_depth', 'invert_elev'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
+    'type' is accepted in place of structure_type so API payloads can be passed
+    through as-is. Returns structure_ids in input order.
+    """
+    rows = []
+    for item in structures:
+        row = {
+            'project_id': item.get('project_id'),
+            'network_id': item.get('network_id'),
+            'structure_type': item.get('structure_type', item.get('type')),
+            'rim_elev': item.get('rim_elev'),
+            'sump_depth': item.get('sump_depth'),
+            'invert_elev': item.get('invert_elev'),
+            'metadata': _json_or_none(item.get('metadata')),
+        }
+        row.update(_geom_value(item.get('geom'), item.get('srid')))
+        rows.append(row)
 
-    if 'metadata' in updates and updates['metadata'] is not None:
-        assignments.append("metadata = %s")
-        params.append(_json_or_none(updates['metadata']))
+    query = """
+        INSERT INTO structures (project_id, network_id, type, rim_elev, sump_depth, invert_elev, geom, metadata)
+        VALUES %s
+        RETURNING structure_id
+    """
+    template = (
+        "(COALESCE(%(project_id)s, (SELECT project_id FROM pipe_networks WHERE network_id = %(network_id)s)), "
+        "%(network_id)s, %(structure_type)s, %(rim_elev)s, %(sump_depth)s, %(invert_elev)s, "
+        f"{_GEOM_VALUE_SQL}, %(metadata)s)"
+    )
+    return _bulk_insert_returning(query, rows, template=template, page_size=page_size)
 
-    if 'geom' in updates:
-        geom_clause, geom_params = _build_geom_clause(updates['geom'], updates.get('srid'))
-        assignments.append(f"geom = {geom_clause}")
-        params.extend(geom_params)
 
-    return _execute_update('structures', 'structure_id', structure_id, assignments, params)
+update_structure = _make_updater(
+    'structures', 'structure_id',
+    ('project_id', 'network_id', 'type', 'rim_elev', 'sump_depth', 'invert_elev'),
+    json_fields=('metadata',),
+    geom_column='geom',
+)
 
 
 def delete_structure(structure_id: str) -> None:
-    execute_query("DELETE FROM structures WHERE structure_id = %s", (structure_id,), fetch=False)
-
+    execute_prepared('delete_structure', (structure_id,), fetch=False)
 
-def get_pipe(pipe_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT pipe_id, network_id, up_structure_id, down_structure_id, diameter_mm, material,
-               slope, length_m, invert_up, invert_dn, status,
-               ST_AsGeoJSON(geom) AS geom, metadata
-        FROM pipes
-        WHERE pipe_id = %s
-        """,
-        (pipe_id,)
-    )
+
+def get_pipe(pipe_id: str) -> Optional[Dict]:
+    return execute_single_prepared('get_pipe', (pipe_id,))
 
 
 def create_pipe(
@@ -1178,106 +2576,212 @@ def create_pipe(
     return result['pipe_id']
 
 
-def update_pipe(pipe_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in (
-        'network_id', 'up_structure_id', 'down_structure_id', 'diameter_mm', 'material',
-        'slope', 'length_m', 'invert_up', 'invert_dn', 'status'
-    ):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
+# Bulk pipe loads above this size go through COPY into a staging table.
+_PIPE_COPY_THRESHOLD = 1000
+
+_PIPE_COLUMNS = (
+    'network_id', 'up_structure_id', 'down_structure_id', 'diameter_mm', 'material',
+    'slope', 'length_m', 'invert_up', 'invert_dn', 'status'
+)
+
+
+def _uuid4_batch(count: int) -> List[str]:
+    """Generate count random (version 4) UUID strings from a single os.urandom call."""
+    raw = bytearray(os.urandom(16 * count))
+    raw[6::16] = bytes((b & 0x0f) | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes((b & 0x3f) | 0x80 for b in raw[8::16])
+    ids = []
+    for start in range(0, len(raw), 16):
+        h = raw[start:start + 16].hex()
+        ids.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+    return ids
+
+
+def _copy_pipes(pipes: List[Dict[str, Any]]) -> List[str]:
+    """COPY pipes through a temp staging table; ids are generated client-side."""
+    pipe_ids = _uuid4_batch(len(pipes))
+    stage_columns = ['pipe_id', *_PIPE_COLUMNS, 'metadata', 'geom_wkb', 'geom_text', 'geom_is_json', 'srid']
+
+    def stage_rows():
+        for pipe_id, item in zip(pipe_ids, pipes):
+            kind, value = _classify_geom(item.get('geom'))
+            srid = item.get('srid')
+            yield (
+                pipe_id,
+                *(item.get(key) for key in _PIPE_COLUMNS),
+                item.get('metadata'),
+                value if kind == _GEOM_WKB else None,
+                value if kind in (_GEOM_GEOJSON, _GEOM_WKT) else None,
+                kind == _GEOM_GEOJSON,
+                3857 if srid is None else srid,
+            )
+
+    with transaction() as cur:
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE IF NOT EXISTS pipes_stage ON COMMIT DELETE ROWS AS
+            SELECT pipe_id, {', '.join(_PIPE_COLUMNS)}, metadata,
+                   NULL::bytea AS geom_wkb, NULL::text AS geom_text,
+                   false AS geom_is_json, NULL::integer AS srid
+            FROM pipes WITH NO DATA
+            """
+        )
+        cur.execute("TRUNCATE pipes_stage")
+        _copy_rows(cur, 'pipes_stage', stage_columns, stage_rows())
+        cur.execute(
+            f"""
+            INSERT INTO pipes (pipe_id, {', '.join(_PIPE_COLUMNS)}, geom, metadata)
+            SELECT pipe_id, {', '.join(_PIPE_COLUMNS)},
+                   ST_SetSRID(COALESCE(ST_GeomFromEWKB(geom_wkb),
+                       CASE WHEN geom_is_json THEN ST_GeomFromGeoJSON(geom_text)
+                       ELSE ST_GeomFromText(geom_text) END), srid),
+                   metadata
+            FROM pipes_stage
+            """
+        )
+    return pipe_ids
+
+
+def create_pipes_bulk(pipes: List[Dict[str, Any]], page_size: int = 500) -> List[str]:
+    """Insert many pipes in batched statements; items take create_pipe() keyword names.
+
+    Loads larger than _PIPE_COPY_THRESHOLD are streamed with COPY instead.
+    """
+    if len(pipes) > _PIPE_COPY_THRESHOLD:
+        return _copy_pipes(pipes)
+
+    rows = []
+    for item in pipes:
+        row = {key: item.get(key) for key in _PIPE_COLUMNS}
+        row.update(_geom_value(item.get('geom'), item.get('srid')))
+        row['metadata'] = _json_or_none(item.get('metadata'))
+        rows.append(row)
 
-    if 'metadata' in updates and updates['metadata'] is not None:
-        assignments.append("metadata = %s")
-        params.append(_json_or_none(updates['metadata']))
+    query = """
+        INSERT INTO pipes (
+            network_id, up_structure_id, down_structure_id, diameter_mm, material,
+            slope, length_m, invert_up, invert_dn, status, geom, metadata
+        ) VALUES %s
+        RETURNING pipe_id
+    """
+    template = (
+        "(%(network_id)s, %(up_structure_id)s, %(down_structure_id)s, %(diameter_mm)s, %(material)s, "
+        "%(slope)s, %(length_m)s, %(invert_up)s, %(invert_dn)s, %(status)s, "
+        f"{_GEOM_VALUE_SQL}, %(metadata)s)"
+    )
+    return _bulk_insert_returning(query, rows, template=template, page_size=page_size)
 
-    if 'geom' in updates:
-        geom_clause, geom_params = _build_geom_clause(updates['geom'], updates.get('srid'))
-        assignments.append(f"geom = {geom_clause}")
-        params.extend(geom_params)
 
-    return _execute_update('pipes', 'pipe_id', pipe_id, assignments, params)
+update_pipe = _make_updater(
+    'pipes', 'pipe_id',
+    (
+        'network_id', 'up_structure_id', 'down_structure_id', 'diameter_mm', 'material',
+        'slope', 'length_m', 'invert_up', 'invert_dn', 'status'
+    ),
+    json_fields=('metadata',),
+    geom_column='geom',
+)
 
 
 def delete_pipe(pipe_id: str) -> None:
-    execute_query("DELETE FROM pipes WHERE pipe_id = %s", (pipe_id,), fetch=False)
+    execute_prepared('delete_pipe', (pipe_id,), fetch=False)
 
 # ============================================
 # SHEET NOTE MANAGER HELPERS
 # ============================================
 
+# Read-mostly results keyed by id (project details, drawing legends) are kept
+# for _READ_CACHE_TTL seconds. The helpers that write them drop the entries;
+# the short TTL bounds staleness from writes made by other worker processes.
+_READ_CACHE_TTL = 60.0
+_READ_CACHE_MAX = 2048
+_legend_cache: Dict[tuple, tuple] = {}  # (drawing_id, layout_name) -> (loaded_at, legend)
+_project_details_cache: Dict[str, tuple] = {}  # project_id -> (loaded_at, row)
+
+
+def _cache_lookup(cache: Dict, key: Any) -> Optional[tuple]:
+    """Return the fresh (loaded_at, value) entry for key, or None."""
+    entry = cache.get(key)
+    if entry is None or time.monotonic() - entry[0] > _READ_CACHE_TTL:
+        return None
+    return entry
+
+
+def _cache_store(cache: Dict, key: Any, value: Any) -> None:
+    """Remember a committed value (not while inside an open transaction())."""
+    if _current_cur.get() is not None:
+        return
+    if len(cache) >= _READ_CACHE_MAX:
+        cache.clear()
+    cache[key] = (time.monotonic(), value)
+
+
+def invalidate_legend_cache() -> None:
+    """Forget cached sheet note legends (any assignment or note changed)."""
+    _legend_cache.clear()
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_update(table: str, pk_column: str, columns: tuple, returning: str) -> str:
+    """UPDATE text for one set of changed columns; also stamps updated_at.
+
+    Cached per shape, so repeated edits of the same fields send identical SQL.
+    Column names come from the callers' whitelists, never from request keys.
+    """
+    assignments = ', '.join(f"{column} = %s" for column in columns)
+    return (
+        f"UPDATE {table} SET {assignments}, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE {pk_column} = %s RETURNING {returning}"
+    )
+
+
 def list_sheet_note_sets(project_id: str) -> List[Dict]:
     """Return note sets for a project with note_count."""
-    return execute_query(
-        """
-        SELECT s.set_id, s.project_id, s.set_name, s.description, s.discipline,
-               s.is_active, s.created_at, s.updated_at,
-               COUNT(n.project_note_id) AS note_count
-        FROM sheet_note_sets s
-        LEFT JOIN project_sheet_notes n ON n.set_id = s.set_id
-        WHERE s.project_id = %s
-        GROUP BY s.set_id
-        ORDER BY s.created_at DESC
-        """,
-        (project_id,)
-    )
+    return execute_prepared('list_sheet_note_sets', (project_id,))
 
 def create_sheet_note_set(payload: Dict[str, Any]) -> Dict:
     row = execute_single(
-        """
+        f"""
         INSERT INTO sheet_note_sets (project_id, set_name, description, discipline, is_active)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING *
+        VALUES (%s, %s, %s, %s, COALESCE(%s::boolean, FALSE))
+        RETURNING {_SHEET_NOTE_SET_COLUMNS}
         """,
         (
             payload.get('project_id'), payload.get('set_name'), payload.get('description'),
-            payload.get('discipline'), bool(payload.get('is_active', False))
+            payload.get('discipline'), payload.get('is_active', False)
         )
     )
     return row or {}
 
 def update_sheet_note_set(set_id: str, updates: Dict[str, Any]) -> Dict:
-    fields = []
-    params: List[Any] = []
-    for key in ('set_name', 'description', 'discipline', 'is_active'):
-        if key in updates:
-            fields.append(f"{key} = %s")
-            params.append(updates[key])
+    fields = tuple(key for key in ('set_name', 'description', 'discipline', 'is_active') if key in updates)
     if not fields:
-        return execute_single("SELECT * FROM sheet_note_sets WHERE set_id = %s", (set_id,)) or {}
-    fields.append("updated_at = CURRENT_TIMESTAMP")
-    params.append(set_id)
-    execute_query(f"UPDATE sheet_note_sets SET {', '.join(fields)} WHERE set_id = %s", tuple(params), fetch=False)
-    return execute_single("SELECT * FROM sheet_note_sets WHERE set_id = %s", (set_id,)) or {}
+        return execute_single(f"SELECT {_SHEET_NOTE_SET_COLUMNS} FROM sheet_note_sets WHERE set_id = %s", (set_id,)) or {}
+    sql = _compile_update('sheet_note_sets', 'set_id', fields, _SHEET_NOTE_SET_COLUMNS)
+    return execute_single(sql, (*(updates[key] for key in fields), set_id)) or {}
 
 def delete_sheet_note_set(set_id: str) -> None:
-    execute_query("DELETE FROM sheet_note_sets WHERE set_id = %s", (set_id,), fetch=False)
+    execute_prepared('delete_sheet_note_set', (set_id,), fetch=False)
+    invalidate_legend_cache()
 
 def activate_sheet_note_set(project_id: str, set_id: str) -> None:
-    execute_query("UPDATE sheet_note_sets SET is_active = FALSE WHERE project_id = %s", (project_id,), fetch=False)
-    execute_query("UPDATE sheet_note_sets SET is_active = TRUE WHERE set_id = %s", (set_id,), fetch=False)
-
-def list_project_sheet_notes(set_id: str) -> List[Dict]:
-    return execute_query(
+    # One statement flips the whole project, so there is never a moment with no
+    # active set; rows already in the right state are not rewritten.
+    execute_query(
         """
-        SELECT p.project_note_id, p.set_id, p.standard_note_id, p.display_code,
-               p.custom_title, p.custom_text, p.is_modified, p.sort_order, p.usage_count,
-               p.created_at, p.updated_at,
-               s.note_title AS standard_title, s.note_text AS standard_text,
-               s.note_category, s.discipline
-        FROM project_sheet_notes p
-        LEFT JOIN standard_notes s ON p.standard_note_id = s.note_id
-        WHERE p.set_id = %s
-        ORDER BY p.sort_order, p.created_at
+        UPDATE sheet_note_sets SET is_active = (set_id = %s)
+        WHERE project_id = %s AND is_active IS DISTINCT FROM (set_id = %s)
         """,
-        (set_id,)
+        (set_id, project_id, set_id),
+        fetch=False
     )
 
-def _next_sort_order(set_id: str) -> int:
-    row = execute_single("SELECT COALESCE(MAX(sort_order), 0) AS max FROM project_sheet_notes WHERE set_id = %s", (set_id,))
-    return int((row or {}).get('max', 0)) + 1
+def list_project_sheet_notes(set_id: str) -> List[Dict]:
+    return execute_prepared('list_project_sheet_notes', (set_id,))
+
+def iter_project_sheet_notes(set_id: str) -> Iterator[Dict]:
+    """Stream a set's notes (same shape as list_project_sheet_notes) through a server-side cursor."""
+    return iter_query(_PREPARED_SQL['list_project_sheet_notes'].replace('$1', '%s'), (set_id,), chunk=500)
 
 def create_project_sheet_note(payload: Dict[str, Any]) -> Dict:
     set_id = payload.get('set_id')
@@ -1286,40 +2790,94 @@ def create_project_sheet_note(payload: Dict[str, Any]) -> Dict:
     custom_title = payload.get('custom_title')
     custom_text = payload.get('custom_text')
     is_modified = bool(custom_title or custom_text)
-    sort_order = _next_sort_order(set_id)
+    # next sort_order is allocated inside the INSERT (backward scan of
+    # idx_project_sheet_notes_set_order_created) rather than by a separate MAX query
     row = execute_single(
-        """
+        f"""
         INSERT INTO project_sheet_notes (set_id, standard_note_id, display_code, custom_title, custom_text, is_modified, sort_order)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        RETURNING *
+        VALUES (
+            %s, %s, %s, %s, %s, %s,
+            (SELECT COALESCE(MAX(sort_order), 0) + 1 FROM project_sheet_notes WHERE set_id = %s)
+        )
+        RETURNING {_PROJECT_SHEET_NOTE_COLUMNS}
         """,
-        (set_id, std_id, display_code, custom_title, custom_text, is_modified, sort_order)
+        (set_id, std_id, display_code, custom_title, custom_text, is_modified, set_id)
     )
     return row or {}
 
+def create_project_sheet_notes_bulk(set_id: str, notes: List[Dict[str, Any]], page_size: int = 500) -> List[Dict]:
+    """Add many notes to one set in batched INSERTs; returns the created rows in input order.
+
+    Items take create_project_sheet_note() keys. sort_order continues after the
+    set's current maximum, in input order.
+    """
+    if not notes:
+        return []
+    with transaction() as cur:
+        cur.execute("SELECT COALESCE(MAX(sort_order), 0) FROM project_sheet_notes WHERE set_id = %s", (set_id,))
+        base = cur.fetchone()[0]
+        rows = [
+            (
+                set_id, note.get('standard_note_id'), note.get('display_code'),
+                note.get('custom_title'), note.get('custom_text'),
+                bool(note.get('custom_title') or note.get('custom_text')), base + idx
+            )
+            for idx, note in enumerate(notes, start=1)
+        ]
+        result = execute_values(
+            cur,
+            f"""
+            INSERT INTO project_sheet_notes (set_id, standard_note_id, display_code, custom_title, custom_text, is_modified, sort_order)
+            VALUES %s
+            RETURNING {_PROJECT_SHEET_NOTE_COLUMNS}
+            """,
+            rows, page_size=page_size, fetch=True
+        )
+        columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in result]
+
 def update_project_sheet_note(project_note_id: str, updates: Dict[str, Any]) -> Dict:
-    fields = []
-    params: List[Any] = []
-    for key in ('display_code', 'custom_title', 'custom_text'):
-        if key in updates:
-            fields.append(f"{key} = %s")
-            params.append(updates[key])
+    fields = tuple(key for key in ('display_code', 'custom_title', 'custom_text') if key in updates)
+    params: List[Any] = [updates[key] for key in fields]
     if 'custom_title' in updates or 'custom_text' in updates:
-        fields.append("is_modified = %s")
+        fields += ('is_modified',)
         params.append(True)
     if not fields:
-        return execute_single("SELECT * FROM project_sheet_notes WHERE project_note_id = %s", (project_note_id,)) or {}
-    fields.append("updated_at = CURRENT_TIMESTAMP")
+        return execute_single(f"SELECT {_PROJECT_SHEET_NOTE_COLUMNS} FROM project_sheet_notes WHERE project_note_id = %s", (project_note_id,)) or {}
     params.append(project_note_id)
-    execute_query(f"UPDATE project_sheet_notes SET {', '.join(fields)} WHERE project_note_id = %s", tuple(params), fetch=False)
-    return execute_single("SELECT * FROM project_sheet_notes WHERE project_note_id = %s", (project_note_id,)) or {}
+    sql = _compile_update('project_sheet_notes', 'project_note_id', fields, _PROJECT_SHEET_NOTE_COLUMNS)
+    row = execute_single(sql, tuple(params))
+    invalidate_legend_cache()
+    return row or {}
 
 def delete_project_sheet_note(project_note_id: str) -> None:
-    execute_query("DELETE FROM project_sheet_notes WHERE project_note_id = %s", (project_note_id,), fetch=False)
+    execute_prepared('delete_project_sheet_note', (project_note_id,), fetch=False)
+    invalidate_legend_cache()
 
 def reorder_project_sheet_note(project_note_id: str, new_order: int) -> None:
     execute_query("UPDATE project_sheet_notes SET sort_order = %s WHERE project_note_id = %s", (new_order, project_note_id), fetch=False)
 
+_ASSIGNMENTS_BY_DRAWING_BASE_SQL = """
+    SELECT a.assignment_id, a.project_note_id, a.drawing_id, a.layout_name,
+           a.legend_sequence, a.show_in_legend, a.assigned_at, a.assigned_by,
+           n.display_code,
+           n.standard_note_id,
+           n.is_modified,
+           COALESCE(n.custom_title, s.note_title) AS note_title,
+           COALESCE(n.custom_text, s.note_text) AS note_text
+    FROM sheet_note_assignments a
+    LEFT JOIN project_sheet_notes n ON a.project_note_id = n.project_note_id
+    LEFT JOIN standard_notes s ON n.standard_note_id = s.note_id
+    WHERE {where}
+    ORDER BY a.legend_sequence
+"""
+# Separate statements per filter shape; an OR over bound parameters keeps the
+# planner off the (drawing_id, layout_name, legend_sequence) index.
+_ASSIGNMENTS_BY_DRAWING_SQL = _ASSIGNMENTS_BY_DRAWING_BASE_SQL.format(where="a.drawing_id = %s")
+_ASSIGNMENTS_BY_DRAWING_LAYOUT_SQL = _ASSIGNMENTS_BY_DRAWING_BASE_SQL.format(
+    where="a.drawing_id = %s AND a.layout_name = %s"
+)
+
 def list_sheet_note_assignments(
     drawing_id: Optional[str] = None,
     layout_name: Optional[str] = None,
@@ -1341,60 +2899,60 @@ def list_sheet_note_assignments(
             (project_note_id,)
         )
     if drawing_id:
-        return execute_query(
-            """
-            SELECT a.assignment_id, a.project_note_id, a.drawing_id, a.layout_name,
-                   a.legend_sequence, a.show_in_legend, a.assigned_at, a.assigned_by,
-                   n.display_code,
-                   n.standard_note_id,
-                   n.is_modified,
-                   COALESCE(n.custom_title, s.note_title) AS note_title,
-                   COALESCE(n.custom_text, s.note_text) AS note_text
-            FROM sheet_note_assignments a
-            LEFT JOIN project_sheet_notes n ON a.project_note_id = n.project_note_id
-            LEFT JOIN standard_notes s ON n.standard_note_id = s.note_id
-            WHERE a.drawing_id = %s AND (%s IS NULL OR a.layout_name = %s)
-            ORDER BY a.legend_sequence
-            """,
-            (drawing_id, layout_name, layout_name)
-        )
+        if layout_name is None:
+            return execute_query(_ASSIGNMENTS_BY_DRAWING_SQL, (drawing_id,))
+        return execute_query(_ASSIGNMENTS_BY_DRAWING_LAYOUT_SQL, (drawing_id, layout_name))
     return []
 
 def create_sheet_note_assignment(payload: Dict[str, Any]) -> Dict:
+    # insert and increment usage_count in one statement
     row = execute_single(
         """
-        INSERT INTO sheet_note_assignments (project_note_id, drawing_id, layout_name, legend_sequence, show_in_legend, assigned_by)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        RETURNING *
+        WITH ins AS (
+            INSERT INTO sheet_note_assignments (project_note_id, drawing_id, layout_name, legend_sequence, show_in_legend, assigned_by)
+            VALUES (%s, %s, %s, %s, COALESCE(%s::boolean, FALSE), %s)
+            RETURNING *
+        ), bump AS (
+            UPDATE project_sheet_notes SET usage_count = usage_count + 1
+            WHERE project_note_id IN (SELECT project_note_id FROM ins)
+        )
+        SELECT * FROM ins
         """,
         (
             payload['project_note_id'], payload['drawing_id'], payload.get('layout_name') or 'Model',
-            payload['legend_sequence'], bool(payload.get('show_in_legend', True)), payload.get('assigned_by')
+            payload['legend_sequence'], payload.get('show_in_legend', True), payload.get('assigned_by')
         )
     )
-    # increment usage_count
-    execute_query("UPDATE project_sheet_notes SET usage_count = usage_count + 1 WHERE project_note_id = %s", (payload['project_note_id'],), fetch=False)
+    invalidate_legend_cache()
     return row or {}
 
 def delete_sheet_note_assignment(assignment_id: str) -> None:
-    # need project_note_id to decrement usage
-    row = execute_single("SELECT project_note_id FROM sheet_note_assignments WHERE assignment_id = %s", (assignment_id,))
-    execute_query("DELETE FROM sheet_note_assignments WHERE assignment_id = %s", (assignment_id,), fetch=False)
-    if row and row.get('project_note_id'):
-        execute_query("UPDATE project_sheet_notes SET usage_count = GREATEST(usage_count - 1, 0) WHERE project_note_id = %s", (row['project_note_id'],), fetch=False)
+    # delete and decrement the note's usage_count in one statement
+    execute_query(
+        """
+        WITH d AS (
+            DELETE FROM sheet_note_assignments WHERE assignment_id = %s
+            RETURNING project_note_id
+        )
+        UPDATE project_sheet_notes SET usage_count = GREATEST(usage_count - 1, 0)
+        WHERE project_note_id IN (SELECT project_note_id FROM d)
+        """,
+        (assignment_id,),
+        fetch=False
+    )
+    invalidate_legend_cache()
 
 def build_sheet_note_legend(drawing_id: str, layout_name: Optional[str]) -> Dict:
-    items = list_sheet_note_assignments(drawing_id=drawing_id, layout_name=layout_name)
-    legend = []
-    for it in items:
-        legend.append({
-            'legend_sequence': it['legend_sequence'],
-            'display_code': it.get('display_code') or '',
-            'note_title': it.get('note_title') or '',
-            'note_text': it.get('note_text') or '',
-            'standard_note_id': it.get('standard_note_id'),
-            'is_modified': bool(it.get('is_modified'))
-        })
+    key = (drawing_id, layout_name)
+    cached = _cache_lookup(_legend_cache, key)
+    if cached is None:
+        if layout_name is None:
+            legend = execute_prepared('sheet_note_legend', (drawing_id,))
+        else:
+            legend = execute_prepared('sheet_note_legend_layout', (drawing_id, layout_name))
+        _cache_store(_legend_cache, key, [dict(item) for item in legend])
+    else:
+        legend = [dict(item) for item in cached[1]]
     return { 'drawing_id': drawing_id, 'layout_name': layout_name or 'Model', 'legend': legend, 'total_notes': len(legend) }
 
 # ============================================
@@ -1403,14 +2961,13 @@ def build_sheet_note_legend(drawing_id: str, layout_name: Optional[str]) -> Dict
 
 def list_sheet_sets(project_id: str) -> List[Dict]:
     return execute_query(
-        """
-        SELECT s.*, COUNT(sh.sheet_id) AS sheet_count,
+        f"""
+        SELECT {_qualified(_SHEET_SET_COLUMNS, 's')},
+               s.sheet_count,
                p.project_name, p.project_number
         FROM sheet_sets s
-        LEFT JOIN sheets sh ON sh.set_id = s.set_id
         LEFT JOIN projects p ON p.project_id = s.project_id
         WHERE s.project_id = %s
-        GROUP BY s.set_id, p.project_name, p.project_number
         ORDER BY s.created_at DESC
         """,
         (project_id,)
@@ -1418,10 +2975,10 @@ def list_sheet_sets(project_id: str) -> List[Dict]:
 
 def create_sheet_set(payload: Dict[str, Any]) -> Dict:
     row = execute_single(
-        """
+        f"""
         INSERT INTO sheet_sets (project_id, set_name, description, phase, discipline, status, issued_date, issued_to)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING *
+        RETURNING {_SHEET_SET_COLUMNS}
         """,
         (
             payload.get('project_id'), payload.get('set_name'), payload.get('description'),
@@ -1432,89 +2989,125 @@ def create_sheet_set(payload: Dict[str, Any]) -> Dict:
     return row or {}
 
 def update_sheet_set(set_id: str, updates: Dict[str, Any]) -> Dict:
-    fields = []
-    params: List[Any] = []
-    for key in ('set_name', 'description', 'phase', 'discipline', 'status', 'issued_date', 'issued_to'):
-        if key in updates:
-            fields.append(f"{key} = %s")
-            params.append(updates[key])
+    fields = tuple(
+        key for key in ('set_name', 'description', 'phase', 'discipline', 'status', 'issued_date', 'issued_to')
+        if key in updates
+    )
     if not fields:
-        return execute_single("SELECT * FROM sheet_sets WHERE set_id = %s", (set_id,)) or {}
-    fields.append("updated_at = CURRENT_TIMESTAMP")
-    params.append(set_id)
-    execute_query(f"UPDATE sheet_sets SET {', '.join(fields)} WHERE set_id = %s", tuple(params), fetch=False)
-    return execute_single("SELECT * FROM sheet_sets WHERE set_id = %s", (set_id,)) or {}
+        return execute_single(f"SELECT {_SHEET_SET_COLUMNS} FROM sheet_sets WHERE set_id = %s", (set_id,)) or {}
+    sql = _compile_update('sheet_sets', 'set_id', fields, _SHEET_SET_COLUMNS)
+    return execute_single(sql, (*(updates[key] for key in fields), set_id)) or {}
 
 def delete_sheet_set(set_id: str) -> None:
-    execute_query("DELETE FROM sheet_sets WHERE set_id = %s", (set_id,), fetch=False)
+    execute_prepared('delete_sheet_set', (set_id,), fetch=False)
 
 def list_sheets(set_id: str) -> List[Dict]:
-    return execute_query(
+    return execute_prepared('list_sheets', (set_id,))
+
+def iter_sheets(set_id: str) -> Iterator[Dict]:
+    """Stream a set's sheets (same shape as list_sheets) through a server-side cursor."""
+    # list_sheets references $1 twice (assignments CTE and sheets filter)
+    return iter_query(_PREPARED_SQL['list_sheets'].replace('$1', '%s'), (set_id, set_id), chunk=500)
+
+def _renumber_sheets(set_id: str, sheet_id: Optional[str] = None) -> Dict:
+    """Renumber a set and report its size plus the new number of ``sheet_id``.
+
+    One statement: the window function assigns the numbers and only sheets
+    whose number actually changes are written.
+    """
+    return execute_single(
         """
-        SELECT sh.*, CASE WHEN a.assignment_id IS NULL THEN 'unassigned' ELSE 'assigned' END AS assignment_status,
-               a.drawing_id, a.layout_name
-        FROM sheets sh
-        LEFT JOIN LATERAL (
-            SELECT assignment_id, drawing_id, layout_name
-            FROM sheet_drawing_assignments a
-            WHERE a.sheet_id = sh.sheet_id
-            ORDER BY a.assigned_at DESC
-            LIMIT 1
-        ) a ON TRUE
-        WHERE sh.set_id = %s
-        ORDER BY COALESCE(sh.sheet_hierarchy_number, 50), sh.sheet_code
+        WITH ranked AS (
+            SELECT sheet_id,
+                   row_number() OVER (
+                       ORDER BY COALESCE(sheet_hierarchy_number, 50), sheet_code, sheet_id
+                   ) AS rn
+            FROM sheets
+            WHERE set_id = %s
+        ), renumbered AS (
+            UPDATE sheets sh SET sheet_number = ranked.rn
+            FROM ranked
+            WHERE sh.sheet_id = ranked.sheet_id AND sh.sheet_number IS DISTINCT FROM ranked.rn
+        )
+        SELECT COUNT(*) AS sheet_count,
+               MAX(rn) FILTER (WHERE sheet_id = %s::uuid) AS sheet_number
+        FROM ranked
         """,
-        (set_id,)
-    )
+        (set_id, sheet_id)
+    ) or {}
 
 def renumber_sheets(set_id: str) -> int:
-    sheets = execute_query(
-        """
-        SELECT sheet_id FROM sheets
-        WHERE set_id = %s
-        ORDER BY COALESCE(sheet_hierarchy_number,50), sheet_code
-        """,
-        (set_id,)
-    )
-    count = 0
-    for idx, sh in enumerate(sheets, start=1):
-        execute_query("UPDATE sheets SET sheet_number = %s WHERE sheet_id = %s", (idx, sh['sheet_id']), fetch=False)
-        count += 1
-    return count
+    """Number a set's sheets 1..N in list_sheets order; returns N."""
+    return int(_renumber_sheets(set_id).get('sheet_count') or 0)
 
 def create_sheet(payload: Dict[str, Any]) -> Dict:
-    row = execute_single(
-        """
-        INSERT INTO sheets (set_id, sheet_code, sheet_title, discipline_code, sheet_type, sheet_category, sheet_hierarchy_number, scale, sheet_size, template_id, revision_number)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING *
-        """,
-        (
-            payload['set_id'], payload.get('sheet_code'), payload.get('sheet_title'), payload.get('discipline_code'),
-            payload.get('sheet_type'), payload.get('sheet_category'), payload.get('sheet_hierarchy_number', 50),
-            payload.get('scale'), payload.get('sheet_size','24x36'), payload.get('template_id'), payload.get('revision_number', 0)
+    # insert + auto-renumber on one connection, committed together; the
+    # renumber reports the new sheet's number so the returned row is current
+    with transaction():
+        row = execute_single(
+            f"""
+            INSERT INTO sheets (set_id, sheet_code, sheet_title, discipline_code, sheet_type, sheet_category, sheet_hierarchy_number, scale, sheet_size, template_id, revision_number)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING {_SHEET_COLUMNS}
+            """,
+            (
+                payload['set_id'], payload.get('sheet_code'), payload.get('sheet_title'), payload.get('discipline_code'),
+                payload.get('sheet_type'), payload.get('sheet_category'), payload.get('sheet_hierarchy_number', 50),
+                payload.get('scale'), payload.get('sheet_size','24x36'), payload.get('template_id'), payload.get('revision_number', 0)
+            )
         )
-    )
-    # auto-renumber
-    renumber_sheets(payload['set_id'])
+        if row:
+            row['sheet_number'] = _renumber_sheets(payload['set_id'], row['sheet_id']).get('sheet_number')
     return row or {}
 
+def create_sheets_bulk(set_id: str, sheets: List[Dict[str, Any]], page_size: int = 500) -> List[Dict]:
+    """Add many sheets to one set in batched INSERTs, then renumber the set once.
+
+    Items take create_sheet() keys (set_id comes from the argument). Returns the
+    created rows in input order, with their final sheet_number.
+    """
+    if not sheets:
+        return []
+    rows = [
+        (
+            set_id, sheet.get('sheet_code'), sheet.get('sheet_title'), sheet.get('discipline_code'),
+            sheet.get('sheet_type'), sheet.get('sheet_category'), sheet.get('sheet_hierarchy_number', 50),
+            sheet.get('scale'), sheet.get('sheet_size', '24x36'), sheet.get('template_id'), sheet.get('revision_number', 0)
+        )
+        for sheet in sheets
+    ]
+    with transaction() as cur:
+        inserted = execute_values(
+            cur,
+            """
+            INSERT INTO sheets (set_id, sheet_code, sheet_title, discipline_code, sheet_type, sheet_category, sheet_hierarchy_number, scale, sheet_size, template_id, revision_number)
+            VALUES %s
+            RETURNING sheet_id
+            """,
+            rows, page_size=page_size, fetch=True
+        )
+        renumber_sheets(set_id)
+        sheet_ids = [row[0] for row in inserted]
+        by_id = {
+            row['sheet_id']: row
+            for row in execute_query(
+                f"SELECT {_SHEET_COLUMNS} FROM sheets WHERE sheet_id = ANY(%s::uuid[])", (sheet_ids,)
+            )
+        }
+    return [by_id[sheet_id] for sheet_id in sheet_ids if sheet_id in by_id]
+
 def update_sheet(sheet_id: str, updates: Dict[str, Any]) -> Dict:
-    fields = []
-    params: List[Any] = []
-    for key in ('sheet_code','sheet_title','discipline_code','sheet_type','sheet_category','sheet_hierarchy_number','scale','sheet_size','template_id','revision_number','revision_date','notes'):
-        if key in updates:
-            fields.append(f"{key} = %s")
-            params.append(updates[key])
+    fields = tuple(
+        key for key in ('sheet_code','sheet_title','discipline_code','sheet_type','sheet_category','sheet_hierarchy_number','scale','sheet_size','template_id','revision_number','revision_date','notes')
+        if key in updates
+    )
     if not fields:
-        return execute_single("SELECT * FROM sheets WHERE sheet_id = %s", (sheet_id,)) or {}
-    fields.append("updated_at = CURRENT_TIMESTAMP")
-    params.append(sheet_id)
-    execute_query(f"UPDATE sheets SET {', '.join(fields)} WHERE sheet_id = %s", tuple(params), fetch=False)
-    return execute_single("SELECT * FROM sheets WHERE sheet_id = %s", (sheet_id,)) or {}
+        return execute_single(f"SELECT {_SHEET_COLUMNS} FROM sheets WHERE sheet_id = %s", (sheet_id,)) or {}
+    sql = _compile_update('sheets', 'sheet_id', fields, _SHEET_COLUMNS)
+    return execute_single(sql, (*(updates[key] for key in fields), sheet_id)) or {}
 
 def delete_sheet(sheet_id: str) -> None:
-    execute_query("DELETE FROM sheets WHERE sheet_id = %s", (sheet_id,), fetch=False)
+    execute_prepared('delete_sheet', (sheet_id,), fetch=False)
 
 
 # ============================================
@@ -1552,7 +3145,7 @@ def create_sheet_drawing_assignment(payload: Dict[str, Any]) -> Dict:
 
 
 def delete_sheet_drawing_assignment(assignment_id: str) -> None:
-    execute_query("DELETE FROM sheet_drawing_assignments WHERE assignment_id = %s", (assignment_id,), fetch=False)
+    execute_prepared('delete_sheet_drawing_assignment', (assignment_id,), fetch=False)
 
 
 def list_sheet_revisions(sheet_id: str) -> List[Dict]:
@@ -1614,40 +3207,59 @@ def create_sheet_relationship(payload: Dict[str, Any]) -> Dict:
 
 
 def delete_sheet_relationship(relationship_id: str) -> None:
-    execute_query("DELETE FROM sheet_relationships WHERE relationship_id = %s", (relationship_id,), fetch=False)
+    execute_prepared('delete_sheet_relationship', (relationship_id,), fetch=False)
 
 
 def generate_sheet_index(set_id: str) -> Dict:
-    rows = execute_query(
+    # The index array is built by json_agg in one pass; the json column comes
+    # back already decoded, so no per-row dicts are assembled here.
+    row = execute_single(
         """
-        SELECT sheet_number, sheet_code, sheet_title, scale, revision_number, revision_date
+        SELECT COALESCE(json_agg(json_build_object(
+                   'sheet_number', sheet_number,
+                   'sheet_code', sheet_code,
+                   'sheet_title', sheet_title,
+                   'scale', scale,
+                   'revision_number', revision_number,
+                   'revision_date', revision_date
+               ) ORDER BY sheet_number NULLS LAST, COALESCE(sheet_hierarchy_number,50), sheet_code), '[]'::json) AS sheets,
+               COUNT(*) AS total_sheets
         FROM sheets
         WHERE set_id = %s
-        ORDER BY sheet_number NULLS LAST, COALESCE(sheet_hierarchy_number,50), sheet_code
         """,
         (set_id,)
-    )
-    return { 'set_id': set_id, 'sheets': rows, 'total_sheets': len(rows) }
+    ) or {}
+    return { 'set_id': set_id, 'sheets': row.get('sheets') or [], 'total_sheets': row.get('total_sheets') or 0 }
 
 
 # ============================================
 # PROJECT DETAILS HELPERS
 # ============================================
 
+_PROJECT_DETAILS_COLUMNS = """
+    project_id, street_address, city, state, zip_code, county, apn,
+    project_engineer, project_manager, design_lead,
+    client_contact_name, client_contact_email, client_contact_phone,
+    jurisdiction, jurisdiction_type, permit_number, project_type, project_phase,
+    tb_format_type, tb_format_size, design_start_date, design_completion_date,
+    construction_start_date, special_requirements, notes, created_at, updated_at
+"""
+
 def get_project_details(project_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT project_id, street_address, city, state, zip_code, county, apn,
-               project_engineer, project_manager, design_lead,
-               client_contact_name, client_contact_email, client_contact_phone,
-               jurisdiction, jurisdiction_type, permit_number, project_type, project_phase,
-               tb_format_type, tb_format_size, design_start_date, design_completion_date,
-               construction_start_date, special_requirements, notes, created_at, updated_at
-        FROM project_details
-        WHERE project_id = %s
-        """,
-        (project_id,)
-    )
+    """Get a project's details (cached for _READ_CACHE_TTL seconds)."""
+    cached = _cache_lookup(_project_details_cache, project_id)
+    if cached is None:
+        row = execute_single(
+            f"""
+            SELECT {_PROJECT_DETAILS_COLUMNS}
+            FROM project_details
+            WHERE project_id = %s
+            """,
+            (project_id,)
+        )
+        _cache_store(_project_details_cache, project_id, dict(row) if row is not None else None)
+        return row
+    return dict(cached[1]) if cached[1] is not None else None
 
 
 def create_project_details(payload: Dict[str, Any]) -> Dict:
@@ -1675,29 +3287,27 @@ def create_project_details(payload: Dict[str, Any]) -> Dict:
             payload.get('construction_start_date'), payload.get('special_requirements'), payload.get('notes')
         )
     )
+    _project_details_cache.pop(payload['project_id'], None)
     return row or {}
 
 
 def update_project_details(project_id: str, updates: Dict[str, Any]) -> Dict:
-    fields = []
-    params: List[Any] = []
-    for key in (
+    fields = tuple(key for key in (
         'street_address', 'city', 'state', 'zip_code', 'county', 'apn',
         'project_engineer', 'project_manager', 'design_lead',
         'client_contact_name', 'client_contact_email', 'client_contact_phone',
         'jurisdiction', 'jurisdiction_type', 'permit_number', 'project_type', 'project_phase',
         'tb_format_type', 'tb_format_size', 'design_start_date', 'design_completion_date',
         'construction_start_date', 'special_requirements', 'notes'
-    ):
-        if key in updates:
-            fields.append(f"{key} = %s")
-            params.append(updates[key])
+    ) if key in updates)
     if not fields:
         return get_project_details(project_id) or {}
-    fields.append("updated_at = CURRENT_TIMESTAMP")
-    params.append(project_id)
-    execute_query(f"UPDATE project_details SET {', '.join(fields)} WHERE project_id = %s", tuple(params), fetch=False)
-    return get_project_details(project_id) or {}
+    sql = _compile_update('project_details', 'project_id', fields, _PROJECT_DETAILS_COLUMNS)
+    row = execute_single(sql, (*(updates[key] for key in fields), project_id))
+    _project_details_cache.pop(project_id, None)
+    if row is not None:
+        _cache_store(_project_details_cache, project_id, dict(row))
+    return row or {}
 
 
 # ============================================
@@ -1735,116 +3345,87 @@ def list_standard_notes(
     return execute_query(query, tuple(params) if params else None)
 
 def get_pipe_network_detail(network_id: str) -> Optional[Dict]:
-    network = execute_single(
-        """
+    # One round trip: each child list is aggregated to json next to the
+    # network row, and point coordinates come straight from ST_X/ST_Y. The
+    # slope summary is the trigger-maintained pipe_network_metrics row
+    # (migrations/021, slope_samples from 024) plus the denormalized
+    # pipe_count (migrations/012).
+    row = execute_single(
+        f"""
+        WITH net AS (
+            SELECT
+                pn.network_id,
+                pn.project_id,
+                pn.name,
+                pn.description,
+                pn.created_at,
+                proj.project_name,
+                proj.project_number,
+                proj.client_name
+            FROM pipe_networks pn
+            LEFT JOIN projects proj ON pn.project_id = proj.project_id
+            WHERE pn.network_id = %s
+        )
         SELECT
-            pn.network_id,
-            pn.project_id,
-            pn.name,
-            pn.description,
-            pn.created_at,
-            proj.project_name,
-            proj.project_number,
-            proj.client_name
-        FROM pipe_networks pn
-        LEFT JOIN projects proj ON pn.project_id = proj.project_id
-        WHERE pn.network_id = %s
+            row_to_json(net) AS network,
+            (SELECT row_to_json(agg) FROM (
+                SELECT
+                    pn.pipe_count,
+                    COALESCE(m.pipes_below_min, 0) AS pipes_below_min,
+                    m.avg_slope,
+                    m.worst_margin,
+                    COALESCE(m.slope_samples, 0) AS slope_samples
+                FROM pipe_networks pn
+                LEFT JOIN pipe_network_metrics m ON m.network_id = pn.network_id
+                WHERE pn.network_id = net.network_id
+             ) agg) AS summary,
+            (SELECT COALESCE(json_agg(p), '[]'::json)
+             FROM ({_pipe_slopes_sql(False, True)}) p) AS pipes,
+            (SELECT COALESCE(json_agg(s), '[]'::json)
+             FROM ({_structures_sql(True, False, 'xy')}) s) AS structures,
+            (SELECT COALESCE(json_agg(c ORDER BY c.severity DESC, c.conflict_id), '[]'::json)
+             FROM (
+                SELECT
+                    c.conflict_id,
+                    c.description,
+                    c.severity,
+                    c.resolved,
+                    c.suggestions,
+                    {_geom_select('c.location', 'location', 'xy')},
+                    u.company,
+                    u.type,
+                    u.status
+                FROM conflicts c
+                LEFT JOIN utilities u ON c.utility_id = u.utility_id
+                WHERE c.project_id = net.project_id
+             ) c) AS conflicts,
+            (SELECT COALESCE(json_agg(n ORDER BY n.is_standard DESC, n.updated_at DESC), '[]'::json)
+             FROM (
+                SELECT note_id, title, category, text, tags, is_standard, updated_at
+                FROM sheet_notes
+                WHERE project_id = net.project_id
+                ORDER BY is_standard DESC, updated_at DESC
+                LIMIT 10
+             ) n) AS notes
+        FROM net
         """,
-        (network_id,)
+        (network_id, network_id, network_id)
     )
-    if not network:
+    if not row:
         return None
 
-    pipes = fetch_pipe_slopes(network_id=network_id)
-    pipe_count = len(pipes)
-    pipes_below_min = sum(
-        1 for p in pipes
-        if p['required_slope'] is not None and p['slope'] is not None and p['slope'] < p['required_slope']
-    )
-    slope_values = [p['slope'] for p in pipes if p['slope'] is not None]
-    avg_slope = sum(slope_values) / len(slope_values) if slope_values else None
-    slope_margins = [p['slope_margin'] for p in pipes if p['slope_margin'] is not None]
-    worst_margin = min(slope_margins) if slope_margins else None
-
-    structures = list_structures(network_id=network_id)
-    for struct in structures:
-        struct['rim_elev'] = _to_float(struct.get('rim_elev'))
-        struct['sump_depth'] = _to_float(struct.get('sump_depth'))
-        geom = struct.pop('geom', None)
-        if geom:
-            try:
-                coords = json.loads(geom)['coordinates']
-                struct['longitude'], struct['latitude'] = coords[0], coords[1]
-            except Exception:
-                struct['longitude'] = struct['latitude'] = None
-
-    conflicts = execute_query(
-        """
-        SELECT
-            c.conflict_id,
-            c.description,
-            c.severity,
-            c.resolved,
-            c.suggestions,
-            ST_AsGeoJSON(c.location) AS location,
-            u.company,
-            u.type,
-            u.status
-        FROM conflicts c
-        LEFT JOIN utilities u ON c.utility_id = u.utility_id
-        WHERE c.project_id = %s
-        ORDER BY c.severity DESC, c.conflict_id
-        """,
-        (network['project_id'],)
-    )
-    for item in conflicts:
-        geom = item.pop('location', None)
-        if geom:
-            try:
-                coords = json.loads(geom)['coordinates']
-                item['longitude'], item['latitude'] = coords[0], coords[1]
-            except Exception:
-                item['longitude'] = item['latitude'] = None
-
-    notes = execute_query(
-        """
-        SELECT note_id, title, category, text, tags, is_standard, updated_at
-        FROM sheet_notes
-        WHERE project_id = %s
-        ORDER BY is_standard DESC, updated_at DESC
-        LIMIT 10
-        """,
-        (network['project_id'],)
-    )
-
-    summary = {
-        'pipe_count': pipe_count,
-        'pipes_below_min': pipes_below_min,
-        'avg_slope': _to_float(avg_slope),
-        'worst_margin': _to_float(worst_margin),
-        'slope_samples': len(slope_values)
-    }
-
     return {
-        'network': network,
-        'summary': summary,
-        'pipes': pipes,
-        'structures': structures,
-        'conflicts': conflicts,
-        'notes': notes
+        'network': row['network'],
+        'summary': row['summary'],
+        'pipes': row['pipes'],
+        'structures': row['structures'],
+        'conflicts': row['conflicts'],
+        'notes': row['notes']
     }
 
 
 def get_alignment(alignment_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT alignment_id, project_id, name, design_speed, classification, srid, station_start,
-               ST_AsGeoJSON(geom) AS geom
-        FROM alignments
-        WHERE alignment_id = %s
-        """,
-        (alignment_id,)
-    )
+    return execute_single_prepared('get_alignment', (alignment_id,))
 
 
 def create_alignment(
@@ -1869,102 +3450,91 @@ def create_alignment(
     return result['alignment_id']
 
 
-def update_alignment(alignment_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('project_id', 'name', 'design_speed', 'classification', 'srid', 'station_start'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-
-    if 'geom' in updates:
-        geom_clause, geom_params = _build_geom_clause(updates['geom'], updates.get('srid'))
-        assignments.append(f"geom = {geom_clause}")
-        params.extend(geom_params)
-
-    return _execute_update('alignments', 'alignment_id', alignment_id, assignments, params)
+update_alignment = _make_updater(
+    'alignments', 'alignment_id',
+    ('project_id', 'name', 'design_speed', 'classification', 'srid', 'station_start'),
+    geom_column='geom',
+)
 
 
 def delete_alignment(alignment_id: str) -> None:
-    execute_query("DELETE FROM alignments WHERE alignment_id = %s", (alignment_id,), fetch=False)
+    execute_prepared('delete_alignment', (alignment_id,), fetch=False)
 
 
 def create_horizontal_element(alignment_id: str, payload: Dict[str, Any]) -> str:
-    result = execute_single(
-        """
-        INSERT INTO horizontal_elements (alignment_id, type, params, start_station, end_station)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING element_id
-        """,
-        (
-            alignment_id,
-            payload.get('type'),
-            _json_or_none(payload.get('params')),
-            payload.get('start_station'),
-            payload.get('end_station')
-        )
-    )
-    return result['element_id']
+    rows = execute_prepared('create_horizontal_element', (
+        alignment_id,
+        payload.get('type'),
+        _json_or_none(payload.get('params')),
+        payload.get('start_station'),
+        payload.get('end_station')
+    ))
+    return rows[0]['element_id']
 
 
 def create_vertical_element(alignment_id: str, payload: Dict[str, Any]) -> str:
-    result = execute_single(
-        """
-        INSERT INTO vertical_elements (alignment_id, type, params, start_station, end_station)
-        VALUES (%s, %s, %s, %s, %s)
-        RETURNING element_id
-        """,
-        (
-            alignment_id,
-            payload.get('type'),
-            _json_or_none(payload.get('params')),
-            payload.get('start_station'),
-            payload.get('end_station')
-        )
-    )
-    return result['element_id']
+    rows = execute_prepared('create_vertical_element', (
+        alignment_id,
+        payload.get('type'),
+        _json_or_none(payload.get('params')),
+        payload.get('start_station'),
+        payload.get('end_station')
+    ))
+    return rows[0]['element_id']
+
+def _alignment_element_rows(alignment_id: str, payloads: List[Dict[str, Any]]) -> List[tuple]:
+    return [
+        (
+            alignment_id,
+            payload.get('type'),
+            _json_or_none(payload.get('params')),
+            payload.get('start_station'),
+            payload.get('end_station')
+        )
+        for payload in payloads
+    ]
 
-def update_horizontal_element(element_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('type', 'start_station', 'end_station'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-    if 'params' in updates and updates['params'] is not None:
-        assignments.append("params = %s")
-        params.append(_json_or_none(updates['params']))
-    return _execute_update('horizontal_elements', 'element_id', element_id, assignments, params)
+
+def create_horizontal_elements_bulk(alignment_id: str, payloads: List[Dict[str, Any]]) -> List[str]:
+    """Insert many horizontal elements for one alignment; returns ids in order."""
+    return _bulk_insert_returning(
+        """
+        INSERT INTO horizontal_elements (alignment_id, type, params, start_station, end_station)
+        VALUES %s
+        RETURNING element_id
+        """,
+        _alignment_element_rows(alignment_id, payloads)
+    )
+
+
+def create_vertical_elements_bulk(alignment_id: str, payloads: List[Dict[str, Any]]) -> List[str]:
+    """Insert many vertical elements for one alignment; returns ids in order."""
+    return _bulk_insert_returning(
+        """
+        INSERT INTO vertical_elements (alignment_id, type, params, start_station, end_station)
+        VALUES %s
+        RETURNING element_id
+        """,
+        _alignment_element_rows(alignment_id, payloads)
+    )
+
+update_horizontal_element = _make_updater(
+    'horizontal_elements', 'element_id', ('type', 'start_station', 'end_station'), json_fields=('params',)
+)
 
 def delete_horizontal_element(element_id: str) -> None:
-    execute_query("DELETE FROM horizontal_elements WHERE element_id = %s", (element_id,), fetch=False)
+    execute_prepared('delete_horizontal_element', (element_id,), fetch=False)
 
-def update_vertical_element(element_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('type', 'start_station', 'end_station'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-    if 'params' in updates and updates['params'] is not None:
-        assignments.append("params = %s")
-        params.append(_json_or_none(updates['params']))
-    return _execute_update('vertical_elements', 'element_id', element_id, assignments, params)
+update_vertical_element = _make_updater(
+    'vertical_elements', 'element_id', ('type', 'start_station', 'end_station'), json_fields=('params',)
+)
 
 def delete_vertical_element(element_id: str) -> None:
-    execute_query("DELETE FROM vertical_elements WHERE element_id = %s", (element_id,), fetch=False)
+    execute_prepared('delete_vertical_element', (element_id,), fetch=False)
 
 
 def get_bmp(bmp_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT bmp_id, project_id, type, area_acres, drainage_area_acres, install_date,
-               status, compliance, ST_AsGeoJSON(geom) AS geom, metadata
-        FROM bmps
-        WHERE bmp_id = %s
-        """,
-        (bmp_id,)
-    )
+    return execute_single_prepared('get_bmp', (bmp_id,))
 
 
 def create_bmp(
@@ -1993,74 +3563,82 @@ def create_bmp(
     return result['bmp_id']
 
 
-def update_bmp(bmp_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('project_id', 'type', 'area_acres', 'drainage_area_acres', 'install_date', 'status', 'compliance'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
+update_bmp = _make_updater(
+    'bmps', 'bmp_id',
+    ('project_id', 'type', 'area_acres', 'drainage_area_acres', 'install_date', 'status', 'compliance'),
+    json_fields=('metadata',),
+    geom_column='geom',
+)
+
 
-    if 'metadata' in updates and updates['metadata'] is not None:
-        assignments.append("metadata = %s")
-        params.append(_json_or_none(updates['metadata']))
+def delete_bmp(bmp_id: str) -> None:
+    execute_prepared('delete_bmp', (bmp_id,), fetch=False)
 
-    if 'geom' in updates:
-        geom_clause, geom_params = _build_geom_clause(updates['geom'], updates.get('srid'))
-        assignments.append(f"geom = {geom_clause}")
-        params.extend(geom_params)
 
-    return _execute_update('bmps', 'bmp_id', bmp_id, assignments, params)
+def create_inspection_record(bmp_id: str, payload: Dict[str, Any]) -> str:
+    rows = execute_prepared('create_inspection_record', (
+        bmp_id,
+        payload.get('date'),
+        payload.get('findings'),
+        payload.get('status'),
+        payload.get('follow_up')
+    ))
+    return rows[0]['inspection_id']
 
 
-def delete_bmp(bmp_id: str) -> None:
-    execute_query("DELETE FROM bmps WHERE bmp_id = %s", (bmp_id,), fetch=False)
+def create_maintenance_record(bmp_id: str, payload: Dict[str, Any]) -> str:
+    rows = execute_prepared('create_maintenance_record', (
+        bmp_id,
+        payload.get('date'),
+        payload.get('action'),
+        payload.get('notes')
+    ))
+    return rows[0]['record_id']
 
 
-def create_inspection_record(bmp_id: str, payload: Dict[str, Any]) -> str:
-    result = execute_single(
+def create_inspection_records_bulk(bmp_id: str, payloads: List[Dict[str, Any]]) -> List[str]:
+    """Insert many inspections for one BMP; returns ids in order."""
+    return _bulk_insert_returning(
         """
         INSERT INTO inspections (bmp_id, date, findings, status, follow_up)
-        VALUES (%s, %s, %s, %s, %s)
+        VALUES %s
         RETURNING inspection_id
         """,
-        (
-            bmp_id,
-            payload.get('date'),
-            payload.get('findings'),
-            payload.get('status'),
-            payload.get('follow_up')
-        )
+        [
+            (
+                bmp_id,
+                payload.get('date'),
+                payload.get('findings'),
+                payload.get('status'),
+                payload.get('follow_up')
+            )
+            for payload in payloads
+        ]
     )
-    return result['inspection_id']
 
 
-def create_maintenance_record(bmp_id: str, payload: Dict[str, Any]) -> str:
-    result = execute_single(
+def create_maintenance_records_bulk(bmp_id: str, payloads: List[Dict[str, Any]]) -> List[str]:
+    """Insert many maintenance records for one BMP; returns ids in order."""
+    return _bulk_insert_returning(
         """
         INSERT INTO maintenance_records (bmp_id, date, action, notes)
-        VALUES (%s, %s, %s, %s)
+        VALUES %s
         RETURNING record_id
         """,
-        (
-            bmp_id,
-            payload.get('date'),
-            payload.get('action'),
-            payload.get('notes')
-        )
+        [
+            (
+                bmp_id,
+                payload.get('date'),
+                payload.get('action'),
+                payload.get('notes')
+            )
+            for payload in payloads
+        ]
     )
-    return result['record_id']
 
 
 def get_utility(utility_id: str) -> Optional[Dict]:
-    return execute_single(
-        """
-        SELECT utility_id, project_id, company, type, status, request_date, response_date, contact, metadata
-        FROM utilities
-        WHERE utility_id = %s
-        """,
-        (utility_id,)
-    )
+    return execute_single_prepared('get_utility', (utility_id,))
 
 
 def create_utility(
@@ -2084,23 +3662,15 @@ def create_utility(
     return result['utility_id']
 
 
-def update_utility(utility_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('project_id', 'company', 'type', 'status', 'request_date', 'response_date', 'contact'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-
-    if 'metadata' in updates and updates['metadata'] is not None:
-        assignments.append("metadata = %s")
-        params.append(_json_or_none(updates['metadata']))
-
-    return _execute_update('utilities', 'utility_id', utility_id, assignments, params)
+update_utility = _make_updater(
+    'utilities', 'utility_id',
+    ('project_id', 'company', 'type', 'status', 'request_date', 'response_date', 'contact'),
+    json_fields=('metadata',),
+)
 
 
 def delete_utility(utility_id: str) -> None:
-    execute_query("DELETE FROM utilities WHERE utility_id = %s", (utility_id,), fetch=False)
+    execute_prepared('delete_utility', (utility_id,), fetch=False)
 
 
 def create_conflict_record(payload: Dict[str, Any]) -> str:
@@ -2124,21 +3694,12 @@ def create_conflict_record(payload: Dict[str, Any]) -> str:
     return result['conflict_id']
 
 
-def update_conflict(conflict_id: str, updates: Dict[str, Any]) -> bool:
-    assignments: List[str] = []
-    params: List[Any] = []
-    for field in ('project_id', 'utility_id', 'description', 'severity', 'resolved', 'suggestions'):
-        if field in updates and updates[field] is not None:
-            assignments.append(f"{field} = %s")
-            params.append(updates[field])
-
-    if 'geom' in updates or 'location' in updates:
-        geom_value = updates.get('geom', updates.get('location'))
-        geom_clause, geom_params = _build_geom_clause(geom_value, updates.get('srid'))
-        assignments.append(f"location = {geom_clause}")
-        params.extend(geom_params)
-
-    return _execute_update('conflicts', 'conflict_id', conflict_id, assignments, params)
+update_conflict = _make_updater(
+    'conflicts', 'conflict_id',
+    ('project_id', 'utility_id', 'description', 'severity', 'resolved', 'suggestions'),
+    geom_column='location',
+    geom_keys=('geom', 'location'),
+)
 
 if __name__ == "__main__":
     # Test connection
@@ -64,7 +64,6 @@ class DXFExporter:
             raise ValueError("Drawing not found")
 
         layers = database.get_layers(drawing_id)
-        inserts = database.get_block_inserts(drawing_id)
 
         # Preferred: rehydrate from original DXF if available
         original_dxf = drawing.get("dxf_content")
@@ -149,7 +148,7 @@ class DXFExporter:
             # Build rough stats from doc contents
             try:
                 stats["layers"] = [l.dxf.name for l in doc.layers]
-                stats["blocks"] = len(inserts)
+                stats["blocks"] = database.count_block_inserts(drawing_id)
                 stats["entities"] = sum(1 for _ in doc.modelspace())
             except Exception:
                 pass
@@ -170,24 +169,21 @@ class DXFExporter:
                 # ignore invalid names
                 continue
 
-        # Create placeholder block definitions for all block names we will reference
-        unique_block_names = set(i.get("block_name") for i in inserts if i.get("block_name"))
-        for bname in unique_block_names:
-            try:
-                if bname and bname not in doc.blocks:
+        # Add inserts into modelspace, streaming them from the database and
+        # creating a placeholder block definition the first time a name is seen
+        for ins in database.iter_block_inserts(drawing_id):
+            bname = ins.get("block_name")
+            if not bname:
+                continue
+            if bname not in doc.blocks:
+                try:
                     blk = doc.blocks.new(name=bname)
                     # Draw a small square placeholder centered at origin
                     size = 1.0
                     blk.add_lwpolyline([( -size, -size), ( size, -size), ( size, size), ( -size, size), ( -size, -size)])
-            except Exception as exc:
-                stats["errors"].append(f"Block '{bname}' placeholder failed: {exc}")
-
-        # Add inserts into modelspace
-        for ins in inserts:
+                except Exception as exc:
+                    stats["errors"].append(f"Block '{bname}' placeholder failed: {exc}")
             try:
-                bname = ins.get("block_name")
-                if not bname:
-                    continue
                 layer_name = ins.get("layer_name") or "0"
                 ipt = (float(ins.get("insert_x", 0.0)), float(ins.get("insert_y", 0.0)), float(ins.get("insert_z")) if ins.get("insert_z") is not None else 0.0)
                 sx = float(ins.get("scale_x", 1.0)) or 1.0
@@ -22,25 +22,37 @@ if __package__ in (None, ""):
     from database import (  # type: ignore
         create_drawing,
         create_layer,
+        create_layers_bulk,
         create_block_insert,
+        create_block_inserts_bulk,
         create_block_definition,
+        create_block_definitions_bulk,
         get_project,
-        get_block_definition,
+        resolve_block_ids,
         execute_query,
         clear_canonical_features,
         insert_canonical_feature,
+        insert_canonical_features_bulk,
+        bulk_import_session,
+        savepoint,
     )
 else:
     from .database import (  # type: ignore
         create_drawing,
         create_layer,
+        create_layers_bulk,
         create_block_insert,
+        create_block_inserts_bulk,
         create_block_definition,
+        create_block_definitions_bulk,
         get_project,
-        get_block_definition,
+        resolve_block_ids,
         execute_query,
         clear_canonical_features,
         insert_canonical_feature,
+        insert_canonical_features_bulk,
+        bulk_import_session,
+        savepoint,
     )
 
 class GeoreferencedDXFImporter:
@@ -55,6 +67,9 @@ class GeoreferencedDXFImporter:
     EPSG_2226_X_MAX = 6500000
     EPSG_2226_Y_MIN = 1900000
     EPSG_2226_Y_MAX = 2300000
+
+    # Canonical features are written in batches of this many rows
+    CANONICAL_BATCH_SIZE = 1000
     
     def __init__(
         self,
@@ -422,12 +437,44 @@ class GeoreferencedDXFImporter:
 
         return None
 
+    def _store_canonical_batch(self, batch: List[Tuple]) -> int:
+        """Write a batch of canonical features; returns how many were stored.
+
+        A failing batch is retried row by row so one bad geometry only
+        skips itself instead of the whole batch.
+        """
+        try:
+            with savepoint():
+                return insert_canonical_features_bulk(self.drawing_id, self.project_id, batch)
+        except Exception:
+            pass
+
+        stored = 0
+        for feature_type, layer_name, native_wkt, native_srid, canonical_wkt, metadata in batch:
+            try:
+                with savepoint():
+                    insert_canonical_feature(
+                        drawing_id=self.drawing_id,
+                        project_id=self.project_id,
+                        feature_type=feature_type,
+                        layer_name=layer_name,
+                        native_wkt=native_wkt,
+                        native_srid=native_srid,
+                        canonical_wkt=canonical_wkt,
+                        metadata=metadata
+                    )
+                stored += 1
+            except Exception as exc:
+                print(f"  ✗ Failed to store canonical {feature_type}: {exc}")
+        return stored
+
     def import_canonical_geometry(self):
         """Populate canonical_features from the DXF model space."""
         print(f"\n🌐 Writing canonical geometries...")
 
         try:
-            clear_canonical_features(self.drawing_id)
+            with savepoint():
+                clear_canonical_features(self.drawing_id)
         except Exception as exc:
             print(f"  ✗ Failed to clear existing canonical features: {exc}")
             return
@@ -436,8 +483,10 @@ class GeoreferencedDXFImporter:
         self._ensure_transformer()
 
         msp = self.doc.modelspace()
+        native_srid = self.epsg_code if self.is_georeferenced else None
         inserted = 0
         skipped = 0
+        batch: List[Tuple] = []
 
         for entity in msp:
             feature = self._extract_canonical_feature(entity)
@@ -449,21 +498,17 @@ class GeoreferencedDXFImporter:
                 skipped += 1
                 continue
 
-            try:
-                insert_canonical_feature(
-                    drawing_id=self.drawing_id,
-                    project_id=self.project_id,
-                    feature_type=feature_type,
-                    layer_name=layer_name,
-                    native_wkt=native_wkt,
-                    native_srid=self.epsg_code if self.is_georeferenced else None,
-                    canonical_wkt=canonical_wkt,
-                    metadata=metadata
-                )
-                inserted += 1
-            except Exception as exc:
-                skipped += 1
-                print(f"  ✗ Failed to store canonical {feature_type}: {exc}")
+            batch.append((feature_type, layer_name, native_wkt, native_srid, canonical_wkt, metadata))
+            if len(batch) >= self.CANONICAL_BATCH_SIZE:
+                stored = self._store_canonical_batch(batch)
+                inserted += stored
+                skipped += len(batch) - stored
+                batch = []
+
+        if batch:
+            stored = self._store_canonical_batch(batch)
+            inserted += stored
+            skipped += len(batch) - stored
 
         self.stats['canonical_features'] = inserted
         if inserted:
@@ -478,6 +523,7 @@ class GeoreferencedDXFImporter:
         
         print(f"\n📑 Importing layers...")
         
+        layers = []
         for layer in self.doc.layers:
             try:
                 layer_name = layer.dxf.name
@@ -490,22 +536,34 @@ class GeoreferencedDXFImporter:
                 else:
                     lineweight = 0.25
                 
-                create_layer(
-                    drawing_id=self.drawing_id,
-                    layer_name=layer_name,
-                    color=color,
-                    linetype=linetype,
-                    lineweight=lineweight,
-                    is_locked=layer.is_locked(),
-                    is_frozen=layer.is_frozen()
-                )
-                
-                self.stats['layers'] += 1
-                print(f"  ✓ {layer_name}")
-                
+                layers.append({
+                    'layer_name': layer_name,
+                    'color': color,
+                    'linetype': linetype,
+                    'lineweight': lineweight,
+                    'is_locked': layer.is_locked(),
+                    'is_frozen': layer.is_frozen(),
+                })
             except Exception as e:
                 print(f"  ✗ Failed to import layer {layer.dxf.name}: {e}")
         
+        try:
+            with savepoint():
+                stored = create_layers_bulk(self.drawing_id, layers)
+        except Exception as e:
+            print(f"  ⚠️  Bulk layer import failed ({e}); retrying one by one")
+            stored = {}
+            for item in layers:
+                try:
+                    with savepoint():
+                        stored[item['layer_name']] = create_layer(drawing_id=self.drawing_id, **item)
+                except Exception as exc:
+                    print(f"  ✗ Failed to import layer {item['layer_name']}: {exc}")
+        
+        for layer_name in stored:
+            self.stats['layers'] += 1
+            print(f"  ✓ {layer_name}")
+        
         print(f"✅ Imported {self.stats['layers']} layers")
     
     def import_blocks(self):
@@ -513,41 +571,54 @@ class GeoreferencedDXFImporter:
         
         print(f"\n🔷 Importing block definitions...")
         
-        for block in self.doc.blocks:
-            if block.name.startswith('*'):
+        blocks = [block for block in self.doc.blocks if not block.name.startswith('*')]
+        try:
+            with savepoint():
+                existing_ids = resolve_block_ids([block.name for block in blocks])
+        except Exception as e:
+            print(f"  ✗ Failed to look up existing blocks: {e}")
+            existing_ids = {}
+        
+        new_blocks = []
+        for block in blocks:
+            if block.name in existing_ids:
+                print(f"  ⭐ {block.name} (already exists)")
                 continue
             
+            parts = block.name.split('.')
+            if len(parts) >= 3:
+                domain, category = parts[0], parts[1]
+            else:
+                domain, category = 'CUSTOM', 'IMPORTED'
+            
+            new_blocks.append({
+                'block_name': block.name,
+                'svg_content': self.block_to_svg(block),
+                'domain': domain,
+                'category': category,
+                'semantic_type': block.name,
+                'semantic_label': block.name.replace('_', ' ').title(),
+                'usage_context': f"Block imported from {self.dxf_path.name}",
+                'tags': [domain, category, 'IMPORTED'],
+                'metadata': {'source': 'dxf_import', 'georeferenced': self.is_georeferenced}
+            })
+        
+        if new_blocks:
             try:
-                existing = get_block_definition(block.name)
-                if existing:
-                    print(f"  ⭐ {block.name} (already exists)")
-                    continue
-                
-                svg_content = self.block_to_svg(block)
-                
-                parts = block.name.split('.')
-                if len(parts) >= 3:
-                    domain, category = parts[0], parts[1]
-                else:
-                    domain, category = 'CUSTOM', 'IMPORTED'
-                
-                create_block_definition(
-                    block_name=block.name,
-                    svg_content=svg_content,
-                    domain=domain,
-                    category=category,
-                    semantic_type=block.name,
-                    semantic_label=block.name.replace('_', ' ').title(),
-                    usage_context=f"Block imported from {self.dxf_path.name}",
-                    tags=[domain, category, 'IMPORTED'],
-                    metadata={'source': 'dxf_import', 'georeferenced': self.is_georeferenced}
-                )
-                
-                self.stats['blocks'] += 1
-                print(f"  ✓ {block.name}")
-                
+                with savepoint():
+                    created = create_block_definitions_bulk(new_blocks)
             except Exception as e:
-                print(f"  ✗ Failed to import block {block.name}: {e}")
+                print(f"  ⚠️  Bulk block import failed ({e}); retrying one by one")
+                created = {}
+                for item in new_blocks:
+                    try:
+                        with savepoint():
+                            created[item['block_name']] = create_block_definition(**item)
+                    except Exception as exc:
+                        print(f"  ✗ Failed to import block {item['block_name']}: {exc}")
+            self.stats['blocks'] += len(created)
+            for block_name in created:
+                print(f"  ✓ {block_name}")
         
         print(f"✅ Imported {self.stats['blocks']} block definitions")
     
@@ -567,33 +638,52 @@ class GeoreferencedDXFImporter:
         
         msp = self.doc.modelspace()
         
+        inserts = []
         for entity in msp.query('INSERT'):
             try:
-                create_block_insert(
-                    drawing_id=self.drawing_id,
-                    block_name=entity.dxf.name,
-                    insert_x=entity.dxf.insert.x,
-                    insert_y=entity.dxf.insert.y,
-                    insert_z=entity.dxf.insert.z if hasattr(entity.dxf.insert, 'z') else 0,
-                    scale_x=entity.dxf.xscale,
-                    scale_y=entity.dxf.yscale,
-                    rotation=entity.dxf.rotation,
-                    layer_name=entity.dxf.layer,
-                    metadata={
+                inserts.append({
+                    'block_name': entity.dxf.name,
+                    'insert_x': entity.dxf.insert.x,
+                    'insert_y': entity.dxf.insert.y,
+                    'insert_z': entity.dxf.insert.z if hasattr(entity.dxf.insert, 'z') else 0,
+                    'scale_x': entity.dxf.xscale,
+                    'scale_y': entity.dxf.yscale,
+                    'rotation': entity.dxf.rotation,
+                    'layer_name': entity.dxf.layer,
+                    'metadata': {
                         'handle': entity.dxf.handle,
                         'has_attributes': len(entity.attribs) > 0,
                         'layer': entity.dxf.layer
                     }
-                )
-                
-                self.stats['inserts'] += 1
-                
-                if self.stats['inserts'] % 10 == 0:
-                    print(f"  ... {self.stats['inserts']} inserts imported")
-                
+                })
             except Exception as e:
                 print(f"  ✗ Failed to import insert: {e}")
         
+        try:
+            with savepoint():
+                block_ids = resolve_block_ids([item['block_name'] for item in inserts])
+        except Exception as e:
+            print(f"  ✗ Failed to look up blocks for inserts: {e}")
+            return
+        
+        unknown = sorted({item['block_name'] for item in inserts} - block_ids.keys())
+        if unknown:
+            print(f"  ✗ Skipping inserts of unknown blocks: {', '.join(unknown)}")
+        
+        known = [item for item in inserts if item['block_name'] in block_ids]
+        try:
+            with savepoint():
+                self.stats['inserts'] += len(create_block_inserts_bulk(self.drawing_id, known))
+        except Exception as e:
+            print(f"  ⚠️  Bulk insert import failed ({e}); retrying one by one")
+            for item in known:
+                try:
+                    with savepoint():
+                        create_block_insert(drawing_id=self.drawing_id, **item)
+                    self.stats['inserts'] += 1
+                except Exception as exc:
+                    print(f"  ✗ Failed to import insert {item['metadata']['handle']}: {exc}")
+        
         print(f"✅ Imported {self.stats['inserts']} block inserts")
     
     def import_other_entities(self):
@@ -637,14 +727,17 @@ class GeoreferencedDXFImporter:
         if not drawing_name:
             drawing_name = self.dxf_path.stem
         
-        self.store_raw_dxf(drawing_name, drawing_type)
-        
-        # Import components
-        self.import_layers()
-        self.import_blocks()
-        self.import_block_inserts()
-        self.import_other_entities()
-        self.import_canonical_geometry()
+        # One transaction for the whole import; steps that may fail on their
+        # own are wrapped in savepoints so the rest still commits.
+        with bulk_import_session():
+            self.store_raw_dxf(drawing_name, drawing_type)
+            
+            # Import components
+            self.import_layers()
+            self.import_blocks()
+            self.import_block_inserts()
+            self.import_other_entities()
+            self.import_canonical_geometry()
         
         # Summary
         print("\n" + "="*60)
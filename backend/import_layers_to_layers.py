@@ -3,8 +3,8 @@
 Import Excel -> layers table for a chosen drawing.
 
 - Creates a Project and Drawing if they don't exist (by name), unless --drawing-id is provided.
-- Upserts layers by (drawing_id, layer_name) using database.create_layer().
-- Tries to link to layer_standards automatically via name (handled in create_layer).
+- Upserts layers by (drawing_id, layer_name) using database.create_layers_bulk().
+- Tries to link to layer_standards automatically via name (handled in the upsert).
 """
 
 import os
@@ -293,8 +293,8 @@ def main():
         )
         print(f"Truncated existing layers for drawing: {existing} removed")
 
-    # Import rows
-    created = 0
+    # Collect rows, then upsert them in batched multi-row statements
+    layers = []
     color_resolved = 0
     for idx, row in df.iterrows():
         layer_name = row.get("layer_name", "").strip()
@@ -307,24 +307,31 @@ def main():
         if color_val is not None:
             color_resolved += 1
 
-        # We leave color=None so DB defaults apply; create_layer will try to link layer_standard_id by name.
-        try:
-            database.create_layer(
-                drawing_id=drawing_id,
-                layer_name=layer_name,
-                color=color_val,
-                linetype=linetype,
-                lineweight=lineweight,
-                is_plottable=True,
-                is_locked=False,
-                is_frozen=False,
-                layer_standard_id=None
-            )
-            created += 1
-            if created % 100 == 0:
-                print(f"  Inserted/updated {created}...")
-        except Exception as e:
-            print(f"  Row {idx+1} failed ({layer_name}): {e}")
+        # create_layers_bulk links layer_standard_id by name when none is given.
+        layers.append({
+            "layer_name": layer_name,
+            "color": color_val,
+            "linetype": linetype,
+            "lineweight": lineweight,
+            "is_plottable": True,
+            "is_locked": False,
+            "is_frozen": False,
+            "layer_standard_id": None,
+        })
+
+    created = 0
+    try:
+        created = len(database.create_layers_bulk(drawing_id, layers))
+    except Exception as e:
+        print(f"  Bulk upsert failed ({e}); retrying row by row")
+        for layer in layers:
+            try:
+                database.create_layer(drawing_id=drawing_id, **layer)
+                created += 1
+                if created % 100 == 0:
+                    print(f"  Inserted/updated {created}...")
+            except Exception as exc:
+                print(f"  Layer {layer['layer_name']} failed: {exc}")
 
     print("-" * 70)
     print(f"Done. Inserted/updated: {created}")
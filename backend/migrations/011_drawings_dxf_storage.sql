@@ -0,0 +1,18 @@
+-- Drawings DXF storage tuning (idempotent)
+
+-- DXF text is written once per import and read back whole by the exporter.
+-- LZ4 compresses and decompresses it several times faster than the default
+-- pglz, so keep the column compressible (EXTENDED) with the lz4 method. Both
+-- change in one statement; where lz4 is unavailable the column is stored out
+-- of line without a compression pass (EXTERNAL) instead. Only newly written
+-- values are affected. SET COMPRESSION needs PostgreSQL 14+.
+DO $$
+BEGIN
+  ALTER TABLE IF EXISTS drawings
+    ALTER COLUMN dxf_content SET COMPRESSION lz4,
+    ALTER COLUMN dxf_content SET STORAGE EXTENDED;
+EXCEPTION WHEN feature_not_supported OR invalid_parameter_value THEN
+  RAISE NOTICE 'lz4 compression not available; storing drawings.dxf_content uncompressed';
+  ALTER TABLE IF EXISTS drawings
+    ALTER COLUMN dxf_content SET STORAGE EXTERNAL;
+END$$;
@@ -0,0 +1,120 @@
+-- Denormalized child counts for list views (idempotent)
+-- pipe_networks.pipe_count and alignments.*_element_count are kept current by
+-- statement-level triggers and re-synced from the child tables on every run.
+
+ALTER TABLE IF EXISTS pipe_networks
+  ADD COLUMN IF NOT EXISTS pipe_count integer NOT NULL DEFAULT 0;
+
+ALTER TABLE IF EXISTS alignments
+  ADD COLUMN IF NOT EXISTS horizontal_element_count integer NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS vertical_element_count integer NOT NULL DEFAULT 0;
+
+-- Trigger args: parent table, parent key (same name on the child), counter
+-- column, child primary key. Works off transition tables so bulk inserts cost
+-- one UPDATE per touched parent instead of one per row.
+CREATE OR REPLACE FUNCTION maintain_child_count() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  parent_table text := TG_ARGV[0];
+  parent_key text := TG_ARGV[1];
+  counter text := TG_ARGV[2];
+  child_pk text := TG_ARGV[3];
+  delta_sql text;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    delta_sql := format('SELECT %I AS key, 1 AS n FROM new_rows', parent_key);
+  ELSIF TG_OP = 'DELETE' THEN
+    delta_sql := format('SELECT %I AS key, -1 AS n FROM old_rows', parent_key);
+  ELSE
+    delta_sql := format(
+      'SELECT o.%1$I AS key, -1 AS n
+         FROM old_rows o JOIN new_rows nw USING (%2$I)
+        WHERE o.%1$I IS DISTINCT FROM nw.%1$I
+       UNION ALL
+       SELECT nw.%1$I AS key, 1 AS n
+         FROM old_rows o JOIN new_rows nw USING (%2$I)
+        WHERE o.%1$I IS DISTINCT FROM nw.%1$I',
+      parent_key, child_pk);
+  END IF;
+
+  EXECUTE format(
+    'UPDATE %1$I t SET %2$I = t.%2$I + d.n
+       FROM (SELECT key, SUM(n) AS n FROM (%4$s) x WHERE key IS NOT NULL GROUP BY key) d
+      WHERE t.%3$I = d.key AND d.n <> 0',
+    parent_table, counter, parent_key, delta_sql);
+  RETURN NULL;
+END;
+$$;
+
+-- pipes -> pipe_networks.pipe_count
+DROP TRIGGER IF EXISTS trg_pipes_count_ins ON pipes;
+CREATE TRIGGER trg_pipes_count_ins AFTER INSERT ON pipes
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('pipe_networks', 'network_id', 'pipe_count', 'pipe_id');
+DROP TRIGGER IF EXISTS trg_pipes_count_del ON pipes;
+CREATE TRIGGER trg_pipes_count_del AFTER DELETE ON pipes
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('pipe_networks', 'network_id', 'pipe_count', 'pipe_id');
+DROP TRIGGER IF EXISTS trg_pipes_count_upd ON pipes;
+CREATE TRIGGER trg_pipes_count_upd AFTER UPDATE ON pipes
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('pipe_networks', 'network_id', 'pipe_count', 'pipe_id');
+
+-- horizontal_elements -> alignments.horizontal_element_count
+DROP TRIGGER IF EXISTS trg_horizontal_elements_count_ins ON horizontal_elements;
+CREATE TRIGGER trg_horizontal_elements_count_ins AFTER INSERT ON horizontal_elements
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'horizontal_element_count', 'element_id');
+DROP TRIGGER IF EXISTS trg_horizontal_elements_count_del ON horizontal_elements;
+CREATE TRIGGER trg_horizontal_elements_count_del AFTER DELETE ON horizontal_elements
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'horizontal_element_count', 'element_id');
+DROP TRIGGER IF EXISTS trg_horizontal_elements_count_upd ON horizontal_elements;
+CREATE TRIGGER trg_horizontal_elements_count_upd AFTER UPDATE ON horizontal_elements
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'horizontal_element_count', 'element_id');
+
+-- vertical_elements -> alignments.vertical_element_count
+DROP TRIGGER IF EXISTS trg_vertical_elements_count_ins ON vertical_elements;
+CREATE TRIGGER trg_vertical_elements_count_ins AFTER INSERT ON vertical_elements
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'vertical_element_count', 'element_id');
+DROP TRIGGER IF EXISTS trg_vertical_elements_count_del ON vertical_elements;
+CREATE TRIGGER trg_vertical_elements_count_del AFTER DELETE ON vertical_elements
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'vertical_element_count', 'element_id');
+DROP TRIGGER IF EXISTS trg_vertical_elements_count_upd ON vertical_elements;
+CREATE TRIGGER trg_vertical_elements_count_upd AFTER UPDATE ON vertical_elements
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('alignments', 'alignment_id', 'vertical_element_count', 'element_id');
+
+-- Backfill / re-sync (only rows that drifted are written)
+UPDATE pipe_networks pn
+SET pipe_count = c.n
+FROM (
+  SELECT pn2.network_id, COUNT(p.pipe_id)::int AS n
+  FROM pipe_networks pn2
+  LEFT JOIN pipes p ON p.network_id = pn2.network_id
+  GROUP BY pn2.network_id
+) c
+WHERE pn.network_id = c.network_id AND pn.pipe_count IS DISTINCT FROM c.n;
+
+-- Both element tables are counted in one aggregate pass over their union;
+-- alignments without elements come out of the LEFT JOIN as zero.
+UPDATE alignments a
+SET horizontal_element_count = c.h, vertical_element_count = c.v
+FROM (
+  SELECT
+    a2.alignment_id,
+    COUNT(*) FILTER (WHERE e.src = 'h')::int AS h,
+    COUNT(*) FILTER (WHERE e.src = 'v')::int AS v
+  FROM alignments a2
+  LEFT JOIN (
+    SELECT alignment_id, 'h' AS src FROM horizontal_elements
+    UNION ALL
+    SELECT alignment_id, 'v' AS src FROM vertical_elements
+  ) e ON e.alignment_id = a2.alignment_id
+  GROUP BY a2.alignment_id
+) c
+WHERE a.alignment_id = c.alignment_id
+  AND (a.horizontal_element_count IS DISTINCT FROM c.h OR a.vertical_element_count IS DISTINCT FROM c.v);
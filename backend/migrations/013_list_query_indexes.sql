@@ -0,0 +1,40 @@
+-- Composite indexes matching the filter + ORDER BY of the civil list_* queries
+-- Safe to run multiple times. Plain CREATE INDEX (not CONCURRENTLY) because the
+-- migration runner wraps every file in a single transaction.
+
+-- list_pipes: WHERE network_id = ? [AND (COALESCE(diameter_mm, -1), pipe_id) < (?, ?)]
+-- ORDER BY COALESCE(diameter_mm, -1) DESC, pipe_id DESC
+CREATE INDEX IF NOT EXISTS idx_pipes_net_diam_keyset
+  ON pipes (network_id, (COALESCE(diameter_mm, -1)) DESC, pipe_id DESC);
+
+-- list_structures: WHERE network_id = ? / project_id = ? ORDER BY COALESCE(rim_elev, 0) DESC, structure_id
+CREATE INDEX IF NOT EXISTS idx_structures_net_rim
+  ON structures (network_id, (COALESCE(rim_elev, 0)) DESC, structure_id);
+CREATE INDEX IF NOT EXISTS idx_structures_proj_rim
+  ON structures (project_id, (COALESCE(rim_elev, 0)) DESC, structure_id);
+
+-- list_bmps: WHERE project_id = ? ORDER BY install_date DESC NULLS LAST, bmp_id
+CREATE INDEX IF NOT EXISTS idx_bmps_proj_install
+  ON bmps (project_id, install_date DESC NULLS LAST, bmp_id);
+
+-- list_pipe_networks: WHERE project_id = ? ORDER BY created_at DESC NULLS LAST, name
+CREATE INDEX IF NOT EXISTS idx_pipe_networks_proj_created
+  ON pipe_networks (project_id, created_at DESC NULLS LAST, name);
+
+-- list_utilities: WHERE project_id = ? ORDER BY request_date DESC NULLS LAST, company
+CREATE INDEX IF NOT EXISTS idx_utilities_proj_request
+  ON utilities (project_id, request_date DESC NULLS LAST, company);
+
+-- list_conflicts: WHERE project_id = ? ORDER BY severity DESC, conflict_id
+CREATE INDEX IF NOT EXISTS idx_conflicts_proj_severity
+  ON conflicts (project_id, severity DESC, conflict_id);
+
+-- list_sheet_notes: WHERE project_id = ? ORDER BY updated_at DESC NULLS LAST, title
+-- sheet_notes is not created by these migrations, so only index it when present.
+DO $$
+BEGIN
+  IF to_regclass('sheet_notes') IS NOT NULL THEN
+    EXECUTE 'CREATE INDEX IF NOT EXISTS idx_sheet_notes_proj_updated
+             ON sheet_notes (project_id, updated_at DESC NULLS LAST, title)';
+  END IF;
+END$$;
@@ -0,0 +1,29 @@
+-- Time-ordered UUID defaults for high-volume insert tables (idempotent)
+-- Random v4 keys scatter inserts across the whole primary-key index; v7 keys
+-- are monotonic, so new rows land on the right-most leaf pages.
+-- Uses the built-in uuidv7() (PostgreSQL 18+) or pg_uuidv7's
+-- uuid_generate_v7(); when neither is available gen_random_uuid() stays.
+
+DO $$
+DECLARE
+  v7_fn text;
+BEGIN
+  IF to_regprocedure('uuidv7()') IS NULL AND to_regprocedure('uuid_generate_v7()') IS NULL THEN
+    BEGIN
+      CREATE EXTENSION IF NOT EXISTS pg_uuidv7;
+    EXCEPTION WHEN others THEN
+      RAISE NOTICE 'pg_uuidv7 not available; keeping gen_random_uuid() defaults';
+    END;
+  END IF;
+
+  IF to_regprocedure('uuidv7()') IS NOT NULL THEN
+    v7_fn := 'uuidv7()';
+  ELSIF to_regprocedure('uuid_generate_v7()') IS NOT NULL THEN
+    v7_fn := 'uuid_generate_v7()';
+  ELSE
+    RETURN;
+  END IF;
+
+  EXECUTE format('ALTER TABLE block_inserts ALTER COLUMN insert_id SET DEFAULT %s', v7_fn);
+  EXECUTE format('ALTER TABLE canonical_features ALTER COLUMN feature_id SET DEFAULT %s', v7_fn);
+END$$;
@@ -0,0 +1,6 @@
+-- Covering index for block name lookups (idempotent)
+-- resolve_block_ids (name -> block_id) can then be answered by an index-only
+-- scan without touching the heap rows or their TOASTed svg_content.
+
+CREATE INDEX IF NOT EXISTS idx_block_definitions_name_meta
+  ON block_definitions (block_name) INCLUDE (block_id, domain, category);
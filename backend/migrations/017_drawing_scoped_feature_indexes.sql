@@ -0,0 +1,25 @@
+-- Drawing-scoped indexes and vacuum settings for the re-imported tables
+-- Safe to run multiple times. Re-imports delete and re-insert a whole drawing
+-- at a time, so both tables churn heavily and are always read per drawing.
+
+-- list_canonical_features: WHERE drawing_id = ? ORDER BY layer_name, feature_type, feature_id
+CREATE INDEX IF NOT EXISTS idx_canonical_features_drawing_layer
+  ON canonical_features (drawing_id, layer_name, feature_type, feature_id);
+
+-- get_block_inserts / iter_block_inserts: WHERE drawing_id = ? ORDER BY created_at, insert_id
+-- Rows come back already in that order; block_definitions is then probed by
+-- primary key per insert. metadata is deliberately not INCLUDEd: jsonb values
+-- can exceed the index tuple size limit and would make inserts fail.
+CREATE INDEX IF NOT EXISTS idx_block_inserts_drawing_order
+  ON block_inserts (drawing_id, created_at, insert_id);
+
+-- Vacuum after a few percent of dead rows instead of the 20% default so the
+-- space freed by clear_canonical_features is reused by the next import.
+ALTER TABLE canonical_features SET (
+  autovacuum_vacuum_scale_factor = 0.02,
+  autovacuum_analyze_scale_factor = 0.01
+);
+ALTER TABLE block_inserts SET (
+  autovacuum_vacuum_scale_factor = 0.02,
+  autovacuum_analyze_scale_factor = 0.01
+);
@@ -0,0 +1,18 @@
+-- Ordered indexes for the per-parent child listings (idempotent)
+-- Complements 013_list_query_indexes.sql (pipes, structures, bmps, conflicts
+-- and the other top-level lists are covered there).
+
+-- list_inspections: WHERE bmp_id = ? ORDER BY date DESC NULLS LAST, inspection_id
+CREATE INDEX IF NOT EXISTS idx_inspections_bmp_date
+  ON inspections (bmp_id, date DESC NULLS LAST, inspection_id);
+
+-- list_maintenance_records: WHERE bmp_id = ? ORDER BY date DESC NULLS LAST, record_id
+CREATE INDEX IF NOT EXISTS idx_maintenance_records_bmp_date
+  ON maintenance_records (bmp_id, date DESC NULLS LAST, record_id);
+
+-- list_horizontal_elements / list_vertical_elements and the batched element
+-- load in list_alignment_elements_bulk: WHERE alignment_id = ? ORDER BY start_station
+CREATE INDEX IF NOT EXISTS idx_horizontal_elements_alignment_station
+  ON horizontal_elements (alignment_id, start_station);
+CREATE INDEX IF NOT EXISTS idx_vertical_elements_alignment_station
+  ON vertical_elements (alignment_id, start_station);
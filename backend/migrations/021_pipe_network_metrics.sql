@@ -0,0 +1,118 @@
+-- Per-network pipe slope metrics kept current by triggers (idempotent)
+-- list_pipe_networks reads pipes_below_min / avg_slope / worst_margin from
+-- pipe_network_metrics instead of aggregating pipes on every request. A
+-- statement-level trigger on pipes recomputes only the networks a statement
+-- touched (MIN cannot be maintained by deltas, so those networks are
+-- re-aggregated), and every run re-syncs rows that drifted.
+
+-- Minimum slope for a diameter; _required_slope_sql() in backend/database.py
+-- calls this too, so it is the single source of the thresholds.
+CREATE OR REPLACE FUNCTION pipe_required_slope(diameter_mm numeric) RETURNS numeric
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT CASE
+    WHEN diameter_mm IS NULL THEN NULL
+    WHEN (diameter_mm / 25.4) >= 24 THEN 0.15
+    WHEN (diameter_mm / 25.4) >= 18 THEN 0.19
+    WHEN (diameter_mm / 25.4) >= 15 THEN 0.25
+    WHEN (diameter_mm / 25.4) >= 12 THEN 0.33
+    WHEN (diameter_mm / 25.4) >= 10 THEN 0.28
+    WHEN (diameter_mm / 25.4) >= 8 THEN 0.40
+    WHEN (diameter_mm / 25.4) >= 6 THEN 0.40
+    WHEN (diameter_mm / 25.4) >= 4 THEN 0.50
+    ELSE 0.60
+  END
+$$;
+
+CREATE TABLE IF NOT EXISTS pipe_network_metrics (
+  network_id uuid PRIMARY KEY REFERENCES pipe_networks(network_id) ON DELETE CASCADE,
+  pipes_below_min bigint,
+  avg_slope numeric,
+  worst_margin numeric,
+  refreshed_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Recompute metrics for the given networks (all networks when ids is NULL);
+-- rows whose values did not change are left alone.
+CREATE OR REPLACE FUNCTION refresh_pipe_network_metrics(ids uuid[]) RETURNS void
+LANGUAGE sql AS $$
+  INSERT INTO pipe_network_metrics AS t (network_id, pipes_below_min, avg_slope, worst_margin, refreshed_at)
+  SELECT pn.network_id, m.pipes_below_min, m.avg_slope, m.worst_margin, now()
+  FROM pipe_networks pn
+  CROSS JOIN LATERAL (
+    SELECT
+      SUM(CASE WHEN p.slope < pipe_required_slope(p.diameter_mm) THEN 1 ELSE 0 END) AS pipes_below_min,
+      AVG(p.slope) AS avg_slope,
+      MIN(p.slope - pipe_required_slope(p.diameter_mm)) AS worst_margin
+    FROM pipes p
+    WHERE p.network_id = pn.network_id
+  ) m
+  WHERE ids IS NULL OR pn.network_id = ANY(ids)
+  ON CONFLICT (network_id) DO UPDATE SET
+    pipes_below_min = EXCLUDED.pipes_below_min,
+    avg_slope = EXCLUDED.avg_slope,
+    worst_margin = EXCLUDED.worst_margin,
+    refreshed_at = EXCLUDED.refreshed_at
+  WHERE (t.pipes_below_min, t.avg_slope, t.worst_margin)
+        IS DISTINCT FROM (EXCLUDED.pipes_below_min, EXCLUDED.avg_slope, EXCLUDED.worst_margin)
+$$;
+
+CREATE OR REPLACE FUNCTION maintain_pipe_network_metrics() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  ids uuid[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    SELECT array_agg(DISTINCT network_id) INTO ids FROM new_rows WHERE network_id IS NOT NULL;
+  ELSIF TG_OP = 'DELETE' THEN
+    SELECT array_agg(DISTINCT network_id) INTO ids FROM old_rows WHERE network_id IS NOT NULL;
+  ELSE
+    -- Only rows whose (network_id, slope, diameter_mm) changed affect the
+    -- metrics; renames and geometry edits leave ids NULL and return early.
+    SELECT array_agg(DISTINCT network_id) INTO ids
+    FROM (
+      (SELECT network_id, slope, diameter_mm FROM old_rows
+       EXCEPT ALL
+       SELECT network_id, slope, diameter_mm FROM new_rows)
+      UNION ALL
+      (SELECT network_id, slope, diameter_mm FROM new_rows
+       EXCEPT ALL
+       SELECT network_id, slope, diameter_mm FROM old_rows)
+    ) x
+    WHERE network_id IS NOT NULL;
+  END IF;
+
+  IF ids IS NULL THEN
+    RETURN NULL;
+  END IF;
+
+  -- Serialize refreshes per network. Without the lock two concurrent writers
+  -- each aggregate without the other's uncommitted rows and the last upsert
+  -- wins with a stale result. The aggregate runs as a separate statement, so
+  -- under READ COMMITTED it sees whatever the previous lock holder committed.
+  -- NO KEY UPDATE does not conflict with the KEY SHARE locks the pipes foreign
+  -- key takes, and locking in network_id order avoids deadlocks.
+  PERFORM 1 FROM pipe_networks
+  WHERE network_id = ANY(ids)
+  ORDER BY network_id
+  FOR NO KEY UPDATE;
+
+  PERFORM refresh_pipe_network_metrics(ids);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_pipes_metrics_ins ON pipes;
+CREATE TRIGGER trg_pipes_metrics_ins AFTER INSERT ON pipes
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipe_network_metrics();
+DROP TRIGGER IF EXISTS trg_pipes_metrics_del ON pipes;
+CREATE TRIGGER trg_pipes_metrics_del AFTER DELETE ON pipes
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipe_network_metrics();
+DROP TRIGGER IF EXISTS trg_pipes_metrics_upd ON pipes;
+CREATE TRIGGER trg_pipes_metrics_upd AFTER UPDATE ON pipes
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_pipe_network_metrics();
+
+-- Backfill / re-sync
+SELECT refresh_pipe_network_metrics(NULL);
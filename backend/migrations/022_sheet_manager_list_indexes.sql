@@ -0,0 +1,38 @@
+-- Ordered indexes for the sheet note / sheet set manager list queries (idempotent)
+-- Each matches the filter + ORDER BY of one list helper so rows come back in
+-- index order instead of through a sort. The lists return most columns, so
+-- these are plain composites rather than INCLUDE covering indexes.
+
+-- list_sheet_note_sets: WHERE project_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_sheet_note_sets_project_created
+  ON sheet_note_sets (project_id, created_at DESC);
+
+-- list_sheet_sets: WHERE project_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_sheet_sets_project_created
+  ON sheet_sets (project_id, created_at DESC);
+
+-- list_project_sheet_notes: WHERE set_id = ? ORDER BY sort_order, created_at
+CREATE INDEX IF NOT EXISTS idx_project_sheet_notes_set_order_created
+  ON project_sheet_notes (set_id, sort_order, created_at);
+
+-- list_sheets / renumber_sheets: WHERE set_id = ? ORDER BY COALESCE(sheet_hierarchy_number, 50), sheet_code
+CREATE INDEX IF NOT EXISTS idx_sheets_set_hierarchy_code
+  ON sheets (set_id, (COALESCE(sheet_hierarchy_number, 50)), sheet_code);
+
+-- list_sheet_revisions: WHERE sheet_id = ? ORDER BY revision_date DESC, created_at DESC
+CREATE INDEX IF NOT EXISTS idx_sheet_revisions_sheet_date
+  ON sheet_revisions (sheet_id, revision_date DESC, created_at DESC);
+
+-- list_sheet_drawing_assignments and the latest-assignment DISTINCT ON in
+-- list_sheets: WHERE sheet_id = ? ORDER BY assigned_at DESC
+CREATE INDEX IF NOT EXISTS idx_sheet_drawing_assignments_sheet_assigned
+  ON sheet_drawing_assignments (sheet_id, assigned_at DESC);
+
+-- The composites above lead with the same columns, so the single-column (and
+-- set_id, sort_order) indexes from 007/008 only add write cost.
+DROP INDEX IF EXISTS idx_sheet_note_sets_project;
+DROP INDEX IF EXISTS idx_sheet_sets_project;
+DROP INDEX IF EXISTS idx_project_sheet_notes_order;
+DROP INDEX IF EXISTS idx_sheets_set;
+DROP INDEX IF EXISTS idx_sheet_revisions_sheet;
+DROP INDEX IF EXISTS idx_sheet_drawing_assignments_sheet;
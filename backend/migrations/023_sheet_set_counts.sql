@@ -0,0 +1,59 @@
+-- Denormalized child counts for the sheet manager list views (idempotent)
+-- sheet_note_sets.note_count and sheet_sets.sheet_count are kept current by
+-- the statement-level maintain_child_count() triggers from
+-- 012_denormalized_counts.sql and re-synced from the child tables on every run.
+
+ALTER TABLE IF EXISTS sheet_note_sets
+  ADD COLUMN IF NOT EXISTS note_count integer NOT NULL DEFAULT 0;
+
+ALTER TABLE IF EXISTS sheet_sets
+  ADD COLUMN IF NOT EXISTS sheet_count integer NOT NULL DEFAULT 0;
+
+-- project_sheet_notes -> sheet_note_sets.note_count
+DROP TRIGGER IF EXISTS trg_project_sheet_notes_count_ins ON project_sheet_notes;
+CREATE TRIGGER trg_project_sheet_notes_count_ins AFTER INSERT ON project_sheet_notes
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_note_sets', 'set_id', 'note_count', 'project_note_id');
+DROP TRIGGER IF EXISTS trg_project_sheet_notes_count_del ON project_sheet_notes;
+CREATE TRIGGER trg_project_sheet_notes_count_del AFTER DELETE ON project_sheet_notes
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_note_sets', 'set_id', 'note_count', 'project_note_id');
+DROP TRIGGER IF EXISTS trg_project_sheet_notes_count_upd ON project_sheet_notes;
+CREATE TRIGGER trg_project_sheet_notes_count_upd AFTER UPDATE ON project_sheet_notes
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_note_sets', 'set_id', 'note_count', 'project_note_id');
+
+-- sheets -> sheet_sets.sheet_count
+DROP TRIGGER IF EXISTS trg_sheets_count_ins ON sheets;
+CREATE TRIGGER trg_sheets_count_ins AFTER INSERT ON sheets
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_sets', 'set_id', 'sheet_count', 'sheet_id');
+DROP TRIGGER IF EXISTS trg_sheets_count_del ON sheets;
+CREATE TRIGGER trg_sheets_count_del AFTER DELETE ON sheets
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_sets', 'set_id', 'sheet_count', 'sheet_id');
+DROP TRIGGER IF EXISTS trg_sheets_count_upd ON sheets;
+CREATE TRIGGER trg_sheets_count_upd AFTER UPDATE ON sheets
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION maintain_child_count('sheet_sets', 'set_id', 'sheet_count', 'sheet_id');
+
+-- Backfill / re-sync (only rows that drifted are written)
+UPDATE sheet_note_sets ns
+SET note_count = c.n
+FROM (
+  SELECT ns2.set_id, COUNT(n.project_note_id)::int AS n
+  FROM sheet_note_sets ns2
+  LEFT JOIN project_sheet_notes n ON n.set_id = ns2.set_id
+  GROUP BY ns2.set_id
+) c
+WHERE ns.set_id = c.set_id AND ns.note_count IS DISTINCT FROM c.n;
+
+UPDATE sheet_sets ss
+SET sheet_count = c.n
+FROM (
+  SELECT ss2.set_id, COUNT(sh.sheet_id)::int AS n
+  FROM sheet_sets ss2
+  LEFT JOIN sheets sh ON sh.set_id = ss2.set_id
+  GROUP BY ss2.set_id
+) c
+WHERE ss.set_id = c.set_id AND ss.sheet_count IS DISTINCT FROM c.n;
@@ -0,0 +1,37 @@
+-- Slope sample count on pipe_network_metrics (idempotent)
+-- get_pipe_network_detail reports how many pipes carry a slope next to the
+-- 021 aggregates, so refresh_pipe_network_metrics() now fills slope_samples
+-- too. The 021 triggers call the function by name and pick this version up.
+
+ALTER TABLE pipe_network_metrics
+  ADD COLUMN IF NOT EXISTS slope_samples bigint NOT NULL DEFAULT 0;
+
+-- Recompute metrics for the given networks (all networks when ids is NULL);
+-- rows whose values did not change are left alone.
+CREATE OR REPLACE FUNCTION refresh_pipe_network_metrics(ids uuid[]) RETURNS void
+LANGUAGE sql AS $$
+  INSERT INTO pipe_network_metrics AS t (network_id, pipes_below_min, avg_slope, worst_margin, slope_samples, refreshed_at)
+  SELECT pn.network_id, m.pipes_below_min, m.avg_slope, m.worst_margin, m.slope_samples, now()
+  FROM pipe_networks pn
+  CROSS JOIN LATERAL (
+    SELECT
+      SUM(CASE WHEN p.slope < pipe_required_slope(p.diameter_mm) THEN 1 ELSE 0 END) AS pipes_below_min,
+      AVG(p.slope) AS avg_slope,
+      MIN(p.slope - pipe_required_slope(p.diameter_mm)) AS worst_margin,
+      COUNT(p.slope) AS slope_samples
+    FROM pipes p
+    WHERE p.network_id = pn.network_id
+  ) m
+  WHERE ids IS NULL OR pn.network_id = ANY(ids)
+  ON CONFLICT (network_id) DO UPDATE SET
+    pipes_below_min = EXCLUDED.pipes_below_min,
+    avg_slope = EXCLUDED.avg_slope,
+    worst_margin = EXCLUDED.worst_margin,
+    slope_samples = EXCLUDED.slope_samples,
+    refreshed_at = EXCLUDED.refreshed_at
+  WHERE (t.pipes_below_min, t.avg_slope, t.worst_margin, t.slope_samples)
+        IS DISTINCT FROM (EXCLUDED.pipes_below_min, EXCLUDED.avg_slope, EXCLUDED.worst_margin, EXCLUDED.slope_samples)
+$$;
+
+-- Backfill / re-sync
+SELECT refresh_pipe_network_metrics(NULL);
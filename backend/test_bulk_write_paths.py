@@ -0,0 +1,340 @@
+"""
+Database-backed tests for the bulk write paths and trigger-maintained columns.
+
+Covers COPY pipe loads, savepoint-guarded import steps, the pipe/sheet count
+and pipe network metric triggers, bulk sheet note / sheet creation and the
+COALESCE-based prepared updaters. Needs a migrated database configured through
+backend/.env; the whole module is skipped when none is reachable.
+
+Usage:
+    pytest backend/test_bulk_write_paths.py -v
+"""
+
+import sys
+import uuid
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import psycopg2
+import pytest
+
+try:
+    import database
+    with database.get_db_connection():
+        pass
+except Exception as exc:  # no .env or no server: these tests need a live database
+    pytest.skip(f"Database not available: {exc}", allow_module_level=True)
+
+
+def _pipe(network_id, diameter_mm=300, slope=0.5, **extra):
+    """Keyword set accepted by create_pipe / create_pipes_bulk / _copy_pipes."""
+    return {
+        'network_id': network_id,
+        'diameter_mm': diameter_mm,
+        'material': 'PVC',
+        'slope': slope,
+        'length_m': 10.0,
+        'geom': 'LINESTRING(0 0, 10 0)',
+        **extra,
+    }
+
+
+def _pipe_count(network_id):
+    return database.execute_single(
+        "SELECT pipe_count FROM pipe_networks WHERE network_id = %s", (network_id,)
+    )['pipe_count']
+
+
+def _metrics(network_id):
+    return database.execute_single(
+        """
+        SELECT pipes_below_min, avg_slope, worst_margin, slope_samples
+        FROM pipe_network_metrics WHERE network_id = %s
+        """,
+        (network_id,)
+    )
+
+
+@pytest.fixture(scope="module")
+def project_id():
+    """Scratch project; deleting it cascades to everything the tests create."""
+    project_id = database.create_project(
+        project_name="Bulk Write Path Tests",
+        project_number="TEST-BULK",
+        description="Created by backend/test_bulk_write_paths.py"
+    )
+    yield project_id
+    database.execute_query("DELETE FROM projects WHERE project_id = %s", (project_id,), fetch=False)
+
+
+@pytest.fixture
+def network_id(project_id):
+    return database.create_pipe_network(project_id, f"Test network {uuid.uuid4().hex[:8]}", "scratch")
+
+
+class TestCopyPipes:
+    """COPY-based pipe loads."""
+
+    def test_returns_ids_of_inserted_rows_in_input_order(self, network_id):
+        pipes = [_pipe(network_id, diameter_mm=100 + idx) for idx in range(5)]
+
+        pipe_ids = database._copy_pipes(pipes)
+
+        assert len(pipe_ids) == 5
+        assert len(set(pipe_ids)) == 5
+        rows = database.execute_query(
+            "SELECT pipe_id::text AS pipe_id, diameter_mm FROM pipes WHERE network_id = %s",
+            (network_id,)
+        )
+        diameters = {row['pipe_id']: row['diameter_mm'] for row in rows}
+        assert [diameters[pipe_id] for pipe_id in pipe_ids] == [100 + idx for idx in range(5)]
+
+    def test_geometry_and_srid_are_applied(self, network_id):
+        (pipe_id,) = database._copy_pipes([_pipe(network_id)])
+
+        row = database.execute_single(
+            "SELECT ST_SRID(geom) AS srid, ST_Length(geom) AS length FROM pipes WHERE pipe_id = %s",
+            (pipe_id,)
+        )
+        assert row['srid'] == 3857
+        assert row['length'] == pytest.approx(10.0)
+
+    def test_repeated_loads_reuse_the_staging_table(self, network_id):
+        first = database._copy_pipes([_pipe(network_id) for _ in range(3)])
+        second = database._copy_pipes([_pipe(network_id) for _ in range(2)])
+
+        assert not set(first) & set(second)
+        assert _pipe_count(network_id) == 5
+
+
+class TestPipeKeysetPaging:
+    """list_pipes paging with the (diameter, pipe_id) keyset."""
+
+    def test_pages_cover_every_pipe_once(self, network_id):
+        diameters = [450, 300, 300, 300, 300, None, None, None, 200]
+        database._copy_pipes([_pipe(network_id, diameter_mm=diameter) for diameter in diameters])
+        expected = database.list_pipes(network_id, 'none')
+
+        seen, after = [], None
+        while True:
+            page = database.list_pipes(network_id, 'none', limit=2, after=after)
+            if not page:
+                break
+            assert len(page) <= 2
+            seen.extend(page)
+            after = (page[-1]['diameter_mm'], page[-1]['pipe_id'])
+
+        assert [row['pipe_id'] for row in seen] == [row['pipe_id'] for row in expected]
+        assert len({row['pipe_id'] for row in seen}) == len(diameters)
+        assert [row['diameter_mm'] for row in seen] == [450, 300, 300, 300, 300, 200, None, None, None]
+
+
+class TestSavepointImport:
+    """bulk_import_session() with savepoint()-guarded steps."""
+
+    def test_failed_step_rolls_back_only_itself(self, project_id, network_id):
+        with database.bulk_import_session():
+            database.create_pipe(**_pipe(network_id, slope=1.0), up_structure_id=None,
+                                 down_structure_id=None, invert_up=None, invert_dn=None, status=None)
+            with pytest.raises(psycopg2.Error):
+                with database.savepoint():
+                    database.create_pipe(**_pipe(str(uuid.uuid4())), up_structure_id=None,
+                                         down_structure_id=None, invert_up=None, invert_dn=None, status=None)
+            second_network = database.create_pipe_network(project_id, "After failed step", None)
+
+        assert _pipe_count(network_id) == 1
+        assert database.get_pipe_network(second_network) is not None
+
+    def test_error_outside_a_savepoint_rolls_back_the_batch(self, network_id):
+        with pytest.raises(psycopg2.Error):
+            with database.bulk_import_session():
+                database.create_pipes_bulk([_pipe(network_id)])
+                database.create_pipes_bulk([_pipe(str(uuid.uuid4()))])
+
+        assert _pipe_count(network_id) == 0
+
+    def test_savepoint_outside_a_transaction_is_a_no_op(self, network_id):
+        with database.savepoint():
+            database.create_pipes_bulk([_pipe(network_id)])
+
+        assert _pipe_count(network_id) == 1
+
+
+class TestPipeNetworkTriggers:
+    """pipe_count (migration 012) and pipe_network_metrics (021/024)."""
+
+    def test_pipe_count_follows_insert_move_and_delete(self, project_id, network_id):
+        other_network = database.create_pipe_network(project_id, "Other", None)
+        pipe_ids = database.create_pipes_bulk([_pipe(network_id) for _ in range(3)])
+        assert _pipe_count(network_id) == 3
+
+        database.update_pipe(pipe_ids[0], {'network_id': other_network})
+        assert _pipe_count(network_id) == 2
+        assert _pipe_count(other_network) == 1
+
+        database.execute_query("DELETE FROM pipes WHERE pipe_id = ANY(%s::uuid[])", (pipe_ids,), fetch=False)
+        assert _pipe_count(network_id) == 0
+        assert _pipe_count(other_network) == 0
+
+    def test_metrics_are_recomputed_for_touched_networks(self, network_id):
+        # 300 mm (~11.8 in) needs 0.28; one pipe below, one above
+        low, high = database.create_pipes_bulk([
+            _pipe(network_id, diameter_mm=300, slope=0.1),
+            _pipe(network_id, diameter_mm=300, slope=1.0),
+        ])
+
+        metrics = _metrics(network_id)
+        assert metrics['pipes_below_min'] == 1
+        assert metrics['avg_slope'] == pytest.approx(0.55)
+        assert metrics['worst_margin'] == pytest.approx(0.1 - 0.28)
+        assert metrics['slope_samples'] == 2
+
+        database.update_pipe(low, {'slope': 0.5})
+        metrics = _metrics(network_id)
+        assert metrics['pipes_below_min'] == 0
+        assert metrics['avg_slope'] == pytest.approx(0.75)
+
+        database.execute_query("DELETE FROM pipes WHERE pipe_id = %s", (high,), fetch=False)
+        metrics = _metrics(network_id)
+        assert metrics['slope_samples'] == 1
+        assert metrics['avg_slope'] == pytest.approx(0.5)
+
+    def test_update_that_leaves_slope_inputs_alone_keeps_metrics(self, network_id):
+        (pipe_id,) = database.create_pipes_bulk([_pipe(network_id, slope=0.1)])
+        before = _metrics(network_id)
+
+        database.update_pipe(pipe_id, {'material': 'RCP', 'status': 'existing'})
+
+        assert _metrics(network_id) == before
+
+
+class TestSheetCountTriggers:
+    """sheet_note_sets.note_count and sheet_sets.sheet_count (migration 023)."""
+
+    def test_note_count_tracks_notes(self, project_id):
+        note_set = database.create_sheet_note_set({'project_id': project_id, 'set_name': 'Count notes'})
+        notes = database.create_project_sheet_notes_bulk(
+            note_set['set_id'], [{'display_code': f"N{idx}"} for idx in range(3)]
+        )
+
+        def note_count():
+            return database.execute_single(
+                "SELECT note_count FROM sheet_note_sets WHERE set_id = %s", (note_set['set_id'],)
+            )['note_count']
+
+        assert note_count() == 3
+        database.delete_project_sheet_note(notes[0]['project_note_id'])
+        assert note_count() == 2
+
+    def test_sheet_count_tracks_sheets(self, project_id):
+        sheet_set = database.create_sheet_set({'project_id': project_id, 'set_name': 'Count sheets'})
+        sheets = database.create_sheets_bulk(
+            sheet_set['set_id'], [{'sheet_code': f"C-{idx}", 'sheet_title': f"Sheet {idx}"} for idx in range(4)]
+        )
+
+        def sheet_count():
+            return database.execute_single(
+                "SELECT sheet_count FROM sheet_sets WHERE set_id = %s", (sheet_set['set_id'],)
+            )['sheet_count']
+
+        assert sheet_count() == 4
+        database.delete_sheet(sheets[0]['sheet_id'])
+        assert sheet_count() == 3
+
+
+class TestBulkSheetManager:
+    """Bulk note sort_order and bulk sheet renumbering."""
+
+    def test_bulk_notes_continue_after_existing_sort_order(self, project_id):
+        note_set = database.create_sheet_note_set({'project_id': project_id, 'set_name': 'Sort order'})
+        first = database.create_project_sheet_note({'set_id': note_set['set_id'], 'display_code': 'A'})
+
+        added = database.create_project_sheet_notes_bulk(
+            note_set['set_id'], [{'display_code': 'B'}, {'display_code': 'C', 'custom_text': 'Edited'}]
+        )
+
+        assert first['sort_order'] == 1
+        assert [note['display_code'] for note in added] == ['B', 'C']
+        assert [note['sort_order'] for note in added] == [2, 3]
+        assert [note['is_modified'] for note in added] == [False, True]
+
+    def test_bulk_notes_with_empty_input(self, project_id):
+        note_set = database.create_sheet_note_set({'project_id': project_id, 'set_name': 'Empty'})
+        assert database.create_project_sheet_notes_bulk(note_set['set_id'], []) == []
+
+    def test_bulk_sheets_are_renumbered_once_in_list_order(self, project_id):
+        sheet_set = database.create_sheet_set({'project_id': project_id, 'set_name': 'Renumber'})
+        existing = database.create_sheet({'set_id': sheet_set['set_id'], 'sheet_code': 'C-2', 'sheet_title': 'Grading'})
+        assert existing['sheet_number'] == 1
+
+        added = database.create_sheets_bulk(sheet_set['set_id'], [
+            {'sheet_code': 'C-1', 'sheet_title': 'Demo'},
+            {'sheet_code': 'G-1', 'sheet_title': 'Cover', 'sheet_hierarchy_number': 10},
+        ])
+
+        assert [sheet['sheet_code'] for sheet in added] == ['C-1', 'G-1']
+        assert [sheet['sheet_number'] for sheet in added] == [2, 1]
+        numbers = {
+            row['sheet_code']: row['sheet_number']
+            for row in database.execute_query(
+                "SELECT sheet_code, sheet_number FROM sheets WHERE set_id = %s", (sheet_set['set_id'],)
+            )
+        }
+        assert numbers == {'G-1': 1, 'C-1': 2, 'C-2': 3}
+        assert database.renumber_sheets(sheet_set['set_id']) == 3
+
+
+class TestPreparedUpdaters:
+    """_make_updater: COALESCE($n, column) prepared statements."""
+
+    def test_only_provided_fields_change(self, network_id):
+        (pipe_id,) = database.create_pipes_bulk([_pipe(network_id, diameter_mm=450, slope=0.5)])
+
+        updated = database.update_pipe(pipe_id, {'slope': 2.0, 'material': None})
+
+        assert str(updated['pipe_id']) == str(pipe_id)
+        assert updated['slope'] == pytest.approx(2.0)
+        assert updated['diameter_mm'] == pytest.approx(450)
+        assert updated['material'] == 'PVC'
+
+    def test_geometry_is_set_and_cleared(self, network_id):
+        (pipe_id,) = database.create_pipes_bulk([_pipe(network_id)])
+
+        def length():
+            return database.execute_single(
+                "SELECT ST_Length(geom) AS length FROM pipes WHERE pipe_id = %s", (pipe_id,)
+            )['length']
+
+        database.update_pipe(pipe_id, {'geom': {'type': 'LineString', 'coordinates': [[0, 0], [0, 25]]}})
+        assert length() == pytest.approx(25.0)
+        database.update_pipe(pipe_id, {'geom': None})
+        assert length() is None
+
+    def test_json_field_is_written(self, network_id):
+        (pipe_id,) = database.create_pipes_bulk([_pipe(network_id)])
+
+        updated = database.update_pipe(pipe_id, {'metadata': {'source': 'survey'}})
+
+        assert updated['metadata'] == {'source': 'survey'}
+
+    def test_unknown_id_returns_none(self):
+        assert database.update_pipe(str(uuid.uuid4()), {'slope': 1.0}) is None
+
+    def test_empty_update_raises(self, network_id):
+        with pytest.raises(ValueError):
+            database.update_pipe_network(network_id, {})
+        with pytest.raises(ValueError):
+            database.update_pipe_network(network_id, {'name': None})
+
+    def test_network_rename_keeps_other_fields(self, network_id):
+        updated = database.update_pipe_network(network_id, {'name': 'Renamed'})
+
+        assert updated['name'] == 'Renamed'
+        assert updated['description'] == 'scratch'
+
+
+if __name__ == "__main__":
+    # Run tests with pytest
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -117,8 +117,8 @@ def ensure_note(project_id: str, title: str, category: str, text: str,
         )
 
 
-def seed_structures(network_id: str, points: Dict[str, Tuple[float, float]]
-                   ) -> Dict[str, str]:
+def seed_structures(network_id: str, points: Dict[str, Tuple[float, float]],
+                    project_id: Optional[str] = None) -> Dict[str, str]:
     """Create structures using allowed `type` values discovered from the DB.
 
     - If `structures.type` is an enum, we use the enum labels.
@@ -192,7 +192,7 @@ def seed_structures(network_id: str, points: Dict[str, Tuple[float, float]]
         for candidate in candidates:
             try:
                 structure_id = database.create_structure(
-                    project_id=None,  # derive from network
+                    project_id=project_id,  # caller already knows it; skips the network lookup
                     network_id=network_id,
                     structure_type=candidate,
                     rim_elev=100.0,
@@ -224,6 +224,7 @@ def seed_structures(network_id: str, points: Dict[str, Tuple[float, float]]
 def seed_pipes(network_id: str,
                segments: List[Dict[str, object]],
                struct_ids: Dict[str, str]) -> None:
+    pipes = []
     for seg in segments:
         up = struct_ids[seg['up']]  # type: ignore[index]
         dn = struct_ids[seg['dn']]  # type: ignore[index]
@@ -233,7 +234,7 @@ def seed_pipes(network_id: str,
         inv_up = float(seg.get('invert_up', 100.0))
         inv_dn = float(seg.get('invert_dn', inv_up - (slope or 0.0) * length_m))
 
-        database.create_pipe(
+        pipes.append(dict(
             network_id=network_id,
             up_structure_id=up,
             down_structure_id=dn,
@@ -250,7 +251,9 @@ def seed_pipes(network_id: str,
             },
             srid=4326,
             metadata={"seed": "demo-v1"}
-        )
+        ))
+
+    database.create_pipes_bulk(pipes)
 
 
 def seed_conflict(project_id: str, utility_id: str, lon: float, lat: float,
@@ -288,7 +291,7 @@ def seed_project_mission_creek() -> None:
         'S2': (-122.4055, 37.7838),
         'S3': (-122.4050, 37.7836),
     }
-    struct_ids = seed_structures(network_id, points)
+    struct_ids = seed_structures(network_id, points, project_id)
 
     pipes = [
         {
@@ -353,7 +356,7 @@ def seed_project_ridgeview() -> None:
         'S3': (-122.2092, 37.7494),
         'S4': (-122.2088, 37.7491),
     }
-    sids_storm = seed_structures(storm_id, pts_storm)
+    sids_storm = seed_structures(storm_id, pts_storm, project_id)
     pipes_storm = [
         {'up': 'S1', 'dn': 'S2', 'diameter_mm': 450, 'material': 'RCP', 'slope': 0.0015, 'length_m': 45.0,
          'invert_up': 101.0, 'coords': [pts_storm['S1'], pts_storm['S2']]},  # below (18" → 0.0019)
@@ -372,7 +375,7 @@ def seed_project_ridgeview() -> None:
         'S2': (-122.2106, 37.7502),
         'S3': (-122.2102, 37.7499),
     }
-    sids_san = seed_structures(san_id, pts_san)
+    sids_san = seed_structures(san_id, pts_san, project_id)
     pipes_san = [
         {'up': 'S1', 'dn': 'S2', 'diameter_mm': 200, 'material': 'PVC', 'slope': 0.0050, 'length_m': 55.0,
          'invert_up': 102.0, 'coords': [pts_san['S1'], pts_san['S2']]},  # above (8" → 0.0040)
@@ -405,7 +408,7 @@ def seed_project_harborview() -> None:
         'S1': (-122.3350, 37.8100),
         'S2': (-122.3346, 37.8097),
     }
-    struct_ids = seed_structures(network_id, points)
+    struct_ids = seed_structures(network_id, points, project_id)
 
     pipes = [
         {'up': 'S1', 'dn': 'S2', 'diameter_mm': 300, 'material': 'HDPE', 'slope': 0.0040, 'length_m': 42.0,